@@ -444,6 +444,11 @@ class LambdaError(Enum):
         "message": "Missing request parameters",
         "fhir_coding": UKCoreSpineError.MISSING_VALUE,
     }
+    DocumentReferenceInvalidSearchParameters = {
+        "err_code": "NRL_DR_4003",
+        "message": "Invalid search parameters",
+        "fhir_coding": UKCoreSpineError.INVALID_SEARCH_DATA,
+    }
 
     DocumentReferenceForbidden = {
         "err_code": "NRL_DR_4031",
@@ -0,0 +1,8 @@
+from enum import StrEnum
+
+
+class S3TransferProfile(StrEnum):
+    DEFAULT = "default"
+    REPORT = "report"
+    STITCHED_PDF = "stitched_pdf"
+    ZIP_ARCHIVE = "zip_archive"
@@ -1,4 +1,5 @@
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 
 from pydantic import BaseModel
@@ -23,6 +24,7 @@ class SnomedCodes(Enum):
     )
 
     @classmethod
+    @lru_cache(maxsize=None)
     def find_by_code(cls, code: str) -> Optional["SnomedCode"]:
         """
         Find a SnomedCodes enum value by its code string.
@@ -2,6 +2,7 @@ import json
 
 from enums.logging_app_interaction import LoggingAppInteraction
 from services.document_reference_search_service import DocumentReferenceSearchService
+from services.search_result_cache_service import SearchResultCacheService
 from utils.audit_logging_setup import LoggingService
 from utils.decorators.ensure_env_var import ensure_environment_variables
 from utils.decorators.handle_lambda_exceptions import handle_lambda_exceptions
@@ -29,17 +30,35 @@ def lambda_handler(event, context):
     nhs_number = extract_nhs_number_from_event(event)
     request_context.patient_nhs_no = nhs_number
 
-    document_reference_search_service = DocumentReferenceSearchService()
-    response = document_reference_search_service.get_document_references(
-        nhs_number, check_upload_completed=True
-    )
+    search_result_cache_service = SearchResultCacheService()
+    etag = search_result_cache_service.get_etag(nhs_number)
+    etag_headers = search_result_cache_service.create_etag_headers(etag) if etag else {}
+    if etag and search_result_cache_service.is_not_modified(event, etag):
+        logger.info(
+            "Document references unchanged since last request",
+            {"Result": "Successful viewing docs"},
+        )
+        return ApiGatewayResponse(304, "", "GET").create_api_gateway_response(
+            headers=etag_headers
+        )
+
+    response = search_result_cache_service.get_cached_result(etag) if etag else None
+    if response is None:
+        document_reference_search_service = DocumentReferenceSearchService()
+        response = document_reference_search_service.get_document_references(
+            nhs_number, check_upload_completed=True
+        )
+        if etag:
+            search_result_cache_service.cache_result_if_unchanged(
+                nhs_number, etag, response or []
+            )
     logger.info("User is able to view docs", {"Result": "Successful viewing docs"})
 
     if response:
         return ApiGatewayResponse(
             200, json.dumps(response), "GET"
-        ).create_api_gateway_response()
+        ).create_api_gateway_response(headers=etag_headers)
     else:
         return ApiGatewayResponse(
             204, json.dumps([]), "GET"
-        ).create_api_gateway_response()
+        ).create_api_gateway_response(headers=etag_headers)
@@ -5,6 +5,7 @@ from enums.lambda_error import LambdaError
 from enums.logging_app_interaction import LoggingAppInteraction
 from services.feature_flags_service import FeatureFlagService
 from services.get_document_upload_status import GetDocumentUploadStatusService
+from services.search_result_cache_service import SearchResultCacheService
 from utils.audit_logging_setup import LoggingService
 from utils.decorators.ensure_env_var import ensure_environment_variables
 from utils.decorators.handle_lambda_exceptions import handle_lambda_exceptions
@@ -53,6 +54,17 @@ def lambda_handler(event, context):
         )
     documents_id_list = set(documents_list_query_string.split(","))
 
+    search_result_cache_service = SearchResultCacheService()
+    etag = search_result_cache_service.get_etag(
+        nhs_number_query_string, variant=",".join(sorted(documents_id_list))
+    )
+    etag_headers = search_result_cache_service.create_etag_headers(etag) if etag else {}
+    if etag and search_result_cache_service.is_not_modified(event, etag):
+        logger.info("Document statuses unchanged since last request")
+        return ApiGatewayResponse(
+            status_code=304, body="", methods="GET"
+        ).create_api_gateway_response(headers=etag_headers)
+
     upload_confirm_result_service = GetDocumentUploadStatusService()
     results = upload_confirm_result_service.get_document_references_by_id(
         document_ids=documents_id_list, nhs_number=nhs_number_query_string
@@ -60,7 +72,7 @@ def lambda_handler(event, context):
     if results:
         return ApiGatewayResponse(
             status_code=200, body=json.dumps(results), methods="GET"
-        ).create_api_gateway_response()
+        ).create_api_gateway_response(headers=etag_headers)
     else:
         return ApiGatewayResponse(
             status_code=404, body=json.dumps(results), methods="GET"
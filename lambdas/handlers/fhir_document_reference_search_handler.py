@@ -27,6 +27,9 @@ PARAM_TYPE_IDENTIFIER = "type:identifier"
 PARAM_CUSTODIAN_IDENTIFIER = "custodian:identifier"
 PARAM_SUBJECT_IDENTIFIER = "subject:identifier"
 PARAM_NEXT_PAGE_TOKEN = "next-page-token"
+PARAM_COUNT = "_count"
+MAX_PAGE_SIZE = 100
+DEFAULT_PAGE_SIZE = 20
 
 
 @ensure_environment_variables(
@@ -49,23 +52,35 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     bearer_token = extract_bearer_token(event)
     selected_role_id = event.get("headers", {}).get(HEADER_CIS2_USER_ID, "")
 
-    nhs_number, search_filters = parse_query_parameters(
-        event.get("queryStringParameters", {})
-    )
+    query_string = event.get("queryStringParameters", {})
+    nhs_number, search_filters = parse_query_parameters(query_string)
+    page_size, next_page_token = parse_paging_parameters(query_string)
     request_context.patient_nhs_no = nhs_number
 
     if selected_role_id:
         validate_user_access(bearer_token, selected_role_id, nhs_number)
 
     service = DocumentReferenceSearchService()
-    document_references = service.get_document_references(
-        nhs_number=nhs_number,
-        return_fhir=True,
-        additional_filters=search_filters,
-        check_upload_completed=False,
-    )
-
-    if not document_references:
+    if page_size:
+        document_references = service.get_paginated_document_references(
+            nhs_number=nhs_number,
+            page_size=page_size,
+            next_page_token=next_page_token,
+            additional_filters=search_filters,
+            search_parameters=query_string,
+        )
+        # An empty page reached through a next link is the end of the results, not a 404
+        results_found = document_references.get("entry") or next_page_token
+    else:
+        document_references = service.get_document_references(
+            nhs_number=nhs_number,
+            return_fhir=True,
+            additional_filters=search_filters,
+            check_upload_completed=False,
+        )
+        results_found = document_references
+
+    if not results_found:
         logger.info(f"No document references found for NHS number: {nhs_number}")
         return ApiGatewayResponse(
             404,
@@ -101,14 +116,49 @@ def parse_query_parameters(
             search_filters["custodian"] = value.split("|")[-1]
         elif key == PARAM_SUBJECT_IDENTIFIER:
             nhs_number = value.split("|")[-1]
-        elif key == PARAM_NEXT_PAGE_TOKEN:
-            pass  # Handled elsewhere
+        elif key in (PARAM_NEXT_PAGE_TOKEN, PARAM_COUNT):
+            pass  # Handled by parse_paging_parameters
         else:
             logger.warning(f"Unknown query parameter: {key}")
 
     return nhs_number, search_filters
 
 
+def parse_paging_parameters(
+    query_string: Dict[str, str]
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Parse the FHIR _count parameter and continuation token from query parameters.
+
+    Args:
+        query_string: Dictionary of query parameters
+
+    Returns:
+        Tuple of (page size, next page token). Page size is None when the
+        request did not ask for paged results, defaults to DEFAULT_PAGE_SIZE when
+        only a next page token is given, and is capped at MAX_PAGE_SIZE.
+
+    Raises:
+        DocumentRefSearchException: If _count is not a positive integer
+    """
+    count = query_string.get(PARAM_COUNT)
+    next_page_token = query_string.get(PARAM_NEXT_PAGE_TOKEN)
+    if count is None:
+        return (DEFAULT_PAGE_SIZE if next_page_token else None), next_page_token
+
+    try:
+        page_size = int(count)
+    except ValueError:
+        page_size = 0
+    if page_size < 1:
+        logger.warning(f"Invalid {PARAM_COUNT} query parameter: {count}")
+        raise DocumentRefSearchException(
+            400, LambdaError.DocumentReferenceInvalidSearchParameters
+        )
+
+    return min(page_size, MAX_PAGE_SIZE), next_page_token
+
+
 def validate_user_access(
     bearer_token: str, selected_role_id: str, nhs_number: str
 ) -> None:
@@ -0,0 +1,37 @@
+from enums.metadata_field_names import DocumentReferenceMetadataFields
+from services.search_result_cache_service import SearchResultCacheService
+from utils.audit_logging_setup import LoggingService
+from utils.decorators.ensure_env_var import ensure_environment_variables
+from utils.decorators.set_audit_arg import set_request_context_for_logging
+from utils.decorators.validate_dynamo_stream_event import validate_dynamo_stream
+
+logger = LoggingService(__name__)
+
+
+@set_request_context_for_logging
+@ensure_environment_variables(names=["SEARCH_RESULT_CACHE_DYNAMODB_NAME"])
+@validate_dynamo_stream
+def lambda_handler(event, context):
+    # Errors are left to propagate so that Lambda retries the stream batch rather
+    # than dropping it and leaving stale search results cached.
+    logger.info("Search result cache invalidation handler triggered by DynamoDb stream")
+
+    nhs_numbers = extract_nhs_numbers(event["Records"])
+    search_result_cache_service = SearchResultCacheService()
+    for nhs_number in nhs_numbers:
+        search_result_cache_service.bump_version(nhs_number)
+
+    logger.info(f"Invalidated search results for {len(nhs_numbers)} patients")
+
+
+def extract_nhs_numbers(records: list[dict]) -> set[str]:
+    nhs_number_field = DocumentReferenceMetadataFields.NHS_NUMBER.value
+    nhs_numbers = set()
+    for record in records:
+        dynamo_event = record.get("dynamodb", {})
+        # A change of NHS number affects both the old and the new patient
+        for image in (dynamo_event.get("NewImage"), dynamo_event.get("OldImage")):
+            nhs_number = (image or {}).get(nhs_number_field, {}).get("S")
+            if nhs_number:
+                nhs_numbers.add(nhs_number)
+    return nhs_numbers
@@ -25,6 +25,7 @@ NRL_CONTENT_STABILITY_SYSTEM = (
 CONTENT_STABILITY_URL = (
     "https://fhir.nhs.uk/England/StructureDefinition/Extension-England-ContentStability"
 )
+INACTIVE_ODS_STATUSES = frozenset(PatientOdsInactiveStatus.list())
 
 
 class FormatCode(Coding):
@@ -253,3 +254,72 @@ class DocumentReferenceInfo(BaseModel):
                 )
             ),
         )
+
+
+def _identifier_reference(system_suffix: str, value: Optional[str]) -> Dict[str, Any]:
+    identifier = {"system": f"{FHIR_BASE_URL}/{system_suffix}"}
+    if value is not None:
+        identifier["value"] = value
+    return {"identifier": identifier}
+
+
+def render_fhir_document_reference(
+    document: NdrDocumentReference,
+    snomed_code_doc_type: SnomedCode,
+    attachment_url: Optional[str] = None,
+    custodian: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Render a FHIR DocumentReference straight to a dict.
+
+    Gives the same result as DocumentReferenceInfo(...)
+    .create_fhir_document_reference_object(document).model_dump(exclude_none=True),
+    but skips the intermediate pydantic models. Use it only for an NDR document
+    that has already been validated, such as one loaded from DynamoDB.
+
+    Args:
+        document: The validated NDR document reference
+        snomed_code_doc_type: The SNOMED code for the document type
+        attachment_url: The URL the attachment can be retrieved from
+        custodian: Fallback ODS code for the author and custodian
+
+    Returns:
+        Dictionary representing a FHIR DocumentReference resource
+    """
+    document_custodian = document.custodian
+    if document_custodian in INACTIVE_ODS_STATUSES:
+        document_custodian = PCSE_ODS_CODE
+
+    attachment = {"contentType": "application/pdf", "language": "en-GB"}
+    if attachment_url is not None:
+        attachment["url"] = attachment_url
+    attachment["title"] = document.file_name
+    creation = document.document_scan_creation or document.created
+    if creation is not None:
+        attachment["creation"] = creation
+
+    fhir_document_reference = {
+        "id": f"{snomed_code_doc_type.code}~{document.id}",
+        "resourceType": "DocumentReference",
+        "docStatus": document.doc_status,
+        "status": "current",
+        "type": {
+            "coding": [
+                {
+                    "system": SNOMED_URL,
+                    "code": snomed_code_doc_type.code,
+                    "display": snomed_code_doc_type.display_name,
+                }
+            ]
+        },
+        "subject": _identifier_reference("nhs-number", document.nhs_number),
+    }
+    if document.created is not None:
+        fhir_document_reference["date"] = document.created
+    fhir_document_reference["author"] = [
+        _identifier_reference("ods-organization-code", document.author or custodian)
+    ]
+    fhir_document_reference["custodian"] = _identifier_reference(
+        "ods-organization-code", document_custodian or custodian
+    )
+    fhir_document_reference["content"] = [{"attachment": attachment}]
+    return fhir_document_reference
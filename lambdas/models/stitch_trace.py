@@ -25,6 +25,8 @@ class StitchTrace(BaseModel):
     number_of_files: int = 0
     file_last_updated: str = ""
     total_file_size_in_bytes: int = 0
+    stitched_document_ids: list[str] = Field(default_factory=list)
+    linearised: bool = False
     expire_at: int
     deleted: bool = False
 
@@ -25,6 +25,8 @@ class DocumentManifestZipTrace(BaseModel):
     files_to_download: Dict[str, str]
     job_status: TraceStatus = TraceStatus.PENDING
     zip_file_location: str = ""
+    document_set_fingerprint: str = ""
+    expire_at: int | None = None
 
     @staticmethod
     def get_field_names_alias_list() -> list[str | None]:
@@ -54,10 +54,10 @@ class BulkUploadDynamoRepository:
         self.dynamo_records_in_transaction = []
 
     def rollback_transaction(self):
+        transaction = self.dynamo_repository.transaction()
         for document_reference in self.dynamo_records_in_transaction:
             primary_key_name = DocumentReferenceMetadataFields.ID.value
             primary_key_value = document_reference.id
             deletion_key = {primary_key_name: primary_key_value}
-            self.dynamo_repository.delete_item(
-                table_name=self.lg_dynamo_table, key=deletion_key
-            )
+            transaction.delete(table_name=self.lg_dynamo_table, key=deletion_key)
+        transaction.commit()
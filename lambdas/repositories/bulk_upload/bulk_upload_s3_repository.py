@@ -96,3 +96,9 @@ class BulkUploadS3Repository:
 
     def file_exists_on_staging_bucket(self, file_key: str) -> bool:
         return self.s3_repository.file_exist_on_s3(self.staging_bucket_name, file_key)
+
+    def files_exist_on_staging_bucket(self, file_keys: list[str]) -> dict[str, bool]:
+        object_heads = self.s3_repository.head_objects(
+            self.staging_bucket_name, file_keys
+        )
+        return {key: object_head.exists for key, object_head in object_heads.items()}
@@ -0,0 +1,112 @@
+import importlib
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.exceptions import ClientError
+from enums.metadata_field_names import DocumentReferenceMetadataFields
+from models.document_reference import DocumentReference
+from pydantic import ValidationError
+from services.document_service import DocumentService
+
+Fields = DocumentReferenceMetadataFields
+
+
+class FileSizeBackfill:
+    def __init__(self, table_name: str, max_workers: int = 10):
+        self.table_name = table_name
+        self.max_workers = max_workers
+        self.document_service = DocumentService()
+        self.logger = logging.getLogger("File size backfill")
+
+    def main(self):
+        self.logger.info("Starting file size backfill script")
+        self.logger.info(f"Table to be updated: {self.table_name}")
+
+        try:
+            self.run_update()
+        except Exception as e:
+            self.logger.error(e)
+            raise e
+
+    def run_update(self):
+        self.logger.info("Scanning dynamodb table page by page...")
+        total_count = 0
+        updated_count = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for page in self.document_service.dynamo_service.iterate_scan_pages(
+                table_name=self.table_name
+            ):
+                documents = self.filter_documents_missing_file_size(page)
+                results = list(executor.map(self.update_single_document, documents))
+                total_count += len(documents)
+                updated_count += results.count(True)
+
+        self.logger.info(f"Found {total_count} records without a file size")
+        self.logger.info(
+            f"Finished updating records ({updated_count} of {total_count} updated)"
+        )
+
+    def filter_documents_missing_file_size(
+        self, entries: list[dict]
+    ) -> list[DocumentReference]:
+        documents = []
+        for entry in entries:
+            if entry.get(Fields.FILE_SIZE.value) or entry.get(Fields.DELETED.value):
+                continue
+            try:
+                documents.append(DocumentReference.model_validate(entry))
+            except ValidationError as e:
+                self.logger.error(
+                    f"Skipping invalid record {entry.get(Fields.ID.value)}"
+                )
+                self.logger.error(e)
+        return documents
+
+    def update_single_document(self, document: DocumentReference) -> bool:
+        try:
+            document.file_size = self.document_service.s3_service.get_file_size(
+                s3_bucket_name=document.s3_bucket_name,
+                object_key=document.s3_file_key,
+            )
+            if not document.file_size:
+                return False
+
+            self.document_service.update_document_file_size(self.table_name, document)
+            return True
+        except ClientError as e:
+            self.logger.error(f"Unable to update record {document.id}: {e}")
+            return False
+
+
+def setup_logging_for_local_script():
+    importlib.reload(logging)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s] %(levelname)s [%(name)s.%(funcName)s:%(lineno)d] %(message)s",
+        datefmt="%d/%b/%Y %H:%M:%S",
+        stream=sys.stdout,
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    setup_logging_for_local_script()
+
+    parser = argparse.ArgumentParser(
+        prog="file_size_backfill_20261018.py",
+        description="A utility script to store the S3 object size on doc reference rows that are missing one",
+    )
+    parser.add_argument("table_name", type=str, help="The name of dynamodb table")
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=10,
+        help="Number of concurrent S3 lookups and updates",
+    )
+    args = parser.parse_args()
+
+    FileSizeBackfill(table_name=args.table_name, max_workers=args.max_workers).main()
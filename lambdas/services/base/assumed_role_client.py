@@ -0,0 +1,88 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+from botocore.client import Config as BotoConfig
+from services.base.iam_service import IAMService
+from utils.audit_logging_setup import LoggingService
+
+logger = LoggingService(__name__)
+
+
+class AssumedRoleClient:
+    """
+    A boto3 client for an assumed IAM role whose temporary credentials are kept
+    fresh. Anything signed with the client, such as a presigned URL, stops working
+    when the credentials expire, so they must always outlive min_remaining_lifetime
+    plus EXPIRY_MARGIN; below that the role is re-assumed before the client is
+    returned. REFRESH_WINDOW before that point the role is re-assumed on a
+    background thread instead, while callers carry on with the current client.
+    Lambda freezes the environment between invocations, so the background refresh
+    is only a head start and the synchronous check is what guarantees validity.
+    Nothing is assumed until the client is first needed, so services that never
+    presign never call STS.
+    """
+
+    REFRESH_WINDOW = timedelta(minutes=10)
+    EXPIRY_MARGIN = timedelta(minutes=1)
+
+    def __init__(
+        self,
+        role_arn: str,
+        resource_name: str,
+        config: BotoConfig = None,
+        iam_service: IAMService = None,
+        min_remaining_lifetime: timedelta = timedelta(0),
+    ):
+        self.role_arn = role_arn
+        self.resource_name = resource_name
+        self.config = config
+        self.iam_service = iam_service
+        self.required_lifetime = min_remaining_lifetime + self.EXPIRY_MARGIN
+        self.background_refresh_lifetime = self.required_lifetime + self.REFRESH_WINDOW
+        self.client = None
+        self.expiration_time = None
+        self.refresh_lock = threading.Lock()
+        self.refresh_thread_lock = threading.Lock()
+        self.refresh_thread = None
+
+    def get_client(self):
+        if self._expires_within(self.required_lifetime):
+            self.refresh()
+        elif self._expires_within(self.background_refresh_lifetime):
+            self.refresh_in_background()
+        return self.client
+
+    def refresh(self):
+        with self.refresh_lock:
+            # Another thread may have refreshed while this one waited for the lock.
+            if not self._expires_within(self.background_refresh_lifetime):
+                return
+            if self.iam_service is None:
+                self.iam_service = IAMService()
+            logger.info(f"Assuming role {self.role_arn} for {self.resource_name}")
+            self.client, self.expiration_time = self.iam_service.assume_role(
+                self.role_arn, self.resource_name, config=self.config
+            )
+
+    def refresh_in_background(self):
+        with self.refresh_thread_lock:
+            if self.refresh_thread and self.refresh_thread.is_alive():
+                return
+            self.refresh_thread = threading.Thread(
+                target=self._refresh_quietly, daemon=True
+            )
+            self.refresh_thread.start()
+
+    def _refresh_quietly(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(
+                f"Background refresh of role {self.role_arn} failed, "
+                f"will retry on next use: {str(e)}"
+            )
+
+    def _expires_within(self, window: timedelta) -> bool:
+        if self.client is None or self.expiration_time is None:
+            return True
+        return datetime.now(timezone.utc) >= self.expiration_time - window
@@ -1,19 +1,43 @@
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-import boto3
+from services.base.aws_client_factory import get_aws_client
 from utils.audit_logging_setup import LoggingService
 from utils.cloudwatch_logs_query import CloudwatchLogsQueryParams
 from utils.exceptions import LogsQueryException
 
 logger = LoggingService(__name__)
 
+MAX_QUERY_RESULTS = 10000
+
 
 class CloudwatchService:
     def __init__(self):
-        self.logs_client = boto3.client("logs")
+        self.logs_client = get_aws_client("logs")
         self.workspace = os.environ["WORKSPACE"]
         self.initialised = True
+        # Logs Insights allows a limited number of concurrent queries per account,
+        # shared with anything else querying logs, so stay well under it.
+        self.max_concurrent_queries = 10
+        self.initial_poll_interval = 0.5
+        self.max_poll_interval = 8
+
+    def query_logs_concurrently(
+        self,
+        queries: list[CloudwatchLogsQueryParams],
+        start_time: int,
+        end_time: int,
+    ) -> list[list[dict]]:
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_queries) as executor:
+            return list(
+                executor.map(
+                    lambda query_params: self.query_logs(
+                        query_params, start_time, end_time
+                    ),
+                    queries,
+                )
+            )
 
     def query_logs(
         self, query_params: CloudwatchLogsQueryParams, start_time: int, end_time: int
@@ -27,10 +51,16 @@ class CloudwatchService:
         query_id = response["queryId"]
 
         raw_query_result = self.poll_query_result(query_id)
+        if len(raw_query_result) >= MAX_QUERY_RESULTS:
+            logger.warning(
+                f"Logs query on {query_params.lambda_name} returned {MAX_QUERY_RESULTS} "
+                f"rows, results may be truncated"
+            )
         query_result = self.regroup_raw_query_result(raw_query_result)
         return query_result
 
     def poll_query_result(self, query_id: str, max_retries=20) -> list[list]:
+        poll_interval = self.initial_poll_interval
         for _ in range(max_retries):
             response = self.logs_client.get_query_results(queryId=query_id)
             if response["status"] == "Complete":
@@ -39,7 +69,8 @@ class CloudwatchService:
                 self.log_and_raise_error(
                     f"Logs query failed with status: {response['status']}"
                 )
-            time.sleep(1)
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, self.max_poll_interval)
 
         self.log_and_raise_error(
             f"Failed to get query result within max retries of {max_retries} times"
@@ -1,21 +1,82 @@
+import os
+import random
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from functools import partial
+from typing import Iterator, Optional
 
-import boto3
-from boto3.dynamodb.conditions import Attr, ConditionBase, Key
+from boto3.dynamodb.conditions import (
+    Attr,
+    ConditionBase,
+    ConditionExpressionBuilder,
+    Key,
+)
+from boto3.dynamodb.types import (
+    DYNAMODB_CONTEXT,
+    Binary,
+    TypeDeserializer,
+    TypeSerializer,
+)
 from botocore.exceptions import ClientError
+from services.base.aws_client_factory import get_aws_resource
 from utils.audit_logging_setup import LoggingService
+from utils.capacity_rate_limiter import CapacityRateLimiter
+from utils.concurrent_iteration import merge_iterators
 from utils.dynamo_utils import (
     create_expression_attribute_values,
     create_expressions,
     create_update_expression,
 )
-from utils.exceptions import DynamoServiceException
+from utils.exceptions import DynamoServiceException, DynamoTransactionException
 
 logger = LoggingService(__name__)
 
+_serialiser = TypeSerializer()
+_deserialiser = TypeDeserializer()
+
+
+def _decode_number(value: str) -> Decimal:
+    return DYNAMODB_CONTEXT.create_decimal(value)
+
+
+def _decode_attribute_value(attribute_value: dict):
+    (type_code, value) = next(iter(attribute_value.items()))
+    if type_code == "S":
+        return value
+    if type_code == "N":
+        return _decode_number(value)
+    if type_code == "M":
+        return {key: _decode_attribute_value(item) for key, item in value.items()}
+    if type_code == "L":
+        return [_decode_attribute_value(item) for item in value]
+    if type_code == "BOOL":
+        return value
+    if type_code == "B":
+        return Binary(value)
+    if type_code == "NULL":
+        return None
+    if type_code == "NS":
+        return {_decode_number(item) for item in value}
+    if type_code == "SS":
+        return set(value)
+    if type_code == "BS":
+        return {Binary(item) for item in value}
+    raise TypeError(f"Unsupported DynamoDB type: {type_code}")
+
 
 class DynamoDBService:
+    BATCH_GET_CHUNK_SIZE = 100
+    TRANSACTION_CHUNK_SIZE = 100
+    BATCH_GET_MAX_BACKOFF_SECONDS = 2
+    WRITE_OPERATIONS = {
+        "PutItem",
+        "UpdateItem",
+        "DeleteItem",
+        "BatchWriteItem",
+        "TransactWriteItems",
+    }
+
     _instance = None
 
     def __new__(cls):
@@ -26,12 +87,22 @@ class DynamoDBService:
 
     def __init__(self):
         if not self.initialised:
-            self.dynamodb = boto3.resource("dynamodb", region_name="eu-west-2")
+            self.dynamodb = get_aws_resource("dynamodb", region_name="eu-west-2")
+            self.batch_get_max_workers = 4
+            self.tables = {}
+            self.use_client_fast_path = (
+                os.getenv("DYNAMODB_CLIENT_FAST_PATH", "false").lower() == "true"
+            )
+            self.metrics_enabled = (
+                os.getenv("DYNAMODB_METRICS_ENABLED", "false").lower() == "true"
+            )
             self.initialised = True
 
     def get_table(self, table_name):
         try:
-            return self.dynamodb.Table(table_name)
+            if table_name not in self.tables:
+                self.tables[table_name] = self.dynamodb.Table(table_name)
+            return self.tables[table_name]
         except ClientError as e:
             logger.error(str(e), {"Result": "Unable to connect to DB"})
             raise e
@@ -45,10 +116,9 @@ class DynamoDBService:
         requested_fields: list[str] = None,
         query_filter: Attr | ConditionBase = None,
         exclusive_start_key: dict = None,
+        limit: int = None,
     ):
         try:
-            table = self.get_table(table_name)
-
             query_params = {
                 "KeyConditionExpression": Key(search_key).eq(search_condition),
             }
@@ -64,45 +134,133 @@ class DynamoDBService:
                 query_params["FilterExpression"] = query_filter
             if exclusive_start_key:
                 query_params["ExclusiveStartKey"] = exclusive_start_key
+            if limit:
+                query_params["Limit"] = limit
+            query_params.update(self._capacity_arguments())
 
-            results = table.query(**query_params)
+            started_at = time.perf_counter()
+            results = self._query_with_client(table_name, query_params)
 
             if results is None or "Items" not in results:
                 logger.error(f"Unusable results in DynamoDB: {results!r}")
                 raise DynamoServiceException("Unrecognised response from DynamoDB")
 
+            self._record_metrics(
+                "Query",
+                table_name,
+                started_at,
+                response=results,
+                index_name=index_name,
+            )
             return results
         except ClientError as e:
             logger.error(str(e), {"Result": f"Unable to query table: {table_name}"})
             raise e
 
+    def _query_with_client(self, table_name: str, query_params: dict) -> dict:
+        """
+        Run a query on the low-level client rather than a Table resource. Clients
+        are thread-safe while resources are not, and searches query several tables
+        from worker threads.
+        """
+        request = self._build_client_request(table_name, query_params)
+        response = self.dynamodb.meta.client.query(**request)
+        return self._decode_client_response(response)
+
+    def _build_client_request(self, table_name: str, request_params: dict) -> dict:
+        """
+        Convert resource-style arguments into a low-level client request, building
+        condition expressions and serialising values the same way the resource
+        layer does.
+        """
+        request = {"TableName": table_name, **request_params}
+        builder = ConditionExpressionBuilder()
+        attribute_names = {}
+        attribute_values = {}
+        for parameter, is_key_condition in (
+            ("KeyConditionExpression", True),
+            ("FilterExpression", False),
+        ):
+            if not isinstance(request.get(parameter), ConditionBase):
+                continue
+            expression = builder.build_expression(
+                request[parameter], is_key_condition=is_key_condition
+            )
+            request[parameter] = expression.condition_expression
+            attribute_names.update(expression.attribute_name_placeholders)
+            attribute_values.update(expression.attribute_value_placeholders)
+
+        if attribute_names:
+            request["ExpressionAttributeNames"] = attribute_names
+        if attribute_values:
+            request["ExpressionAttributeValues"] = self._serialise_item(
+                attribute_values
+            )
+        if "ExclusiveStartKey" in request:
+            request["ExclusiveStartKey"] = self._serialise_item(
+                request["ExclusiveStartKey"]
+            )
+        return request
+
+    def _decode_client_response(self, response: Optional[dict]) -> Optional[dict]:
+        if response is None:
+            return None
+        decode_item = (
+            self._decode_item if self.use_client_fast_path else self._deserialise_item
+        )
+        if "Items" in response:
+            response["Items"] = [decode_item(item) for item in response["Items"]]
+        if "LastEvaluatedKey" in response:
+            response["LastEvaluatedKey"] = self._deserialise_item(
+                response["LastEvaluatedKey"]
+            )
+        return response
+
     def query_with_pagination(
         self, table_name: str, search_key: str, search_condition: str
     ):
-
-        try:
-            table = self.get_table(table_name)
-            results = table.query(
-                KeyConditionExpression=Key(search_key).eq(search_condition)
+        return list(
+            self.iterate_query(
+                table_name=table_name,
+                search_key=search_key,
+                search_condition=search_condition,
             )
-            if results is None or "Items" not in results:
-                logger.error(f"Unusable results in DynamoDB: {results!r}")
-                raise DynamoServiceException("Unrecognised response from DynamoDB")
+        )
 
-            dynamodb_scan_result = results["Items"]
+    def iterate_query_pages(
+        self,
+        table_name: str,
+        search_key: str,
+        search_condition: str,
+        index_name: str = None,
+        requested_fields: list[str] = None,
+        query_filter: Attr | ConditionBase = None,
+    ) -> Iterator[list[dict]]:
+        """
+        Query a table lazily, yielding each page of items as it is read. The next
+        page is only requested when the caller asks for it, so stopping iteration
+        early stops reading from DynamoDB.
+        """
+        exclusive_start_key = None
+        while True:
+            response = self.query_table_by_index(
+                table_name=table_name,
+                index_name=index_name,
+                search_key=search_key,
+                search_condition=search_condition,
+                requested_fields=requested_fields,
+                query_filter=query_filter,
+                exclusive_start_key=exclusive_start_key,
+            )
+            yield response["Items"]
 
-            while "LastEvaluatedKey" in results:
-                start_key_for_next_page = results["LastEvaluatedKey"]
-                results = table.query(
-                    KeyConditionExpression=Key(search_key).eq(search_condition),
-                    ExclusiveStartKey=start_key_for_next_page,
-                )
-                dynamodb_scan_result.extend(results["Items"])
-            return dynamodb_scan_result
+            exclusive_start_key = response.get("LastEvaluatedKey")
+            if not exclusive_start_key:
+                return
 
-        except ClientError as e:
-            logger.error(str(e), {"Result": f"Unable to query table: {table_name}"})
-            raise e
+    def iterate_query(self, table_name: str, **kwargs) -> Iterator[dict]:
+        for page in self.iterate_query_pages(table_name, **kwargs):
+            yield from page
 
     def query_all_fields(self, table_name: str, search_key: str, search_condition: str):
         """
@@ -110,22 +268,41 @@ class DynamoDBService:
         """
         try:
             table = self.get_table(table_name)
+            started_at = time.perf_counter()
             results = table.query(
-                KeyConditionExpression=Key(search_key).eq(search_condition)
+                KeyConditionExpression=Key(search_key).eq(search_condition),
+                **self._capacity_arguments(),
             )
             if results is None or "Items" not in results:
                 logger.error(f"Unusable results in DynamoDB: {results!r}")
                 raise DynamoServiceException("Unrecognised response from DynamoDB")
+            self._record_metrics(
+                "Query",
+                table_name,
+                started_at,
+                response=results,
+            )
             return results
         except ClientError as e:
             logger.error(str(e), {"Result": f"Unable to query table: {table_name}"})
             raise e
 
-    def create_item(self, table_name, item):
+    def create_item(self, table_name, item, condition_expression: str = None):
         try:
             table = self.get_table(table_name)
             logger.info(f"Writing item to table: {table_name}")
-            table.put_item(Item=item)
+            put_item_args = {"Item": item, **self._capacity_arguments()}
+            if condition_expression:
+                put_item_args["ConditionExpression"] = condition_expression
+            started_at = time.perf_counter()
+            response = table.put_item(**put_item_args)
+            self._record_metrics(
+                "PutItem",
+                table_name,
+                started_at,
+                response=response,
+                item_count=1,
+            )
         except ClientError as e:
             logger.error(
                 str(e), {"Result": f"Unable to write item to table: {table_name}"}
@@ -140,7 +317,10 @@ class DynamoDBService:
         condition_expression: str = None,
         expression_attribute_values: dict = None,
     ):
-        table = self.get_table(table_name)
+        """
+        Update fields on an item through the low-level client, so that the update
+        can be made from worker threads as well as from the request thread.
+        """
         updated_field_names = list(updated_fields.keys())
         update_expression = create_update_expression(updated_field_names)
         _, expression_attribute_names = create_expressions(updated_field_names)
@@ -153,23 +333,81 @@ class DynamoDBService:
             generated_expression_attribute_values.update(expression_attribute_values)
 
         update_item_args = {
-            "Key": key_pair,
+            "TableName": table_name,
+            "Key": self._serialise_item(key_pair),
             "UpdateExpression": update_expression,
             "ExpressionAttributeNames": expression_attribute_names,
-            "ExpressionAttributeValues": generated_expression_attribute_values,
+            "ExpressionAttributeValues": self._serialise_item(
+                generated_expression_attribute_values
+            ),
             "ReturnValues": "ALL_NEW",
         }
 
         if condition_expression:
             update_item_args["ConditionExpression"] = condition_expression
+        update_item_args.update(self._capacity_arguments())
 
-        return table.update_item(**update_item_args)
+        started_at = time.perf_counter()
+        response = self.dynamodb.meta.client.update_item(**update_item_args)
+        if "Attributes" in response:
+            response["Attributes"] = self._deserialise_item(response["Attributes"])
+        self._record_metrics(
+            "UpdateItem",
+            table_name,
+            started_at,
+            response=response,
+            item_count=1,
+        )
+        return response
+
+    def increment_item_counter(
+        self,
+        table_name: str,
+        key_pair: dict[str, str],
+        counter_field: str,
+        condition_expression: str = None,
+        expression_attribute_values: dict = None,
+    ):
+        table = self.get_table(table_name)
+        update_item_args = {
+            "Key": key_pair,
+            "UpdateExpression": "ADD #counter :increment",
+            "ExpressionAttributeNames": {"#counter": counter_field},
+            "ExpressionAttributeValues": {
+                ":increment": 1,
+                **(expression_attribute_values or {}),
+            },
+            "ReturnValues": "ALL_NEW",
+        }
+
+        if condition_expression:
+            update_item_args["ConditionExpression"] = condition_expression
+        update_item_args.update(self._capacity_arguments())
+
+        started_at = time.perf_counter()
+        response = table.update_item(**update_item_args)
+        self._record_metrics(
+            "UpdateItem",
+            table_name,
+            started_at,
+            response=response,
+            item_count=1,
+        )
+        return response
 
     def delete_item(self, table_name: str, key: dict):
         try:
             table = self.get_table(table_name)
-            table.delete_item(Key=key)
+            started_at = time.perf_counter()
+            response = table.delete_item(Key=key, **self._capacity_arguments())
             logger.info(f"Deleting item in table: {table_name}")
+            self._record_metrics(
+                "DeleteItem",
+                table_name,
+                started_at,
+                response=response,
+                item_count=1,
+            )
         except ClientError as e:
             logger.error(
                 str(e), {"Result": f"Unable to delete item in table: {table_name}"}
@@ -184,16 +422,21 @@ class DynamoDBService:
     ):
         try:
             table = self.get_table(table_name)
-            if not filter_expression and not exclusive_start_key:
-                return table.scan()
-            if filter_expression is None:
-                return table.scan(ExclusiveStartKey=exclusive_start_key)
-            if exclusive_start_key is None:
-                return table.scan(FilterExpression=filter_expression)
-            return table.scan(
-                FilterExpression=filter_expression,
-                ExclusiveStartKey=exclusive_start_key,
+            scan_arguments = self._capacity_arguments()
+            if filter_expression is not None:
+                scan_arguments["FilterExpression"] = filter_expression
+            if exclusive_start_key is not None:
+                scan_arguments["ExclusiveStartKey"] = exclusive_start_key
+
+            started_at = time.perf_counter()
+            response = table.scan(**scan_arguments)
+            self._record_metrics(
+                "Scan",
+                table_name,
+                started_at,
+                response=response,
             )
+            return response
         except ClientError as e:
             logger.error(str(e), {"Result": f"Unable to scan table: {table_name}"})
             raise e
@@ -203,84 +446,600 @@ class DynamoDBService:
         table_name: str,
         project_expression: Optional[str] = None,
         filter_expression: Optional[str] = None,
+        total_segments: int = 1,
+        max_workers: Optional[int] = None,
+        max_capacity_units_per_second: Optional[float] = None,
+    ) -> list[dict]:
+        """
+        Scan every page of a table. With total_segments above 1 the table is split
+        into that many segments, which are scanned in parallel by up to max_workers
+        threads (one per segment by default). max_capacity_units_per_second caps the
+        read capacity consumed across all segments together.
+        """
+        scan_arguments, rate_limiter = self._build_scan_arguments(
+            project_expression, filter_expression, max_capacity_units_per_second
+        )
+
+        if total_segments <= 1:
+            return self._scan_segment(table_name, scan_arguments, rate_limiter)
+
+        logger.info(f"Scanning {table_name} in {total_segments} parallel segments")
+        with ThreadPoolExecutor(max_workers=max_workers or total_segments) as executor:
+            segment_results = executor.map(
+                lambda segment: self._scan_segment(
+                    table_name,
+                    {
+                        **scan_arguments,
+                        "Segment": segment,
+                        "TotalSegments": total_segments,
+                    },
+                    rate_limiter,
+                ),
+                range(total_segments),
+            )
+            return [item for items in segment_results for item in items]
+
+    def iterate_scan_pages(
+        self,
+        table_name: str,
+        project_expression: Optional[str] = None,
+        filter_expression: Optional[str] = None,
+        total_segments: int = 1,
+        max_workers: Optional[int] = None,
+        max_capacity_units_per_second: Optional[float] = None,
+    ) -> Iterator[list[dict]]:
+        """
+        Lazily scan a table, yielding each page of items as it is read so the
+        caller never holds more than a few pages in memory. Takes the same
+        arguments as scan_whole_table. Parallel segments hand their pages over
+        through a small bounded queue, so pages arrive in no particular order and
+        the workers pause while the caller is busy. Stopping iteration early stops
+        every segment after its current page.
+        """
+        scan_arguments, rate_limiter = self._build_scan_arguments(
+            project_expression, filter_expression, max_capacity_units_per_second
+        )
+
+        if total_segments <= 1:
+            yield from self._iterate_segment_pages(
+                table_name, scan_arguments, rate_limiter
+            )
+            return
+
+        logger.info(f"Scanning {table_name} in {total_segments} parallel segments")
+        yield from merge_iterators(
+            [
+                partial(
+                    self._iterate_segment_pages,
+                    table_name,
+                    {
+                        **scan_arguments,
+                        "Segment": segment,
+                        "TotalSegments": total_segments,
+                    },
+                    rate_limiter,
+                )
+                for segment in range(total_segments)
+            ],
+            max_workers=max_workers,
+        )
+
+    def iterate_scan(self, table_name: str, **kwargs) -> Iterator[dict]:
+        for page in self.iterate_scan_pages(table_name, **kwargs):
+            yield from page
+
+    @staticmethod
+    def _build_scan_arguments(
+        project_expression: Optional[str],
+        filter_expression: Optional[str],
+        max_capacity_units_per_second: Optional[float],
+    ) -> tuple[dict, Optional[CapacityRateLimiter]]:
+        scan_arguments = {}
+        if project_expression:
+            scan_arguments["ProjectionExpression"] = project_expression
+        if filter_expression:
+            scan_arguments["FilterExpression"] = filter_expression
+
+        rate_limiter = None
+        if max_capacity_units_per_second:
+            rate_limiter = CapacityRateLimiter(max_capacity_units_per_second)
+            scan_arguments["ReturnConsumedCapacity"] = "TOTAL"
+        return scan_arguments, rate_limiter
+
+    def _scan_segment(
+        self,
+        table_name: str,
+        scan_arguments: dict,
+        rate_limiter: Optional[CapacityRateLimiter] = None,
     ) -> list[dict]:
+        return [
+            item
+            for page in self._iterate_segment_pages(
+                table_name, scan_arguments, rate_limiter
+            )
+            for item in page
+        ]
+
+    def _iterate_segment_pages(
+        self,
+        table_name: str,
+        scan_arguments: dict,
+        rate_limiter: Optional[CapacityRateLimiter] = None,
+    ) -> Iterator[list[dict]]:
+        scan_arguments = {**self._capacity_arguments(), **scan_arguments}
+        started_at = time.perf_counter()
+        consumed_capacity_units = 0
+        item_count = 0
+        page_count = 0
         try:
-            table = self.get_table(table_name)
-            scan_arguments = {}
-            if project_expression:
-                scan_arguments["ProjectionExpression"] = project_expression
-            if filter_expression:
-                scan_arguments["FilterExpression"] = filter_expression
+            paginated_result = self._scan_with_client(table_name, scan_arguments)
+            while True:
+                page_count += 1
+                page_capacity_units = self._get_consumed_capacity_units(
+                    paginated_result
+                )
+                consumed_capacity_units += page_capacity_units or 0
+                items = paginated_result.get("Items", [])
+                item_count += len(items)
+                yield items
 
-            paginated_result = table.scan(**scan_arguments)
-            dynamodb_scan_result = paginated_result.get("Items", [])
-            while "LastEvaluatedKey" in paginated_result:
+                if "LastEvaluatedKey" not in paginated_result:
+                    break
+                if rate_limiter:
+                    rate_limiter.consume(page_capacity_units or 0)
                 start_key_for_next_page = paginated_result["LastEvaluatedKey"]
-                paginated_result = table.scan(
-                    **scan_arguments,
-                    ExclusiveStartKey=start_key_for_next_page,
+                paginated_result = self._scan_with_client(
+                    table_name,
+                    {**scan_arguments, "ExclusiveStartKey": start_key_for_next_page},
                 )
-                dynamodb_scan_result += paginated_result["Items"]
-            return dynamodb_scan_result
 
         except ClientError as e:
             logger.error(str(e), {"Result": f"Unable to scan table: {table_name}"})
             raise e
+        finally:
+            self._record_metrics(
+                "Scan",
+                table_name,
+                started_at,
+                consumed_capacity_units=consumed_capacity_units,
+                item_count=item_count,
+                page_count=page_count,
+            )
+
+    def _scan_with_client(self, table_name: str, scan_arguments: dict) -> dict:
+        """
+        Scan one page on the low-level client, which unlike a Table resource can
+        be shared by the threads scanning parallel segments.
+        """
+        request = self._build_client_request(table_name, scan_arguments)
+        response = self.dynamodb.meta.client.scan(**request)
+        return self._decode_client_response(response)
 
     def batch_writing(self, table_name: str, item_list: list[dict]):
         try:
             table = self.get_table(table_name)
             logger.info(f"Writing item to table: {table_name}")
+            started_at = time.perf_counter()
             with table.batch_writer() as batch:
                 for item in item_list:
                     batch.put_item(Item=item)
+            self._record_metrics(
+                "BatchWriteItem", table_name, started_at, item_count=len(item_list)
+            )
         except ClientError as e:
             logger.error(
                 str(e), {"Result": f"Unable to write item to table: {table_name}"}
             )
             raise e
 
-    def batch_get_items(self, table_name: str, key_list: list[str]):
-        if len(key_list) > 100:
-            return DynamoServiceException("Cannot fetch more than 100 items at a time")
+    def transaction(self) -> "DynamoDBTransaction":
+        return DynamoDBTransaction(self)
+
+    def transact_write_items(self, actions: list[dict]):
+        """
+        Commit TransactWriteItems actions in chunks of 100, the most DynamoDB
+        accepts in one transaction. Each chunk is atomic on its own; if a chunk is
+        cancelled the chunks before it stay committed and a
+        DynamoTransactionException describing why each action failed is raised.
+        """
+        client = self.dynamodb.meta.client
+        for index in range(0, len(actions), self.TRANSACTION_CHUNK_SIZE):
+            chunk = actions[index : index + self.TRANSACTION_CHUNK_SIZE]
+            started_at = time.perf_counter()
+            try:
+                response = client.transact_write_items(
+                    TransactItems=chunk, **self._capacity_arguments()
+                )
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "TransactionCanceledException":
+                    logger.error(str(e), {"Result": "Unable to write transaction"})
+                    raise e
+
+                reasons = self._decode_cancellation_reasons(chunk, e.response)
+                logger.error(
+                    f"Transaction cancelled: {reasons}",
+                    {"Result": "Unable to write transaction"},
+                )
+                raise DynamoTransactionException(
+                    f"Transaction of {len(chunk)} actions was cancelled", reasons
+                ) from e
 
-        keys_to_get = [{"ID": item_id} for item_id in key_list]
-        request_items = {table_name: {"Keys": keys_to_get}}
+            table_names = sorted(
+                {next(iter(action.values()))["TableName"] for action in chunk}
+            )
+            self._record_metrics(
+                "TransactWriteItems",
+                ",".join(table_names),
+                started_at,
+                consumed_capacity_units=self._get_consumed_capacity_units(response),
+                item_count=len(chunk),
+            )
 
-        all_fetched_items = []
-        retries = 0
-        max_retries = 3
+    @staticmethod
+    def _decode_cancellation_reasons(actions: list[dict], error_response: dict):
+        reasons = []
+        for action, reason in zip(
+            actions, error_response.get("CancellationReasons", [])
+        ):
+            if reason.get("Code", "None") == "None":
+                continue
+            (action_type, request) = next(iter(action.items()))
+            reasons.append(
+                {
+                    "Action": action_type,
+                    "TableName": request["TableName"],
+                    "Key": (
+                        DynamoDBService._decode_item(request["Key"])
+                        if "Key" in request
+                        else None
+                    ),
+                    "Code": reason["Code"],
+                    "Message": reason.get("Message"),
+                }
+            )
+        return reasons
 
-        while request_items[table_name]["Keys"] and retries < max_retries:
-            try:
-                response = self.dynamodb.batch_get_item(RequestItems=request_items)
-
-                table_responses = response.get("Responses", {}).get(table_name, [])
-                all_fetched_items.extend(table_responses)
-
-                unprocessed_keys = response.get("UnprocessedKeys", {})
-                if table_name in unprocessed_keys:
-                    logger.info(
-                        f"Retrying {len(unprocessed_keys[table_name]['Keys'])} unprocessed keys..."
-                    )
-                    request_items = unprocessed_keys
-                    retries += 1
-                    time.sleep((2**retries) * 0.1)
-                else:
-                    break
+    def batch_get_items(
+        self,
+        table_name: str,
+        key_list: list[str] | list[dict],
+        key_name: str = "ID",
+        requested_fields: list[str] = None,
+        max_wait_seconds: float = 10,
+    ) -> list[dict]:
+        """
+        Fetch items by key with BatchGetItem, splitting the keys into chunks of 100
+        that are requested concurrently. Keys may be plain values of key_name or
+        full key dicts for any key schema. UnprocessedKeys are retried with
+        jittered exponential backoff until max_wait_seconds has passed, after which
+        a DynamoServiceException is raised. Items are returned in no particular order.
+        """
+        keys = self._deduplicate_keys(
+            [key if isinstance(key, dict) else {key_name: key} for key in key_list]
+        )
+        if not keys:
+            return []
+
+        table_request = {}
+        if requested_fields:
+            field_names = {f"#{field}_attr": field for field in requested_fields}
+            table_request["ProjectionExpression"] = ",".join(field_names)
+            table_request["ExpressionAttributeNames"] = field_names
+
+        chunks = [
+            keys[index : index + self.BATCH_GET_CHUNK_SIZE]
+            for index in range(0, len(keys), self.BATCH_GET_CHUNK_SIZE)
+        ]
+        deadline = time.monotonic() + max_wait_seconds
+        max_workers = min(self.batch_get_max_workers, len(chunks))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            chunk_results = executor.map(
+                lambda chunk: self._batch_get_chunk(
+                    table_name, chunk, table_request, deadline
+                ),
+                chunks,
+            )
+            return [item for items in chunk_results for item in items]
 
-            except Exception as e:
-                print(f"An error occurred during batch_get_item: {e}")
+    def _batch_get_chunk(
+        self, table_name: str, keys: list[dict], table_request: dict, deadline: float
+    ) -> list[dict]:
+        client = self.dynamodb.meta.client
+        pending_keys = [self._serialise_item(key) for key in keys]
+        fetched_items = []
+        attempt = 0
+        started_at = time.perf_counter()
+        consumed_capacity_units = 0
+
+        while pending_keys:
+            request_items = {table_name: {**table_request, "Keys": pending_keys}}
+            try:
+                response = client.batch_get_item(
+                    RequestItems=request_items, **self._capacity_arguments()
+                )
+            except ClientError as e:
+                logger.error(
+                    str(e), {"Result": f"Unable to batch get items from: {table_name}"}
+                )
                 raise e
-        return all_fetched_items
 
-    def get_item(self, table_name: str, key: dict):
+            fetched_items.extend(
+                self._deserialise_item(item)
+                for item in response.get("Responses", {}).get(table_name, [])
+            )
+            consumed_capacity_units += self._get_consumed_capacity_units(response) or 0
+            pending_keys = (
+                response.get("UnprocessedKeys", {}).get(table_name, {}).get("Keys", [])
+            )
+            if not pending_keys:
+                break
+
+            remaining_seconds = deadline - time.monotonic()
+            if remaining_seconds <= 0:
+                logger.error(
+                    f"{len(pending_keys)} keys still unprocessed at deadline",
+                    {"Result": f"Unable to batch get items from: {table_name}"},
+                )
+                raise DynamoServiceException(
+                    f"Unable to fetch {len(pending_keys)} items from {table_name}"
+                )
+
+            attempt += 1
+            backoff = min(self.BATCH_GET_MAX_BACKOFF_SECONDS, 0.05 * (2**attempt))
+            logger.info(f"Retrying {len(pending_keys)} unprocessed keys...")
+            time.sleep(min(random.uniform(0, backoff), remaining_seconds))
+
+        self._record_metrics(
+            "BatchGetItem",
+            table_name,
+            started_at,
+            consumed_capacity_units=consumed_capacity_units,
+            item_count=len(fetched_items),
+            page_count=attempt + 1,
+        )
+        return fetched_items
+
+    @staticmethod
+    def _deduplicate_keys(keys: list[dict]) -> list[dict]:
+        unique_keys = {}
+        for key in keys:
+            unique_keys.setdefault(tuple(sorted(key.items())), key)
+        return list(unique_keys.values())
+
+    @staticmethod
+    def _serialise_item(item: dict) -> dict:
+        return {key: _serialiser.serialize(value) for key, value in item.items()}
+
+    @staticmethod
+    def _deserialise_item(item: dict) -> dict:
+        return {key: _deserialiser.deserialize(value) for key, value in item.items()}
+
+    @staticmethod
+    def _decode_item(item: dict) -> dict:
+        """
+        Lean alternative to _deserialise_item for the client fast path. Values
+        decode exactly as TypeDeserializer would, numbers included, but strings
+        are returned without a dispatch through the deserialiser, which makes
+        decoding string-heavy rows such as document references much cheaper.
+        """
+        return {
+            key: value["S"] if "S" in value else _decode_attribute_value(value)
+            for key, value in item.items()
+        }
+
+    def get_item(self, table_name: str, key: dict, consistent_read: bool = False):
         try:
-            table = self.get_table(table_name)
             logger.info(f"Retrieving item from table: {table_name}")
-            return table.get_item(Key=key)
+            started_at = time.perf_counter()
+            read_arguments = {"ConsistentRead": True} if consistent_read else {}
+            if self.use_client_fast_path:
+                response = self.dynamodb.meta.client.get_item(
+                    TableName=table_name,
+                    Key=self._serialise_item(key),
+                    **read_arguments,
+                    **self._capacity_arguments(),
+                )
+                if "Item" in response:
+                    response["Item"] = self._decode_item(response["Item"])
+            else:
+                response = self.get_table(table_name).get_item(
+                    Key=key, **read_arguments, **self._capacity_arguments()
+                )
+            self._record_metrics(
+                "GetItem",
+                table_name,
+                started_at,
+                response=response,
+            )
+            return response
         except ClientError as e:
             logger.error(
                 str(e), {"Result": f"Unable to retrieve item from table: {table_name}"}
             )
             raise e
+
+    def _capacity_arguments(self) -> dict:
+        return {"ReturnConsumedCapacity": "TOTAL"} if self.metrics_enabled else {}
+
+    @staticmethod
+    def _get_consumed_capacity_units(response: dict) -> Optional[float]:
+        consumed_capacity = (response or {}).get("ConsumedCapacity")
+        if not consumed_capacity:
+            return None
+        if isinstance(consumed_capacity, dict):
+            consumed_capacity = [consumed_capacity]
+        return sum(entry.get("CapacityUnits", 0) for entry in consumed_capacity)
+
+    def _record_metrics(
+        self,
+        operation: str,
+        table_name: str,
+        started_at: float,
+        response: dict = None,
+        consumed_capacity_units: Optional[float] = None,
+        item_count: Optional[int] = None,
+        page_count: int = 1,
+        index_name: Optional[str] = None,
+    ):
+        """
+        Log the cost of a DynamoDB call as a structured DynamoDBMetrics entry
+        tagged with the Lambda it ran in. Only emitted when
+        DYNAMODB_METRICS_ENABLED is set, as ReturnConsumedCapacity is requested
+        on every call while it is on.
+        """
+        if not self.metrics_enabled:
+            return
+
+        if response is not None:
+            consumed_capacity_units = self._get_consumed_capacity_units(response)
+            if item_count is None:
+                item_count = (
+                    len(response["Items"])
+                    if "Items" in response
+                    else int(bool(response.get("Item")))
+                )
+
+        logger.info(
+            f"DynamoDB {operation} on {table_name}",
+            {
+                "DynamoDBMetrics": {
+                    "Handler": os.getenv("AWS_LAMBDA_FUNCTION_NAME"),
+                    "Operation": operation,
+                    "Table": table_name,
+                    "Index": index_name,
+                    "CapacityType": (
+                        "WCU" if operation in self.WRITE_OPERATIONS else "RCU"
+                    ),
+                    "ConsumedCapacityUnits": consumed_capacity_units,
+                    "ItemCount": item_count,
+                    "PageCount": page_count,
+                    "DurationMs": round((time.perf_counter() - started_at) * 1000, 2),
+                }
+            },
+        )
+
+
+class DynamoDBTransaction:
+    """
+    Collects puts, updates, deletes and condition checks and commits them with
+    TransactWriteItems. Transactions over 100 actions are committed in chunks of
+    100 and are only atomic within each chunk. Conditions can be given as boto3
+    Attr conditions or expression strings.
+    """
+
+    def __init__(self, dynamo_service: DynamoDBService):
+        self.dynamo_service = dynamo_service
+        self.actions: list[dict] = []
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def put(
+        self,
+        table_name: str,
+        item: dict,
+        condition_expression: ConditionBase | str = None,
+    ) -> "DynamoDBTransaction":
+        self.actions.append(
+            {
+                "Put": self._build_action(
+                    table_name,
+                    condition_expression,
+                    Item=DynamoDBService._serialise_item(item),
+                )
+            }
+        )
+        return self
+
+    def update(
+        self,
+        table_name: str,
+        key: dict,
+        updated_fields: dict,
+        condition_expression: ConditionBase | str = None,
+    ) -> "DynamoDBTransaction":
+        field_names = list(updated_fields)
+        _, attribute_names = create_expressions(field_names)
+        self.actions.append(
+            {
+                "Update": self._build_action(
+                    table_name,
+                    condition_expression,
+                    attribute_names=attribute_names,
+                    attribute_values=create_expression_attribute_values(updated_fields),
+                    Key=DynamoDBService._serialise_item(key),
+                    UpdateExpression=create_update_expression(field_names),
+                )
+            }
+        )
+        return self
+
+    def delete(
+        self,
+        table_name: str,
+        key: dict,
+        condition_expression: ConditionBase | str = None,
+    ) -> "DynamoDBTransaction":
+        self.actions.append(
+            {
+                "Delete": self._build_action(
+                    table_name,
+                    condition_expression,
+                    Key=DynamoDBService._serialise_item(key),
+                )
+            }
+        )
+        return self
+
+    def condition_check(
+        self,
+        table_name: str,
+        key: dict,
+        condition_expression: ConditionBase | str,
+    ) -> "DynamoDBTransaction":
+        self.actions.append(
+            {
+                "ConditionCheck": self._build_action(
+                    table_name,
+                    condition_expression,
+                    Key=DynamoDBService._serialise_item(key),
+                )
+            }
+        )
+        return self
+
+    def commit(self):
+        if not self.actions:
+            return
+        logger.info(f"Committing transaction of {len(self.actions)} actions")
+        self.dynamo_service.transact_write_items(self.actions)
+        self.actions = []
+
+    @staticmethod
+    def _build_action(
+        table_name: str,
+        condition_expression: ConditionBase | str = None,
+        attribute_names: dict = None,
+        attribute_values: dict = None,
+        **request,
+    ) -> dict:
+        attribute_names = dict(attribute_names or {})
+        attribute_values = dict(attribute_values or {})
+
+        if isinstance(condition_expression, ConditionBase):
+            condition = ConditionExpressionBuilder().build_expression(
+                condition_expression
+            )
+            request["ConditionExpression"] = condition.condition_expression
+            attribute_names.update(condition.attribute_name_placeholders)
+            attribute_values.update(condition.attribute_value_placeholders)
+        elif condition_expression:
+            request["ConditionExpression"] = condition_expression
+
+        if attribute_names:
+            request["ExpressionAttributeNames"] = attribute_names
+        if attribute_values:
+            request["ExpressionAttributeValues"] = DynamoDBService._serialise_item(
+                attribute_values
+            )
+        return {"TableName": table_name, **request}
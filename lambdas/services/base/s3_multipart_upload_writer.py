@@ -0,0 +1,120 @@
+import io
+from typing import Any, Mapping
+
+from utils.audit_logging_setup import LoggingService
+
+logger = LoggingService(__name__)
+
+
+class S3MultipartUploadWriter(io.RawIOBase):
+    """
+    Write-only, non-seekable file object that uploads whatever is written to it
+    as an S3 multipart upload, flushing a part each time part_size bytes have been
+    buffered. Memory use is bounded by the part size rather than the object size.
+
+    Objects smaller than one part are sent with a single put_object. Exiting the
+    context manager with an exception aborts the upload so no parts are left behind.
+    """
+
+    MIN_PART_SIZE = 5 * 1024 * 1024
+
+    def __init__(
+        self,
+        client,
+        bucket: str,
+        key: str,
+        part_size: int = 8 * 1024 * 1024,
+        extra_args: Mapping[str, Any] = None,
+    ):
+        super().__init__()
+        if part_size < self.MIN_PART_SIZE:
+            raise ValueError(
+                f"Multipart upload part size must be at least {self.MIN_PART_SIZE} bytes"
+            )
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.extra_args = dict(extra_args or {})
+        self.upload_id = None
+        self.parts: list[dict] = []
+        self.buffer = bytearray()
+        self.bytes_written = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed multipart upload writer")
+
+        self.buffer += data
+        self.bytes_written += len(data)
+        while len(self.buffer) >= self.part_size:
+            self._upload_part(self.part_size)
+        return len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self.upload_id is None:
+                self.client.put_object(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    Body=bytes(self.buffer),
+                    **self.extra_args,
+                )
+            else:
+                if self.buffer:
+                    self._upload_part(len(self.buffer))
+                self.client.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=self.upload_id,
+                    MultipartUpload={"Parts": self.parts},
+                )
+            logger.info(
+                f"Uploaded {self.bytes_written} bytes to s3://{self.bucket}/{self.key}"
+            )
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self.buffer = bytearray()
+            super().close()
+
+    def abort(self):
+        if self.upload_id is not None:
+            logger.info(f"Aborting multipart upload to s3://{self.bucket}/{self.key}")
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id
+            )
+            self.upload_id = None
+        self.buffer = bytearray()
+        super().close()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    def _upload_part(self, size: int):
+        if self.upload_id is None:
+            response = self.client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, **self.extra_args
+            )
+            self.upload_id = response["UploadId"]
+
+        part_number = len(self.parts) + 1
+        body = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        self.parts.append({"ETag": response["ETag"], "PartNumber": part_number})
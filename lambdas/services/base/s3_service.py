@@ -1,59 +1,108 @@
 import io
-from datetime import datetime, timedelta, timezone
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
 from io import BytesIO
-from typing import Any, Mapping
+from typing import Any, Iterable, Iterator, Mapping, NamedTuple
 
-import boto3
-from botocore.client import Config as BotoConfig
-from botocore.exceptions import ClientError
-from services.base.iam_service import IAMService
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError, IncompleteReadError
+from enums.s3_transfer_profile import S3TransferProfile
+from services.base.assumed_role_client import AssumedRoleClient
+from services.base.aws_client_factory import build_boto_config, get_aws_client
+from services.base.s3_multipart_upload_writer import S3MultipartUploadWriter
 from utils.audit_logging_setup import LoggingService
+from utils.concurrent_iteration import merge_iterators
 from utils.exceptions import TagNotFoundException
 
 logger = LoggingService(__name__)
 
 
+class S3ObjectHead(NamedTuple):
+    exists: bool
+    size: int | None = None
+    etag: str | None = None
+
+
+MISSING_OBJECT = S3ObjectHead(exists=False)
+
+
 class S3Service:
-    _instance = None
-    EXPIRED_SESSION_WARNING = "Expired session, creating a new role session"
+    """
+    One instance is kept per custom_aws_role, so callers presigning URLs under
+    different roles each get their own assumed-role client. The plain client is
+    shared by every instance through the AWS client factory.
+    """
+
+    _instances = {}
+    STREAM_CHUNK_SIZE = 64 * 1024
+    CLIENT_CONFIG_OPTIONS = {
+        "s3": {"addressing_style": "virtual"},
+        "signature_version": "s3v4",
+    }
+    # Each transfer holds up to max_concurrency chunks of multipart_chunksize in
+    # memory, so profiles trade part size against threads for what the calling
+    # Lambda can spare. Report CSVs are small enough to go up in a single PUT and
+    # the stitched PDFs are large and benefit from many parallel parts. Zip
+    # archives are streamed through open_multipart_upload_writer, which uploads
+    # one part at a time and only takes its part size from the profile.
+    TRANSFER_PROFILE_OPTIONS = {
+        S3TransferProfile.DEFAULT: {},
+        S3TransferProfile.REPORT: {
+            "multipart_threshold": 64 * 1024 * 1024,
+            "max_concurrency": 2,
+        },
+        S3TransferProfile.STITCHED_PDF: {
+            "multipart_threshold": 16 * 1024 * 1024,
+            "multipart_chunksize": 16 * 1024 * 1024,
+            "max_concurrency": 10,
+            "io_chunksize": 1024 * 1024,
+        },
+        S3TransferProfile.ZIP_ARCHIVE: {
+            "multipart_chunksize": 32 * 1024 * 1024,
+        },
+    }
 
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.initialised = False
-        return cls._instance
+    def __new__(cls, custom_aws_role=None, *args, **kwargs):
+        if custom_aws_role not in cls._instances:
+            instance = super().__new__(cls)
+            instance.initialised = False
+            cls._instances[custom_aws_role] = instance
+        return cls._instances[custom_aws_role]
 
     def __init__(self, custom_aws_role=None):
         if not self.initialised:
-            self.config = BotoConfig(
-                retries={"max_attempts": 3, "mode": "standard"},
-                s3={"addressing_style": "virtual"},
-                signature_version="s3v4",
-                max_pool_connections=20,
-            )
+            self.config = build_boto_config(**self.CLIENT_CONFIG_OPTIONS)
             self.presigned_url_expiry = 1800
-            self.client = boto3.client("s3", config=self.config)
-            self.initialised = True
-            self.custom_client = None
+            self.ranged_get_threshold = 16 * 1024 * 1024
+            self.ranged_get_part_size = 8 * 1024 * 1024
+            self.ranged_get_max_workers = 4
+            self.head_objects_max_workers = 16
+            self.head_objects_listing_threshold = 50
+            self.head_objects_keys_per_list_page = 10
+            self.list_objects_max_workers = 10
+            self.transfer_configs = {
+                profile: TransferConfig(**options)
+                for profile, options in self.TRANSFER_PROFILE_OPTIONS.items()
+            }
+            self.client = get_aws_client("s3", **self.CLIENT_CONFIG_OPTIONS)
             self.custom_aws_role = custom_aws_role
+            self.custom_role_client = None
             if custom_aws_role:
-                self.iam_service = IAMService()
-                self.custom_client, self.expiration_time = self.iam_service.assume_role(
-                    self.custom_aws_role, "s3", config=self.config
+                self.custom_role_client = AssumedRoleClient(
+                    custom_aws_role,
+                    "s3",
+                    config=self.config,
+                    min_remaining_lifetime=timedelta(seconds=self.presigned_url_expiry),
                 )
+            self.initialised = True
 
     # S3 Location should be a minimum of a s3_object_key but can also be a directory location in the form of
     # {{directory}}/{{s3_object_key}}
     def create_upload_presigned_url(self, s3_bucket_name: str, s3_object_location: str):
-        if self.custom_client:
-            if datetime.now(timezone.utc) > self.expiration_time - timedelta(
-                minutes=10
-            ):
-                logger.info(S3Service.EXPIRED_SESSION_WARNING)
-                self.custom_client, self.expiration_time = self.iam_service.assume_role(
-                    self.custom_aws_role, "s3", config=self.config
-                )
-            return self.custom_client.generate_presigned_post(
+        if self.custom_role_client:
+            return self.custom_role_client.get_client().generate_presigned_post(
                 s3_bucket_name,
                 s3_object_location,
                 Fields=None,
@@ -62,16 +111,9 @@ class S3Service:
             )
 
     def create_put_presigned_url(self, s3_bucket_name: str, file_key: str):
-        if self.custom_client:
-            if datetime.now(timezone.utc) > self.expiration_time - timedelta(
-                minutes=10
-            ):
-                logger.info(S3Service.EXPIRED_SESSION_WARNING)
-                self.custom_client, self.expiration_time = self.iam_service.assume_role(
-                    self.custom_aws_role, "s3", config=self.config
-                )
+        if self.custom_role_client:
             logger.info("Generating presigned URL")
-            return self.custom_client.generate_presigned_url(
+            return self.custom_role_client.get_client().generate_presigned_url(
                 "put_object",
                 Params={"Bucket": s3_bucket_name, "Key": file_key},
                 ExpiresIn=self.presigned_url_expiry,
@@ -79,27 +121,56 @@ class S3Service:
         return None
 
     def create_download_presigned_url(self, s3_bucket_name: str, file_key: str):
-        if self.custom_client:
-            if datetime.now(timezone.utc) > self.expiration_time - timedelta(
-                minutes=10
-            ):
-                logger.info(S3Service.EXPIRED_SESSION_WARNING)
-                self.custom_client, self.expiration_time = self.iam_service.assume_role(
-                    self.custom_aws_role, "s3", config=self.config
-                )
+        if self.custom_role_client:
             logger.info("Generating presigned URL")
-            return self.custom_client.generate_presigned_url(
+            return self.custom_role_client.get_client().generate_presigned_url(
                 "get_object",
                 Params={"Bucket": s3_bucket_name, "Key": file_key},
                 ExpiresIn=self.presigned_url_expiry,
             )
         return None
 
-    def download_file(self, s3_bucket_name: str, file_key: str, download_path: str):
-        return self.client.download_file(s3_bucket_name, file_key, download_path)
+    def download_file(
+        self,
+        s3_bucket_name: str,
+        file_key: str,
+        download_path: str,
+        transfer_profile: S3TransferProfile = S3TransferProfile.DEFAULT,
+    ):
+        return self.client.download_file(
+            s3_bucket_name,
+            file_key,
+            download_path,
+            Config=self.transfer_configs[transfer_profile],
+        )
 
-    def upload_file(self, file_name: str, s3_bucket_name: str, file_key: str):
-        return self.client.upload_file(file_name, s3_bucket_name, file_key)
+    def download_file_obj(
+        self,
+        s3_bucket_name: str,
+        file_key: str,
+        file_obj: io.BytesIO,
+        transfer_profile: S3TransferProfile = S3TransferProfile.DEFAULT,
+    ):
+        return self.client.download_fileobj(
+            Bucket=s3_bucket_name,
+            Key=file_key,
+            Fileobj=file_obj,
+            Config=self.transfer_configs[transfer_profile],
+        )
+
+    def upload_file(
+        self,
+        file_name: str,
+        s3_bucket_name: str,
+        file_key: str,
+        transfer_profile: S3TransferProfile = S3TransferProfile.DEFAULT,
+    ):
+        return self.client.upload_file(
+            file_name,
+            s3_bucket_name,
+            file_key,
+            Config=self.transfer_configs[transfer_profile],
+        )
 
     def upload_file_with_extra_args(
         self,
@@ -107,8 +178,15 @@ class S3Service:
         s3_bucket_name: str,
         file_key: str,
         extra_args: Mapping[str, Any],
+        transfer_profile: S3TransferProfile = S3TransferProfile.DEFAULT,
     ):
-        return self.client.upload_file(file_name, s3_bucket_name, file_key, extra_args)
+        return self.client.upload_file(
+            file_name,
+            s3_bucket_name,
+            file_key,
+            extra_args,
+            Config=self.transfer_configs[transfer_profile],
+        )
 
     def copy_across_bucket(
         self,
@@ -173,34 +251,274 @@ class S3Service:
             raise e
 
     def list_all_objects(self, bucket_name: str) -> list[dict]:
+        return list(self.iterate_objects(bucket_name))
+
+    def iterate_object_pages(
+        self,
+        bucket_name: str,
+        prefix: str = "",
+        fields: list[str] = None,
+        partition_boundaries: list[str] = None,
+        max_workers: int = None,
+    ) -> Iterator[list[dict]]:
+        """
+        Lazily list the objects under a prefix, yielding each page as it is read.
+        When fields is given, each object is cut down to just those fields (e.g.
+        Key and Size) so large listings stay small in memory.
+
+        partition_boundaries splits the keys under the prefix into ranges that are
+        listed in parallel, e.g. "1" to "9" for buckets keyed by NHS number. Each
+        range starts after one boundary and ends at the next, so together the
+        ranges cover every key exactly once whatever the boundaries are. Pages
+        from parallel ranges arrive in no particular order.
+        """
+        boundaries = [
+            prefix + boundary for boundary in sorted(set(partition_boundaries or []))
+        ]
+        key_ranges = list(zip([None, *boundaries], [*boundaries, None]))
+        sources = [
+            partial(
+                self._iterate_key_range_pages,
+                bucket_name,
+                prefix,
+                fields,
+                start_after,
+                last_key,
+            )
+            for start_after, last_key in key_ranges
+        ]
+
+        if len(sources) == 1:
+            yield from sources[0]()
+            return
+
+        logger.info(f"Listing {bucket_name} in {len(sources)} parallel key ranges")
+        yield from merge_iterators(
+            sources, max_workers=max_workers or self.list_objects_max_workers
+        )
+
+    def iterate_objects(self, bucket_name: str, **kwargs) -> Iterator[dict]:
+        for page in self.iterate_object_pages(bucket_name, **kwargs):
+            yield from page
+
+    def _iterate_key_range_pages(
+        self,
+        bucket_name: str,
+        prefix: str,
+        fields: list[str] | None,
+        start_after: str | None,
+        last_key: str | None,
+    ) -> Iterator[list[dict]]:
+        list_arguments = {"Bucket": bucket_name}
+        if prefix:
+            list_arguments["Prefix"] = prefix
+        if start_after:
+            list_arguments["StartAfter"] = start_after
+
         s3_paginator = self.client.get_paginator("list_objects_v2")
-        s3_list_objects_result = []
-        for paginated_result in s3_paginator.paginate(Bucket=bucket_name):
-            s3_list_objects_result += paginated_result.get("Contents", [])
-        return s3_list_objects_result
+        for page in s3_paginator.paginate(**list_arguments):
+            contents = page.get("Contents", [])
+            range_finished = (
+                last_key is not None and contents and contents[-1]["Key"] > last_key
+            )
+            if range_finished:
+                contents = [
+                    s3_object for s3_object in contents if s3_object["Key"] <= last_key
+                ]
+            if fields:
+                contents = [
+                    {field: s3_object[field] for field in fields if field in s3_object}
+                    for s3_object in contents
+                ]
+            if contents:
+                yield contents
+            if range_finished:
+                return
 
     def get_file_size(self, s3_bucket_name: str, object_key: str) -> int:
         response = self.client.head_object(Bucket=s3_bucket_name, Key=object_key)
         return response.get("ContentLength", 0)
 
+    def head_objects(
+        self,
+        s3_bucket_name: str,
+        file_keys: Iterable[str],
+        max_workers: int = None,
+    ) -> dict[str, S3ObjectHead]:
+        """
+        Look up existence, size and ETag for many keys in one bucket. Keys are
+        checked with concurrent head_object calls, treating 403 and 404 as missing
+        like file_exist_on_s3. When there are at least
+        head_objects_listing_threshold keys under a shared prefix, the prefix is
+        listed instead, as one listing page answers up to 1000 keys; the listing
+        gives up and falls back to head_object calls for whatever is left once it
+        needs more than one page per head_objects_keys_per_list_page keys.
+        """
+        keys = list(dict.fromkeys(file_keys))
+        if not keys:
+            return {}
+
+        results = {}
+        prefix = os.path.commonprefix(keys)
+        if prefix and len(keys) >= self.head_objects_listing_threshold:
+            results = self._head_objects_by_listing(s3_bucket_name, keys, prefix)
+
+        remaining_keys = [key for key in keys if key not in results]
+        if remaining_keys:
+            workers = min(
+                max_workers or self.head_objects_max_workers, len(remaining_keys)
+            )
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                heads = executor.map(
+                    lambda key: self._head_object(s3_bucket_name, key),
+                    remaining_keys,
+                )
+                results.update(zip(remaining_keys, heads))
+
+        return {key: results[key] for key in keys}
+
+    def _head_object(self, s3_bucket_name: str, file_key: str) -> S3ObjectHead:
+        try:
+            response = self.client.head_object(Bucket=s3_bucket_name, Key=file_key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("403", "404"):
+                return MISSING_OBJECT
+            logger.error(str(e), {"Result": "Failed to check if file exists on s3"})
+            raise e
+        return S3ObjectHead(
+            exists=True,
+            size=response.get("ContentLength", 0),
+            etag=response.get("ETag"),
+        )
+
+    def _head_objects_by_listing(
+        self, s3_bucket_name: str, keys: list[str], prefix: str
+    ) -> dict[str, S3ObjectHead]:
+        wanted_keys = set(keys)
+        last_key = max(keys)
+        max_pages = max(1, len(keys) // self.head_objects_keys_per_list_page)
+        found = {}
+        last_listed_key = None
+
+        s3_paginator = self.client.get_paginator("list_objects_v2")
+        try:
+            for page_number, page in enumerate(
+                s3_paginator.paginate(Bucket=s3_bucket_name, Prefix=prefix), start=1
+            ):
+                contents = page.get("Contents", [])
+                for s3_object in contents:
+                    if s3_object["Key"] in wanted_keys:
+                        found[s3_object["Key"]] = S3ObjectHead(
+                            exists=True,
+                            size=s3_object.get("Size", 0),
+                            etag=s3_object.get("ETag"),
+                        )
+                if contents:
+                    last_listed_key = contents[-1]["Key"]
+
+                if not page.get("IsTruncated") or (
+                    last_listed_key and last_listed_key >= last_key
+                ):
+                    return {key: found.get(key, MISSING_OBJECT) for key in keys}
+                if page_number >= max_pages:
+                    break
+        except ClientError as e:
+            logger.info(f"Unable to list objects under {prefix}: {str(e)}")
+            return {}
+
+        # Listing is in key order, so anything not seen before the point the
+        # listing stopped does not exist; later keys are left for head_object.
+        return {
+            key: found.get(key, MISSING_OBJECT)
+            for key in keys
+            if key in found or (last_listed_key and key <= last_listed_key)
+        }
+
     def get_object_stream(self, bucket: str, key: str):
         response = self.client.get_object(Bucket=bucket, Key=key)
         return response.get("Body")
 
     def stream_s3_object_to_memory(self, bucket: str, key: str) -> BytesIO:
         response = self.client.get_object(Bucket=bucket, Key=key)
+        content_length = response.get("ContentLength")
+        if content_length is None:
+            buf = BytesIO()
+            for chunk in iter(
+                lambda: response["Body"].read(self.STREAM_CHUNK_SIZE), b""
+            ):
+                buf.write(chunk)
+            buf.seek(0)
+            return buf
+
         buf = BytesIO()
-        for chunk in iter(lambda: response["Body"].read(64 * 1024), b""):
-            buf.write(chunk)
+        if content_length:
+            # Size the buffer once up front, then fill it in place through a view
+            # so the object is never reallocated or copied a second time.
+            buf.seek(content_length - 1)
+            buf.write(b"\0")
+
+        with buf.getbuffer() as view:
+            if content_length > self.ranged_get_threshold:
+                self._read_body_into(
+                    response["Body"], view[: self.ranged_get_part_size]
+                )
+                response["Body"].close()
+                self._fetch_ranges_into(bucket, key, response.get("ETag"), view)
+            else:
+                self._read_body_into(response["Body"], view)
+
         buf.seek(0)
         return buf
 
+    def _fetch_ranges_into(
+        self, bucket: str, key: str, etag: str | None, view: memoryview
+    ):
+        ranges = [
+            (start, min(start + self.ranged_get_part_size, len(view)) - 1)
+            for start in range(
+                self.ranged_get_part_size, len(view), self.ranged_get_part_size
+            )
+        ]
+
+        def fetch_range(byte_range: tuple[int, int]):
+            start, end = byte_range
+            get_object_args = {
+                "Bucket": bucket,
+                "Key": key,
+                "Range": f"bytes={start}-{end}",
+            }
+            if etag:
+                get_object_args["IfMatch"] = etag
+            response = self.client.get_object(**get_object_args)
+            content_length = response.get("ContentLength")
+            if content_length is not None and content_length != end - start + 1:
+                raise IncompleteReadError(
+                    actual_bytes=content_length, expected_bytes=end - start + 1
+                )
+            self._read_body_into(response["Body"], view[start : end + 1])
+
+        with ThreadPoolExecutor(max_workers=self.ranged_get_max_workers) as executor:
+            list(executor.map(fetch_range, ranges))
+
+    def _read_body_into(self, body, view: memoryview):
+        # Read through StreamingBody itself so botocore keeps checking the body
+        # against its Content-Length and urllib3 returns the connection to its
+        # pool, copying each chunk straight into its slot in the buffer.
+        offset = 0
+        while offset < len(view):
+            chunk = body.read(min(self.STREAM_CHUNK_SIZE, len(view) - offset))
+            if not chunk:
+                raise IncompleteReadError(actual_bytes=offset, expected_bytes=len(view))
+            view[offset : offset + len(chunk)] = chunk
+            offset += len(chunk)
+
     def upload_file_obj(
         self,
         file_obj: io.BytesIO,
         s3_bucket_name: str,
         file_key: str,
         extra_args: Mapping[str, Any] = None,
+        transfer_profile: S3TransferProfile = S3TransferProfile.DEFAULT,
     ):
         try:
             self.client.upload_fileobj(
@@ -208,6 +526,7 @@ class S3Service:
                 Bucket=s3_bucket_name,
                 Key=file_key,
                 ExtraArgs=extra_args or {},
+                Config=self.transfer_configs[transfer_profile],
             )
             logger.info(f"Uploaded file object to s3://{s3_bucket_name}/{file_key}")
         except ClientError as e:
@@ -216,6 +535,23 @@ class S3Service:
             )
             raise e
 
+    def open_multipart_upload_writer(
+        self,
+        s3_bucket_name: str,
+        file_key: str,
+        part_size: int = None,
+        extra_args: Mapping[str, Any] = None,
+        transfer_profile: S3TransferProfile = S3TransferProfile.DEFAULT,
+    ) -> S3MultipartUploadWriter:
+        return S3MultipartUploadWriter(
+            client=self.client,
+            bucket=s3_bucket_name,
+            key=file_key,
+            part_size=part_size
+            or self.transfer_configs[transfer_profile].multipart_chunksize,
+            extra_args=extra_args,
+        )
+
     def save_or_create_file(self, source_bucket: str, file_key: str, body: bytes):
         return self.client.put_object(
             Bucket=source_bucket, Key=file_key, Body=BytesIO(body)
@@ -1,13 +1,11 @@
 import uuid
 
-import boto3
-from botocore.client import Config as BotoConfig
+from services.base.aws_client_factory import get_aws_client
 
 
 class SQSService:
     def __init__(self, *args, **kwargs):
-        config = BotoConfig(retries={"max_attempts": 3, "mode": "standard"})
-        self.client = boto3.client("sqs", config=config)
+        self.client = get_aws_client("sqs")
         super().__init__(*args, **kwargs)
 
     def send_message_fifo(self, queue_url: str, message_body: str, group_id: str):
@@ -1,9 +1,9 @@
-import boto3
+from services.base.aws_client_factory import get_aws_client
 
 
 class SSMService:
     def __init__(self):
-        self.client = boto3.client("ssm", region_name="eu-west-2")
+        self.client = get_aws_client("ssm", region_name="eu-west-2")
 
     def get_ssm_parameter(self, parameter_key: str, with_decryption=False):
         ssm_response = self.client.get_parameter(
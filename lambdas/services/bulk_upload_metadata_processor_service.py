@@ -9,6 +9,7 @@ from typing import Iterable
 
 import pydantic
 from botocore.exceptions import ClientError
+from enums.s3_transfer_profile import S3TransferProfile
 from enums.upload_status import UploadStatus
 from models.staging_metadata import (
     METADATA_FILENAME,
@@ -92,6 +93,7 @@ class BulkUploadMetadataProcessorService:
             s3_bucket_name=self.staging_bucket_name,
             file_key=self.file_key,
             download_path=local_file_path,
+            transfer_profile=S3TransferProfile.REPORT,
         )
         return local_file_path
 
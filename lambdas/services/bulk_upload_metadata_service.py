@@ -8,6 +8,7 @@ from typing import Iterable
 
 import pydantic
 from botocore.exceptions import ClientError
+from enums.s3_transfer_profile import S3TransferProfile
 
 from models.staging_metadata import (
     NHS_NUMBER_FIELD_NAME,
@@ -89,6 +90,7 @@ class BulkUploadMetadataService:
             s3_bucket_name=self.staging_bucket_name,
             file_key=metadata_filename,
             download_path=local_file_path,
+            transfer_profile=S3TransferProfile.REPORT,
         )
         return local_file_path
 
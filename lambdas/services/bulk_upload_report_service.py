@@ -4,6 +4,7 @@ import os
 
 from boto3.dynamodb.conditions import Attr
 from enums.metadata_report import MetadataReport
+from enums.s3_transfer_profile import S3TransferProfile
 from models.report.bulk_upload_report import BulkUploadReport
 from models.report.bulk_upload_report_output import OdsReport, SummaryReport
 from pydantic import ValidationError
@@ -100,6 +101,7 @@ class BulkUploadReportService:
             s3_bucket_name=self.reports_bucket,
             file_key=f"{self.s3_key_prefix}/{file_name}",
             file_name=f"/tmp/{file_name}",
+            transfer_profile=S3TransferProfile.REPORT,
         )
 
         return ods_report
@@ -130,6 +132,7 @@ class BulkUploadReportService:
             s3_bucket_name=self.reports_bucket,
             file_key=f"{self.s3_key_prefix}/{file_name}",
             file_name=f"/tmp/{file_name}",
+            transfer_profile=S3TransferProfile.REPORT,
         )
 
     def generate_daily_report(
@@ -144,6 +147,7 @@ class BulkUploadReportService:
             s3_bucket_name=self.reports_bucket,
             file_key=f"{self.s3_key_prefix}/{file_name}",
             file_name=f"/tmp/{file_name}",
+            transfer_profile=S3TransferProfile.REPORT,
         )
 
     def generate_success_report(self, ods_reports: list[OdsReport]):
@@ -364,28 +368,15 @@ class BulkUploadReportService:
         filter_time = Attr("Timestamp").gt(start_timestamp) & Attr("Timestamp").lt(
             end_timestamp
         )
-        db_response = self.db_service.scan_table(
-            bulk_upload_table_name, filter_expression=filter_time
-        )
-
-        if "Items" not in db_response:
-            return []
-        items = db_response["Items"]
-        while "LastEvaluatedKey" in db_response:
-            db_response = self.db_service.scan_table(
-                bulk_upload_table_name,
-                exclusive_start_key=db_response["LastEvaluatedKey"],
-                filter_expression=filter_time,
-            )
-            if db_response["Items"]:
-                items.extend(db_response["Items"])
-
         validated_items = []
-        for item in items:
-            try:
-                validated_items.append(BulkUploadReport.model_validate(item))
-            except ValidationError as e:
-                logger.error(f"Failed to parse bulk update report dynamo item: {e}")
+        for page in self.db_service.iterate_scan_pages(
+            bulk_upload_table_name, filter_expression=filter_time
+        ):
+            for item in page:
+                try:
+                    validated_items.append(BulkUploadReport.model_validate(item))
+                except ValidationError as e:
+                    logger.error(f"Failed to parse bulk update report dynamo item: {e}")
 
         return validated_items
 
@@ -418,4 +409,5 @@ class BulkUploadReportService:
             s3_bucket_name=self.reports_bucket,
             file_key=f"{self.s3_key_prefix}/{file_name}",
             file_name=f"/tmp/{file_name}",
+            transfer_profile=S3TransferProfile.REPORT,
         )
@@ -323,24 +323,28 @@ class BulkUploadService:
         logger.info("Detected accented character in file path.")
         logger.info("Will take special steps to handle file names.")
 
-        resolved_file_paths = {}
+        candidate_file_paths = {}
         for file in staging_metadata.files:
-            file_path_in_metadata = file.file_path
-            file_path_without_leading_slash = self.strip_leading_slash(
-                file_path_in_metadata
+            file_path_without_leading_slash = self.strip_leading_slash(file.file_path)
+            candidate_file_paths[file.file_path] = (
+                convert_to_nfc_form(file_path_without_leading_slash),
+                convert_to_nfd_form(file_path_without_leading_slash),
             )
-            file_path_in_nfc_form = convert_to_nfc_form(file_path_without_leading_slash)
-            file_path_in_nfd_form = convert_to_nfd_form(file_path_without_leading_slash)
-
-            if self.bulk_upload_s3_repository.file_exists_on_staging_bucket(
-                file_path_in_nfc_form
-            ):
-                resolved_file_paths[file_path_in_metadata] = file_path_in_nfc_form
-            elif self.bulk_upload_s3_repository.file_exists_on_staging_bucket(
-                file_path_in_nfd_form
-            ):
-                resolved_file_paths[file_path_in_metadata] = file_path_in_nfd_form
-            else:
+
+        existing_files = self.bulk_upload_s3_repository.files_exist_on_staging_bucket(
+            [
+                path
+                for candidates in candidate_file_paths.values()
+                for path in candidates
+            ]
+        )
+
+        resolved_file_paths = {}
+        for file_path_in_metadata, candidates in candidate_file_paths.items():
+            file_path_on_s3 = next(
+                (path for path in candidates if existing_files.get(path)), None
+            )
+            if not file_path_on_s3:
                 logger.info(
                     "No file matching the provided file path was found on S3 bucket"
                 )
@@ -348,6 +352,7 @@ class BulkUploadService:
                 raise S3FileNotFoundException(
                     f"Failed to access file {sample_file_path}"
                 )
+            resolved_file_paths[file_path_in_metadata] = file_path_on_s3
 
         self.file_path_cache = resolved_file_paths
 
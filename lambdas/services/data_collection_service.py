@@ -1,6 +1,6 @@
 import hashlib
 import os
-from collections import Counter, defaultdict
+from collections import defaultdict
 from datetime import datetime, timedelta
 
 import polars as pl
@@ -29,7 +29,7 @@ from utils.cloudwatch_logs_query import (
     UniqueActiveUserIds,
 )
 from utils.common_query_filters import UploadCompleted
-from utils.utilities import flatten, get_file_key_from_s3_url
+from utils.utilities import flatten
 
 logger = LoggingService(__name__)
 
@@ -39,6 +39,25 @@ NhsNumberFieldName: str = Fields.NHS_NUMBER.value
 FileLocationFieldName: str = Fields.FILE_LOCATION.value
 ContentTypeFieldName: str = Fields.CONTENT_TYPE.value
 
+DynamoDBScanSchema = {
+    OdsCodeFieldName: pl.String,
+    NhsNumberFieldName: pl.String,
+    FileLocationFieldName: pl.String,
+    ContentTypeFieldName: pl.String,
+}
+S3ListObjectsSchema = {"Key": pl.String, "Size": pl.Int64}
+
+OrganisationDataQueries = [
+    LloydGeorgeRecordsViewed,
+    LloydGeorgeRecordsDownloaded,
+    LloydGeorgeRecordsDeleted,
+    LloydGeorgeRecordsStored,
+    LloydGeorgeRecordsSearched,
+    CountUsersAccessedDeceasedPatient,
+    OdsReportsRequested,
+    OdsReportsCreated,
+]
+
 
 class DataCollectionService:
     def __init__(self):
@@ -48,6 +67,11 @@ class DataCollectionService:
         self.cloudwatch_service = CloudwatchService()
         self.dynamodb_service = DynamoDBService()
         self.s3_service = S3Service()
+        self.scan_total_segments = 8
+        self.scan_max_capacity_units_per_second = None
+        # Document keys start with the patient's NHS number, so splitting on its
+        # first digit gives ten evenly sized ranges to list in parallel.
+        self.s3_list_partition_boundaries = list("123456789")
 
         self.end_date = datetime.combine(datetime.today(), datetime.min.time())
         self.start_date = self.end_date - timedelta(days=7)
@@ -70,24 +94,29 @@ class DataCollectionService:
     def collect_all_data(self) -> list[StatisticData]:
         dynamodb_scan_result = self.scan_dynamodb_tables()
         s3_list_objects_result = self.get_all_s3_files_info()
-        record_store_data = []
-
-        if dynamodb_scan_result:
-            record_store_data = self.get_record_store_data(
-                dynamodb_scan_result, s3_list_objects_result
-            )
+        ods_code_metrics = self.get_metrics_by_ods_code(
+            dynamodb_scan_result, s3_list_objects_result
+        )
 
+        record_store_data = self.get_record_store_data(ods_code_metrics)
+        query_results_by_day = self.get_cloud_watch_query_results_by_day(
+            self.start_date, self.end_date
+        )
         organisation_data = []
         application_data = []
 
         for day_start in self.generate_daily_ranges():
-            day_end = day_start + timedelta(days=1)
-            logger.info(f"Collecting data for day: {day_start} to {day_end}")
+            date = day_start.strftime("%Y%m%d")
+            logger.info(f"Collecting data for day: {date}")
 
+            daily_query_results = {
+                query_params: results_by_day.get(date, [])
+                for query_params, results_by_day in query_results_by_day.items()
+            }
             organisation_data += self.get_organisation_data(
-                dynamodb_scan_result, day_start, day_end
+                ods_code_metrics, date, daily_query_results
             )
-            application_data += self.get_application_data(day_start, day_end)
+            application_data += self.get_application_data(date, daily_query_results)
 
         return record_store_data + organisation_data + application_data
 
@@ -106,124 +135,82 @@ class DataCollectionService:
 
         logger.info("Finish writing all data to dynamodb table")
 
-    def scan_dynamodb_tables(self) -> list[dict]:
-        all_results = []
+    def scan_dynamodb_tables(self) -> pl.DataFrame:
+        page_frames = []
 
-        field_names_to_fetch = [
-            OdsCodeFieldName,
-            NhsNumberFieldName,
-            FileLocationFieldName,
-            ContentTypeFieldName,
-        ]
+        field_names_to_fetch = list(DynamoDBScanSchema)
         project_expression = ",".join(field_names_to_fetch)
         filter_expression = UploadCompleted
 
         for doc_type in SupportedDocumentTypes.list():
             table_name = doc_type.get_dynamodb_table_name()
-            result = self.dynamodb_service.scan_whole_table(
+            for page in self.dynamodb_service.iterate_scan_pages(
                 table_name=table_name,
                 project_expression=project_expression,
                 filter_expression=filter_expression,
-            )
-            all_results.extend(result)
+                total_segments=self.scan_total_segments,
+                max_capacity_units_per_second=self.scan_max_capacity_units_per_second,
+            ):
+                page_frames.append(pl.DataFrame(page, schema=DynamoDBScanSchema))
 
-        return all_results
+        return pl.concat([pl.DataFrame(schema=DynamoDBScanSchema), *page_frames])
 
-    def get_all_s3_files_info(self) -> list[dict]:
-        all_results = []
+    def get_all_s3_files_info(self) -> pl.DataFrame:
+        page_frames = []
         for doc_type in SupportedDocumentTypes.list():
             bucket_name = doc_type.get_s3_bucket_name()
-            result = self.s3_service.list_all_objects(bucket_name)
-            all_results += result
+            for page in self.s3_service.iterate_object_pages(
+                bucket_name,
+                fields=list(S3ListObjectsSchema),
+                partition_boundaries=self.s3_list_partition_boundaries,
+            ):
+                page_frames.append(pl.DataFrame(page, schema=S3ListObjectsSchema))
 
-        return all_results
+        return pl.concat([pl.DataFrame(schema=S3ListObjectsSchema), *page_frames])
 
     def get_record_store_data(
-        self,
-        dynamodb_scan_result: list[dict],
-        s3_list_objects_result: list[dict],
+        self, ods_code_metrics: pl.DataFrame
     ) -> list[RecordStoreData]:
-
-        total_number_of_records = self.get_total_number_of_records(dynamodb_scan_result)
-
-        total_and_average_file_sizes = (
-            self.get_metrics_for_total_and_average_file_sizes(
-                dynamodb_scan_result, s3_list_objects_result
-            )
-        )
-
-        number_of_document_types = self.get_number_of_document_types(
-            dynamodb_scan_result
-        )
-
-        joined_query_result = self.join_results_by_ods_code(
-            [
-                total_number_of_records,
-                total_and_average_file_sizes,
-                number_of_document_types,
-            ]
-        )
+        record_store_data_properties = ods_code_metrics.select(
+            "ods_code",
+            "total_number_of_records",
+            "number_of_document_types",
+            "total_size_of_records_in_megabytes",
+            "average_size_of_documents_per_patient_in_megabytes",
+        ).to_dicts()
 
         record_store_data_for_all_ods_code = [
             RecordStoreData(
                 date=self.today_date,
-                **record_store_data_properties,
+                **properties,
             )
-            for record_store_data_properties in joined_query_result
+            for properties in record_store_data_properties
         ]
 
         return record_store_data_for_all_ods_code
 
     def get_organisation_data(
-        self, dynamodb_scan_result: list[dict], start_date: datetime, end_date: datetime
+        self,
+        ods_code_metrics: pl.DataFrame,
+        date: str,
+        daily_query_results: dict[CloudwatchLogsQueryParams, list[dict]],
     ) -> list[OrganisationData]:
 
-        number_of_patients = self.get_number_of_patients(dynamodb_scan_result)
-        average_records_per_patient = self.get_average_number_of_files_per_patient(
-            dynamodb_scan_result
-        )
-        daily_count_viewed = self.get_cloud_watch_query_result(
-            LloydGeorgeRecordsViewed, start_date, end_date
-        )
-        daily_count_downloaded = self.get_cloud_watch_query_result(
-            LloydGeorgeRecordsDownloaded, start_date, end_date
-        )
-        daily_count_deleted = self.get_cloud_watch_query_result(
-            LloydGeorgeRecordsDeleted, start_date, end_date
-        )
-        daily_count_stored = self.get_cloud_watch_query_result(
-            LloydGeorgeRecordsStored, start_date, end_date
-        )
-        daily_count_searched = self.get_cloud_watch_query_result(
-            LloydGeorgeRecordsSearched, start_date, end_date
-        )
-        daily_count_deceased = self.get_cloud_watch_query_result(
-            CountUsersAccessedDeceasedPatient, start_date, end_date
-        )
-        daily_count_ods_report_requested = self.get_cloud_watch_query_result(
-            OdsReportsRequested, start_date, end_date
-        )
-        daily_count_ods_report_created = self.get_cloud_watch_query_result(
-            OdsReportsCreated, start_date, end_date
-        )
+        patient_metrics = ods_code_metrics.select(
+            "ods_code", "number_of_patients", "average_records_per_patient"
+        ).to_dicts()
+
         joined_query_result = self.join_results_by_ods_code(
-            [
-                number_of_patients,
-                average_records_per_patient,
-                daily_count_viewed,
-                daily_count_downloaded,
-                daily_count_deleted,
-                daily_count_stored,
-                daily_count_searched,
-                daily_count_deceased,
-                daily_count_ods_report_requested,
-                daily_count_ods_report_created,
+            [patient_metrics]
+            + [
+                daily_query_results[query_params]
+                for query_params in OrganisationDataQueries
             ]
         )
 
         organisation_data_for_all_ods_code = [
             OrganisationData(
-                date=start_date.strftime("%Y%m%d"),
+                date=date,
                 **organisation_data_properties,
             )
             for organisation_data_properties in joined_query_result
@@ -232,12 +219,16 @@ class DataCollectionService:
         return organisation_data_for_all_ods_code
 
     def get_application_data(
-        self, start_date: datetime, end_date: datetime
+        self,
+        date: str,
+        daily_query_results: dict[CloudwatchLogsQueryParams, list[dict]],
     ) -> list[ApplicationData]:
-        user_id_per_ods_code = self.get_active_user_list(start_date, end_date)
+        user_id_per_ods_code = self.get_active_user_list(
+            daily_query_results[UniqueActiveUserIds]
+        )
         application_data_for_all_ods_code = [
             ApplicationData(
-                date=start_date.strftime("%Y%m%d"),
+                date=date,
                 active_user_ids_hashed=active_user_ids_hashed,
                 ods_code=ods_code,
             )
@@ -245,12 +236,8 @@ class DataCollectionService:
         ]
         return application_data_for_all_ods_code
 
-    def get_active_user_list(
-        self, start_date: datetime, end_date: datetime
-    ) -> dict[str, list]:
-        query_result = self.get_cloud_watch_query_result(
-            query_params=UniqueActiveUserIds, start_time=start_date, end_time=end_date
-        )
+    @staticmethod
+    def get_active_user_list(query_result: list[dict]) -> dict[str, list]:
         user_ids_per_ods_code = defaultdict(list)
         for entry in query_result:
             ods_code = entry.get("ods_code", "")
@@ -263,120 +250,82 @@ class DataCollectionService:
             )
         return user_ids_per_ods_code
 
-    def get_cloud_watch_query_result(
-        self,
-        query_params: CloudwatchLogsQueryParams,
-        start_time: datetime,
-        end_time: datetime,
-    ) -> list[dict]:
-        return self.cloudwatch_service.query_logs(
-            query_params=query_params,
-            start_time=int(start_time.timestamp()),
-            end_time=int(end_time.timestamp()),
+    def get_cloud_watch_query_results_by_day(
+        self, start_date: datetime, end_date: datetime
+    ) -> dict[CloudwatchLogsQueryParams, dict[str, list[dict]]]:
+        queries = OrganisationDataQueries + [UniqueActiveUserIds]
+        query_results = self.cloudwatch_service.query_logs_concurrently(
+            queries,
+            start_time=int(start_date.timestamp()),
+            end_time=int(end_date.timestamp()),
         )
+        return {
+            query_params: self.group_query_result_by_day(query_result)
+            for query_params, query_result in zip(queries, query_results)
+        }
 
-    def get_total_number_of_records(
-        self, dynamodb_scan_result: list[dict]
-    ) -> list[dict]:
-        ods_code_for_every_document = [
-            item[OdsCodeFieldName] for item in dynamodb_scan_result
-        ]
-        counted_by_ods_code = Counter(ods_code_for_every_document)
-        count_result_in_list_of_dict = [
-            {"ods_code": key, "total_number_of_records": value}
-            for key, value in counted_by_ods_code.items()
-        ]
-        return count_result_in_list_of_dict
-
-    def get_number_of_patients(self, dynamodb_scan_result: list[dict]) -> list[dict]:
-        patients_grouped_by_ods_code = defaultdict(set)
-        for item in dynamodb_scan_result:
-            ods_code = item[OdsCodeFieldName]
-            patients_grouped_by_ods_code[ods_code].add(item[NhsNumberFieldName])
-
-        return [
-            {"ods_code": ods_code, "number_of_patients": len(patients)}
-            for ods_code, patients in patients_grouped_by_ods_code.items()
-        ]
+    @staticmethod
+    def group_query_result_by_day(query_result: list[dict]) -> dict[str, list[dict]]:
+        results_by_day = defaultdict(list)
+        for entry in query_result:
+            row = {field: value for field, value in entry.items() if field != "day"}
+            # Logs Insights returns the day as "YYYY-MM-DD HH:MM:SS.mmm".
+            date = datetime.strptime(entry["day"][:10], "%Y-%m-%d")
+            results_by_day[date.strftime("%Y%m%d")].append(row)
+        return results_by_day
 
-    def get_metrics_for_total_and_average_file_sizes(
+    def get_metrics_by_ods_code(
         self,
-        dynamodb_scan_result: list[dict],
-        s3_list_objects_result: list[dict],
-    ) -> list[dict]:
-        dynamodb_df = pl.DataFrame(dynamodb_scan_result)
-        s3_df = pl.DataFrame(s3_list_objects_result)
-
-        dynamodb_df_with_file_key = dynamodb_df.with_columns(
-            pl.col(FileLocationFieldName)
-            .map_elements(get_file_key_from_s3_url, return_dtype=pl.String)
-            .alias("S3FileKey")
-        )
-        joined_df = dynamodb_df_with_file_key.join(
-            s3_df, how="left", left_on="S3FileKey", right_on="Key", coalesce=True
-        )
-
-        get_total_size = (pl.col("Size").sum() / 1024 / 1024).alias(
-            "TotalFileSizeForPatientInMegabytes"
-        )
-
-        get_average_file_size_per_patient = (
-            pl.col("TotalFileSizeForPatientInMegabytes")
-            .mean()
-            .alias("average_size_of_documents_per_patient_in_megabytes")
-        )
-
-        get_total_file_size_for_ods_code = (
-            pl.col("TotalFileSizeForPatientInMegabytes")
-            .sum()
-            .alias("total_size_of_records_in_megabytes")
+        dynamodb_scan_result: pl.DataFrame,
+        s3_list_objects_result: pl.DataFrame,
+    ) -> pl.DataFrame:
+        documents = dynamodb_scan_result.lazy()
+
+        file_sizes_in_megabytes = (
+            documents.with_columns(
+                pl.col(FileLocationFieldName)
+                .str.replace(r"^s3://[^/]*/+", "")
+                .alias("S3FileKey")
+            )
+            .join(
+                s3_list_objects_result.lazy(),
+                how="left",
+                left_on="S3FileKey",
+                right_on="Key",
+            )
+            .with_columns((pl.col("Size") / 1024 / 1024).alias("SizeInMegabytes"))
         )
 
-        result = (
-            joined_df.group_by(OdsCodeFieldName, NhsNumberFieldName)
-            .agg(get_total_size)
+        patient_metrics = (
+            file_sizes_in_megabytes.group_by(OdsCodeFieldName, NhsNumberFieldName)
+            .agg(
+                pl.len().alias("NumberOfRecords"),
+                pl.col("SizeInMegabytes").sum().alias("TotalSizeInMegabytes"),
+            )
             .group_by(OdsCodeFieldName)
-            .agg(get_average_file_size_per_patient, get_total_file_size_for_ods_code)
-            .rename({OdsCodeFieldName: "ods_code"})
+            .agg(
+                pl.col("NumberOfRecords").sum().alias("total_number_of_records"),
+                pl.len().alias("number_of_patients"),
+                pl.col("NumberOfRecords").mean().alias("average_records_per_patient"),
+                pl.col("TotalSizeInMegabytes")
+                .sum()
+                .alias("total_size_of_records_in_megabytes"),
+                pl.col("TotalSizeInMegabytes")
+                .mean()
+                .alias("average_size_of_documents_per_patient_in_megabytes"),
+            )
         )
 
-        return result.to_dicts()
-
-    def get_number_of_document_types(
-        self, dynamodb_scan_result: list[dict]
-    ) -> list[dict]:
-        file_types_grouped_by_ods_code = defaultdict(set)
-        for item in dynamodb_scan_result:
-            ods_code = item[OdsCodeFieldName]
-            file_type = item[ContentTypeFieldName]
-            file_types_grouped_by_ods_code[ods_code].add(file_type)
-
-        return [
-            {"ods_code": ods_code, "number_of_document_types": len(file_types)}
-            for ods_code, file_types in file_types_grouped_by_ods_code.items()
-        ]
-
-    def get_average_number_of_files_per_patient(
-        self,
-        dynamodb_scan_result: list[dict],
-    ) -> list[dict]:
-        if not dynamodb_scan_result:
-            return []
-        dynamodb_df = pl.DataFrame(dynamodb_scan_result)
-
-        count_records = pl.len().alias("number_of_records")
-        take_average_of_record_count = (
-            pl.col("number_of_records").mean().alias("average_records_per_patient")
+        document_type_metrics = documents.group_by(OdsCodeFieldName).agg(
+            pl.col(ContentTypeFieldName).n_unique().alias("number_of_document_types")
         )
 
-        result = (
-            dynamodb_df.group_by(OdsCodeFieldName, NhsNumberFieldName)
-            .agg(count_records)
-            .group_by(OdsCodeFieldName)
-            .agg(take_average_of_record_count)
+        return (
+            patient_metrics.join(document_type_metrics, on=OdsCodeFieldName)
             .rename({OdsCodeFieldName: "ods_code"})
+            .sort("ods_code")
+            .collect()
         )
-        return result.to_dicts()
 
     @staticmethod
     def join_results_by_ods_code(results: list[list[dict]]) -> list[dict]:
@@ -1,5 +1,8 @@
+import hashlib
 import os
+from datetime import datetime, timedelta, timezone
 
+from botocore.exceptions import ClientError
 from enums.dynamo_filter import AttributeOperator
 from enums.lambda_error import LambdaError
 from enums.supported_document_types import SupportedDocumentTypes
@@ -28,6 +31,11 @@ class DocumentManifestJobService:
         self.zip_output_bucket = os.environ["ZIPPED_STORE_BUCKET_NAME"]
         self.zip_trace_table = os.environ["ZIPPED_STORE_DYNAMODB_NAME"]
         self.documents: list[DocumentReference] = []
+        self.zip_trace_ttl_in_seconds = 12 * 60 * 60
+        # A zip job cannot run longer than the Lambda maximum timeout, so a trace
+        # still pending or processing after that was abandoned by a job that timed
+        # out or crashed and will never complete.
+        self.in_progress_trace_reuse_window = timedelta(minutes=15)
 
     def create_document_manifest_job(
         self,
@@ -66,10 +74,85 @@ class DocumentManifestJobService:
             document.file_location: document.file_name for document in self.documents
         }
 
+        reusable_job_id = self.find_reusable_manifest_job(nhs_number)
+        if reusable_job_id:
+            return reusable_job_id
+
         job_id = self.write_zip_trace(documents_to_download, nhs_number)
 
         return job_id
 
+    def create_document_set_fingerprint(self, nhs_number: str) -> str:
+        document_versions = sorted(
+            f"{document.id}:{document.version}:{document.last_updated}:{document.file_name}"
+            for document in self.documents
+        )
+        return hashlib.sha256(
+            "|".join([nhs_number, *document_versions]).encode()
+        ).hexdigest()
+
+    def find_reusable_manifest_job(self, nhs_number: str) -> str | None:
+        filter_builder = DynamoQueryFilterBuilder()
+        reusable_filter_expression = (
+            filter_builder.add_condition(
+                attribute="NhsNumber",
+                attr_operator=AttributeOperator.EQUAL,
+                filter_value=nhs_number,
+            )
+            .add_condition(
+                attribute="JobStatus",
+                attr_operator=AttributeOperator.NOT_EQUAL,
+                filter_value=TraceStatus.FAILED.value,
+            )
+            .add_condition(
+                attribute="ExpireAt",
+                attr_operator=AttributeOperator.GREATER_THAN,
+                filter_value=int(datetime.now(timezone.utc).timestamp()),
+            )
+            .build()
+        )
+
+        try:
+            response = self.dynamo_service.query_table_by_index(
+                table_name=self.zip_trace_table,
+                index_name="DocumentSetFingerprintIndex",
+                search_key="DocumentSetFingerprint",
+                search_condition=self.create_document_set_fingerprint(nhs_number),
+                query_filter=reusable_filter_expression,
+            )
+            zip_traces = [
+                DocumentManifestZipTrace.model_validate(item)
+                for item in response.get("Items", [])
+            ]
+        except (ClientError, ValidationError) as e:
+            logger.info(f"Unable to look up reusable document manifest: {str(e)}")
+            return None
+
+        for zip_trace in sorted(
+            zip_traces, key=lambda trace: trace.created, reverse=True
+        ):
+            if zip_trace.job_status == TraceStatus.COMPLETED:
+                if not self.s3_service.file_exist_on_s3(
+                    s3_bucket_name=self.zip_output_bucket,
+                    file_key=get_file_key_from_s3_url(zip_trace.zip_file_location),
+                ):
+                    continue
+            elif not self.is_in_progress_trace_recent(zip_trace):
+                continue
+
+            logger.info(f"Reusing document manifest job {zip_trace.job_id}")
+            return str(zip_trace.job_id)
+
+        return None
+
+    def is_in_progress_trace_recent(self, zip_trace: DocumentManifestZipTrace) -> bool:
+        if zip_trace.job_status not in (TraceStatus.PENDING, TraceStatus.PROCESSING):
+            return False
+        created = datetime.fromisoformat(zip_trace.created)
+        return (
+            datetime.now(timezone.utc) - created < self.in_progress_trace_reuse_window
+        )
+
     def filter_documents_by_reference(
         self,
         selected_document_references: list[str],
@@ -113,7 +196,12 @@ class DocumentManifestJobService:
         logger.info("Writing Document Manifest zip trace to db")
 
         zip_trace = DocumentManifestZipTrace(
-            files_to_download=documents_to_download, nhs_number=nhs_number
+            files_to_download=documents_to_download,
+            nhs_number=nhs_number,
+            document_set_fingerprint=self.create_document_set_fingerprint(nhs_number),
+            expire_at=int(
+                datetime.now(timezone.utc).timestamp() + self.zip_trace_ttl_in_seconds
+            ),
         )
         self.dynamo_service.create_item(
             self.zip_trace_table, zip_trace.model_dump(by_alias=True)
@@ -1,6 +1,11 @@
+import base64
+import binascii
 import json
 import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from json import JSONDecodeError
+from urllib.parse import urlencode
 
 from botocore.exceptions import ClientError
 from enums.dynamo_filter import AttributeOperator
@@ -8,8 +13,13 @@ from enums.lambda_error import LambdaError
 from enums.metadata_field_names import DocumentReferenceMetadataFields
 from enums.snomed_codes import SnomedCodes
 from models.document_reference import DocumentReference
+from models.fhir.R4.base_models import Link
 from models.fhir.R4.bundle import Bundle, BundleEntry
-from models.fhir.R4.fhir_document_reference import Attachment, DocumentReferenceInfo
+from models.fhir.R4.fhir_document_reference import (
+    Attachment,
+    DocumentReferenceInfo,
+    render_fhir_document_reference,
+)
 from pydantic import ValidationError
 from services.document_service import DocumentService
 from utils.audit_logging_setup import LoggingService
@@ -22,6 +32,27 @@ logger = LoggingService(__name__)
 
 
 class DocumentReferenceSearchService(DocumentService):
+    # Attributes needed to build a non-FHIR search result, check upload state
+    # and look up a missing file size; everything else is left unread.
+    SEARCH_RESULT_FIELDS = [
+        DocumentReferenceMetadataFields.ID.value,
+        DocumentReferenceMetadataFields.NHS_NUMBER.value,
+        DocumentReferenceMetadataFields.FILE_NAME.value,
+        DocumentReferenceMetadataFields.FILE_LOCATION.value,
+        DocumentReferenceMetadataFields.FILE_SIZE.value,
+        DocumentReferenceMetadataFields.CREATED.value,
+        DocumentReferenceMetadataFields.VIRUS_SCANNER_RESULT.value,
+        DocumentReferenceMetadataFields.UPLOADED.value,
+        DocumentReferenceMetadataFields.UPLOADING.value,
+        DocumentReferenceMetadataFields.LAST_UPDATED.value,
+        DocumentReferenceMetadataFields.DOC_STATUS.value,
+    ]
+    NEXT_PAGE_TOKEN_PARAMETER = "next-page-token"
+
+    def __init__(self):
+        super().__init__()
+        self.file_size_lookup_workers = 10
+
     def get_document_references(
         self,
         nhs_number: str,
@@ -60,6 +91,90 @@ class DocumentReferenceSearchService(DocumentService):
             )
             raise DocumentRefSearchException(500, LambdaError.DocRefClient)
 
+    def get_paginated_document_references(
+        self,
+        nhs_number: str,
+        page_size: int,
+        next_page_token: str = None,
+        additional_filters=None,
+        search_parameters: dict[str, str] = None,
+    ) -> dict:
+        """
+        Fetch a single page of FHIR document references for a given NHS number.
+
+        :param nhs_number: The NHS number to search for.
+        :param page_size: The maximum number of entries to return in the page.
+        :param next_page_token: Continuation token from a previous page's next link.
+        :param additional_filters: Additional filters to apply to the search.
+        :param search_parameters: The request query parameters, used to build page links.
+        :return: A FHIR searchset Bundle with self and, if more results remain, next links.
+        """
+        try:
+            list_of_table_names = self._get_table_names()
+            table_index, exclusive_start_key = self._decode_page_token(
+                next_page_token, nhs_number, len(list_of_table_names)
+            )
+            filter_expression = self._get_filter_expression(additional_filters)
+
+            # Read one item past the page so a next link is only given when
+            # another result really exists, not just another table or key.
+            document_resources = []
+            following_page_token = None
+            while table_index < len(list_of_table_names):
+                table_name = list_of_table_names[table_index]
+                remaining = page_size - len(document_resources)
+                logger.info(f"Searching for a page of results in {table_name}")
+                response = self.dynamo_service.query_table_by_index(
+                    table_name=table_name,
+                    index_name="NhsNumberIndex",
+                    search_key=DocumentReferenceMetadataFields.NHS_NUMBER.value,
+                    search_condition=nhs_number,
+                    query_filter=filter_expression,
+                    exclusive_start_key=exclusive_start_key,
+                    limit=remaining + 1,
+                )
+                items = response["Items"]
+                last_evaluated_key = response.get("LastEvaluatedKey")
+                if len(items) > remaining:
+                    items = items[:remaining]
+                    if items:
+                        # The query stopped at its limit, so LastEvaluatedKey
+                        # names the key attributes to resume after the last kept item.
+                        exclusive_start_key = {
+                            key: items[-1][key] for key in last_evaluated_key
+                        }
+                    following_page_token = self._encode_page_token(
+                        table_index, exclusive_start_key
+                    )
+
+                documents = self.validate_document_items(items)
+                self._populate_missing_file_sizes(documents, table_name)
+                document_resources.extend(
+                    self._process_documents(documents, return_fhir=True)
+                )
+                if following_page_token:
+                    break
+
+                exclusive_start_key = last_evaluated_key
+                if not exclusive_start_key:
+                    table_index += 1
+        except (
+            JSONDecodeError,
+            ValidationError,
+            ClientError,
+            DynamoServiceException,
+        ) as e:
+            logger.error(
+                f"{LambdaError.DocRefClient.to_str()}: {str(e)}",
+                {"Result": "Document reference search failed"},
+            )
+            raise DocumentRefSearchException(500, LambdaError.DocRefClient)
+
+        logger.info(f"Found {len(document_resources)} document references for page")
+        return self._create_paginated_fhir_bundle(
+            document_resources, search_parameters or {}, following_page_token
+        )
+
     def _get_table_names(self) -> list[str]:
         try:
             return json.loads(os.environ["DYNAMODB_TABLE_LIST"])
@@ -75,25 +190,29 @@ class DocumentReferenceSearchService(DocumentService):
         filters=None,
         check_upload_completed=False,
     ):
-        document_resources = []
-
-        for table_name in table_names:
-            logger.info(f"Searching for results in {table_name}")
-            filter_expression = self._get_filter_expression(
-                filters, upload_completed=check_upload_completed
-            )
-
-            documents = self.fetch_documents_from_table_with_nhs_number(
-                nhs_number, table_name, query_filter=filter_expression
-            )
-
-            if check_upload_completed:
-                self._validate_upload_status(documents)
+        # Tables are queried concurrently; results are merged back in table order
+        # and the first table to fail re-raises its error here.
+        filter_expression = self._get_filter_expression(
+            filters, upload_completed=check_upload_completed
+        )
 
-            processed_documents = self._process_documents(
-                documents, return_fhir=return_fhir
-            )
-            document_resources.extend(processed_documents)
+        with ThreadPoolExecutor(max_workers=max(len(table_names), 1)) as executor:
+            futures = [
+                executor.submit(
+                    self._search_table_for_documents,
+                    nhs_number,
+                    table_name,
+                    return_fhir,
+                    filter_expression,
+                    check_upload_completed,
+                )
+                for table_name in table_names
+            ]
+            document_resources = [
+                document_resource
+                for future in futures
+                for document_resource in future.result()
+            ]
 
         if not document_resources:
             return None
@@ -105,6 +224,87 @@ class DocumentReferenceSearchService(DocumentService):
         else:
             return document_resources
 
+    def _search_table_for_documents(
+        self,
+        nhs_number: str,
+        table_name: str,
+        return_fhir: bool,
+        filter_expression=None,
+        check_upload_completed=False,
+    ) -> list:
+        logger.info(f"Searching for results in {table_name}")
+        if return_fhir:
+            documents = self.fetch_documents_from_table_with_nhs_number(
+                nhs_number, table_name, query_filter=filter_expression
+            )
+        else:
+            items = self.fetch_documents_from_table_with_nhs_number(
+                nhs_number,
+                table_name,
+                query_filter=filter_expression,
+                projection=self.SEARCH_RESULT_FIELDS,
+            )
+            documents = self.validate_document_items(items)
+
+        if check_upload_completed:
+            self._validate_upload_status(documents)
+
+        self._populate_missing_file_sizes(documents, table_name)
+        return self._process_documents(documents, return_fhir=return_fhir)
+
+    def _populate_missing_file_sizes(
+        self, documents: list[DocumentReference], table_name: str
+    ):
+        documents_missing_size = [
+            document
+            for document in documents
+            if not document.file_size and not self.is_upload_in_process(document)
+        ]
+        if not documents_missing_size:
+            return
+
+        logger.info(
+            f"Looking up file size for {len(documents_missing_size)} documents in {table_name}"
+        )
+        max_workers = min(self.file_size_lookup_workers, len(documents_missing_size))
+        documents_by_bucket = defaultdict(list)
+        for document in documents_missing_size:
+            documents_by_bucket[document.s3_bucket_name].append(document)
+
+        for bucket_name, bucket_documents in documents_by_bucket.items():
+            object_heads = self.s3_service.head_objects(
+                s3_bucket_name=bucket_name,
+                file_keys=[document.s3_file_key for document in bucket_documents],
+                max_workers=max_workers,
+            )
+            for document in bucket_documents:
+                document.file_size = object_heads[document.s3_file_key].size
+                if document.file_size is None:
+                    logger.warning(
+                        f"No S3 object found for document {document.id}, leaving file size unset"
+                    )
+
+        documents_with_size = [
+            document for document in documents_missing_size if document.file_size
+        ]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(
+                executor.map(
+                    lambda document: self._write_back_file_size(table_name, document),
+                    documents_with_size,
+                )
+            )
+
+    def _write_back_file_size(self, table_name: str, document: DocumentReference):
+        # The update only applies while FileSize is unset, so concurrent searches
+        # of the same legacy row cannot overwrite each other.
+        try:
+            self.update_document_file_size(table_name, document)
+        except ClientError as e:
+            logger.warning(
+                f"Unable to store file size for document {document.id} in {table_name}: {str(e)}"
+            )
+
     def _get_filter_expression(
         self, filters: dict[str, str] = None, upload_completed=False
     ):
@@ -128,6 +328,79 @@ class DocumentReferenceSearchService(DocumentService):
 
         return bundle
 
+    def _create_paginated_fhir_bundle(
+        self,
+        document_resources: list[dict],
+        search_parameters: dict[str, str],
+        next_page_token: str = None,
+    ) -> dict:
+        links = [Link(relation="self", url=self._build_search_url(search_parameters))]
+        if next_page_token:
+            next_parameters = {
+                **search_parameters,
+                self.NEXT_PAGE_TOKEN_PARAMETER: next_page_token,
+            }
+            links.append(
+                Link(relation="next", url=self._build_search_url(next_parameters))
+            )
+
+        entries = [
+            BundleEntry(resource=doc_resource) for doc_resource in document_resources
+        ]
+        bundle = Bundle(
+            type="searchset",
+            link=links,
+            entry=entries,
+        ).model_dump(exclude_none=True)
+
+        return bundle
+
+    @staticmethod
+    def _build_search_url(search_parameters: dict[str, str]) -> str:
+        search_endpoint = os.getenv("DOCUMENT_RETRIEVE_ENDPOINT_APIM", "")
+        return f"{search_endpoint}?{urlencode(search_parameters)}"
+
+    @staticmethod
+    def _encode_page_token(table_index: int, exclusive_start_key: dict = None) -> str:
+        token = json.dumps({"table": table_index, "key": exclusive_start_key})
+        return base64.urlsafe_b64encode(token.encode("utf-8")).decode("utf-8")
+
+    @staticmethod
+    def _decode_page_token(
+        page_token: str, nhs_number: str, table_count: int
+    ) -> tuple[int, dict | None]:
+        if not page_token:
+            return 0, None
+
+        try:
+            token = json.loads(base64.urlsafe_b64decode(page_token.encode("utf-8")))
+            table_index = token["table"]
+            exclusive_start_key = token["key"]
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+            table_index, exclusive_start_key = None, None
+
+        nhs_number_field = DocumentReferenceMetadataFields.NHS_NUMBER.value
+        valid_token = (
+            isinstance(table_index, int)
+            and 0 <= table_index < table_count
+            and (
+                exclusive_start_key is None
+                or (
+                    isinstance(exclusive_start_key, dict)
+                    and exclusive_start_key.get(nhs_number_field) == nhs_number
+                )
+            )
+        )
+        if not valid_token:
+            logger.error(
+                "Invalid next page token",
+                {"Result": "Document reference search failed"},
+            )
+            raise DocumentRefSearchException(
+                400, LambdaError.DocumentReferenceInvalidSearchParameters
+            )
+        return table_index, exclusive_start_key
+
     def _validate_upload_status(self, documents: list[DocumentReference]):
         if any(self.is_upload_in_process(document) for document in documents):
             logger.error(
@@ -141,12 +414,6 @@ class DocumentReferenceSearchService(DocumentService):
     ) -> list[dict]:
         results = []
         for document in documents:
-            if not document.file_size and not self.is_upload_in_process(document):
-                document.file_size = self.s3_service.get_file_size(
-                    s3_bucket_name=document.s3_bucket_name,
-                    object_key=document.s3_file_key,
-                )
-
             if return_fhir:
                 fhir_response = self.create_document_reference_fhir_response(document)
                 results.append(fhir_response)
@@ -190,16 +457,31 @@ class DocumentReferenceSearchService(DocumentService):
         self,
         document_reference: DocumentReference,
     ) -> dict:
-        document_retrieve_endpoint = os.getenv("DOCUMENT_RETRIEVE_ENDPOINT_APIM", "")
+        snomed_code_doc_type = SnomedCodes.find_by_code(
+            document_reference.document_snomed_code_type
+        )
+        if snomed_code_doc_type is None:
+            # Let the validated path report the unsupported document type
+            return self._create_validated_document_reference_fhir_response(
+                document_reference
+            )
+
+        return render_fhir_document_reference(
+            document_reference,
+            snomed_code_doc_type,
+            attachment_url=self._build_attachment_url(document_reference),
+            custodian=document_reference.current_gp_ods,
+        )
+
+    def _create_validated_document_reference_fhir_response(
+        self,
+        document_reference: DocumentReference,
+    ) -> dict:
         document_details = Attachment(
             title=document_reference.file_name,
             creation=document_reference.document_scan_creation
             or document_reference.created,
-            url=document_retrieve_endpoint
-            + "/"
-            + SnomedCodes.LLOYD_GEORGE.value.code
-            + "~"
-            + document_reference.id,
+            url=self._build_attachment_url(document_reference),
         )
         fhir_document_reference = (
             DocumentReferenceInfo(
@@ -214,3 +496,14 @@ class DocumentReferenceSearchService(DocumentService):
             .model_dump(exclude_none=True)
         )
         return fhir_document_reference
+
+    @staticmethod
+    def _build_attachment_url(document_reference: DocumentReference) -> str:
+        document_retrieve_endpoint = os.getenv("DOCUMENT_RETRIEVE_ENDPOINT_APIM", "")
+        return (
+            document_retrieve_endpoint
+            + "/"
+            + SnomedCodes.LLOYD_GEORGE.value.code
+            + "~"
+            + document_reference.id
+        )
@@ -1,5 +1,6 @@
 import os
 from datetime import datetime, timezone
+from typing import Iterator
 
 from boto3.dynamodb.conditions import Attr, ConditionBase
 from enums.metadata_field_names import DocumentReferenceMetadataFields
@@ -38,14 +39,19 @@ class DocumentService:
         )
 
     def fetch_documents_from_table_with_nhs_number(
-        self, nhs_number: str, table: str, query_filter: Attr | ConditionBase = None
-    ) -> list[DocumentReference]:
+        self,
+        nhs_number: str,
+        table: str,
+        query_filter: Attr | ConditionBase = None,
+        projection: list[str] = None,
+    ) -> list[DocumentReference] | list[dict]:
         documents = self.fetch_documents_from_table(
             table=table,
             index_name="NhsNumberIndex",
             search_key="NhsNumber",
             search_condition=nhs_number,
             query_filter=query_filter,
+            projection=projection,
         )
 
         return documents
@@ -57,8 +63,37 @@ class DocumentService:
         search_key: str,
         index_name: str = None,
         query_filter: Attr | ConditionBase = None,
-    ) -> list[DocumentReference]:
-        documents = []
+        projection: list[str] = None,
+    ) -> list[DocumentReference] | list[dict]:
+        """
+        Query every page of a table for the given key. When a projection is given
+        only those attributes are read and the raw items are returned as dicts
+        instead of being validated into DocumentReference models.
+        """
+        return list(
+            self.iterate_documents_from_table(
+                table=table,
+                search_condition=search_condition,
+                search_key=search_key,
+                index_name=index_name,
+                query_filter=query_filter,
+                projection=projection,
+            )
+        )
+
+    def iterate_documents_from_table(
+        self,
+        table: str,
+        search_condition: str,
+        search_key: str,
+        index_name: str = None,
+        query_filter: Attr | ConditionBase = None,
+        projection: list[str] = None,
+    ) -> Iterator[DocumentReference] | Iterator[dict]:
+        """
+        Lazy version of fetch_documents_from_table that yields documents one page at
+        a time. Later pages are only queried once the earlier ones have been consumed.
+        """
         exclusive_start_key = None
 
         while True:
@@ -67,33 +102,47 @@ class DocumentService:
                 index_name=index_name,
                 search_key=search_key,
                 search_condition=search_condition,
+                requested_fields=projection,
                 query_filter=query_filter,
                 exclusive_start_key=exclusive_start_key,
             )
 
-            for item in response["Items"]:
-                try:
-                    document = DocumentReference.model_validate(item)
-                    documents.append(document)
-                except ValidationError as e:
-                    logger.error(f"Validation error on document: {item}")
-                    logger.error(f"{e}")
-                    continue
+            if projection:
+                yield from response["Items"]
+            else:
+                yield from self.validate_document_items(response["Items"])
+
             if "LastEvaluatedKey" in response:
                 exclusive_start_key = response["LastEvaluatedKey"]
             else:
                 break
+
+    @staticmethod
+    def validate_document_items(items: list[dict]) -> list[DocumentReference]:
+        documents = []
+        for item in items:
+            try:
+                document = DocumentReference.model_validate(item)
+                documents.append(document)
+            except ValidationError as e:
+                logger.error(f"Validation error on document: {item}")
+                logger.error(f"{e}")
+                continue
         return documents
 
     def get_nhs_numbers_based_on_ods_code(self, ods_code: str) -> list[str]:
-        documents = self.fetch_documents_from_table(
+        nhs_number_field = DocumentReferenceMetadataFields.NHS_NUMBER.value
+        items = self.iterate_documents_from_table(
             table=os.environ["LLOYD_GEORGE_DYNAMODB_NAME"],
             index_name="OdsCodeIndex",
             search_key=DocumentReferenceMetadataFields.CURRENT_GP_ODS.value,
             search_condition=ods_code,
             query_filter=NotDeleted,
+            projection=[nhs_number_field],
+        )
+        nhs_numbers = list(
+            {item[nhs_number_field] for item in items if item.get(nhs_number_field)}
         )
-        nhs_numbers = list({document.nhs_number for document in documents})
         return nhs_numbers
 
     def delete_document_references(
@@ -109,6 +158,7 @@ class DocumentService:
 
         logger.info(f"Deleting items in table: {table_name}")
 
+        transaction = self.dynamo_service.transaction()
         for reference in document_references:
             reference.doc_status = "deprecated"
             reference.deleted = deletion_date.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
@@ -119,11 +169,12 @@ class DocumentService:
                 exclude_none=True,
                 include={"doc_status", "deleted", "ttl"},
             )
-            self.dynamo_service.update_item(
+            transaction.update(
                 table_name=table_name,
-                key_pair={DocumentReferenceMetadataFields.ID.value: reference.id},
+                key={DocumentReferenceMetadataFields.ID.value: reference.id},
                 updated_fields=update_fields,
             )
+        transaction.commit()
 
     def delete_document_object(self, bucket: str, key: str):
         file_exists = self.s3_service.file_exist_on_s3(
@@ -159,6 +210,22 @@ class DocumentService:
             ),
         )
 
+    def update_document_file_size(
+        self, table_name: str, document_reference: DocumentReference
+    ):
+        """
+        Persist a file size looked up from S3. The update is conditional so that it
+        never recreates a removed record or overwrites a size written meanwhile.
+        """
+        id_field = DocumentReferenceMetadataFields.ID.value
+        file_size_field = DocumentReferenceMetadataFields.FILE_SIZE.value
+        self.dynamo_service.update_item(
+            table_name=table_name,
+            key_pair={id_field: document_reference.id},
+            updated_fields={file_size_field: document_reference.file_size},
+            condition_expression=f"attribute_exists({id_field}) AND attribute_not_exists({file_size_field})",
+        )
+
     def hard_delete_metadata_records(
         self, table_name: str, document_references: list[DocumentReference]
     ):
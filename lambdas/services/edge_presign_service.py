@@ -1,4 +1,5 @@
 import re
+import time
 
 from botocore.exceptions import ClientError
 from enums.lambda_error import LambdaError
@@ -11,6 +12,11 @@ logger = LoggingService(__name__)
 
 
 class EdgePresignService:
+    # Range-enabled entries can serve follow-up Range requests for a short time
+    # after the first request has consumed them, up to a fixed number of requests.
+    RANGE_REQUEST_WINDOW_SECONDS = 600
+    MAX_RANGE_REQUESTS = 500
+
     def __init__(self):
         self.dynamo_service = DynamoDBService()
         self.ssm_service = SSMService()
@@ -20,7 +26,12 @@ class EdgePresignService:
         request_id = self._extract_request_id(request_values)
         domain_name = self._extract_domain_name(request_values)
 
-        presigned_url = self._attempt_presigned_ingestion(request_id, domain_name)
+        if self._is_range_request(request_values):
+            presigned_url = self._attempt_range_presigned_retrieval(
+                request_id, domain_name
+            )
+        else:
+            presigned_url = self._attempt_presigned_ingestion(request_id, domain_name)
         self._update_request_with_presigned_url(request_values, presigned_url)
 
         return request_values
@@ -35,12 +46,32 @@ class EdgePresignService:
             logger.error(f"{str(e)}", {"Result": LambdaError.EdgeNoClient.to_str()})
             raise CloudFrontEdgeException(400, LambdaError.EdgeNoClient)
 
+    def _attempt_range_presigned_retrieval(
+        self, request_id: str, domain_name: str
+    ) -> str:
+        try:
+            environment = self._filter_domain_for_env(domain_name)
+            table_name = self._get_formatted_table_name(environment)
+            updated_item = self._count_range_request(table_name, request_id)
+            return self._extract_presigned_url(updated_item)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                logger.error(f"{str(e)}", {"Result": LambdaError.EdgeNoClient.to_str()})
+                raise CloudFrontEdgeException(400, LambdaError.EdgeNoClient)
+
+        # The entry has not been consumed yet, so this request is the first use.
+        return self._attempt_presigned_ingestion(request_id, domain_name)
+
     def update_s3_headers(self, request: dict) -> dict:
         domain_name = self._extract_domain_name(request)
         request["headers"].pop("authorization", None)
         request["headers"]["host"] = [{"key": "Host", "value": domain_name}]
         return request
 
+    @staticmethod
+    def _is_range_request(request_values: dict) -> bool:
+        return bool(request_values.get("headers", {}).get("range"))
+
     def _extract_request_id(self, request_values: dict) -> str:
         return request_values.get("uri", "").lstrip("/")
 
@@ -76,11 +107,33 @@ class EdgePresignService:
         return self.dynamo_service.update_item(
             table_name=table_name,
             key_pair={"ID": request_id},
-            updated_fields={"IsRequested": True},
+            updated_fields={
+                "IsRequested": True,
+                "RangeRequestsUntil": int(time.time())
+                + self.RANGE_REQUEST_WINDOW_SECONDS,
+            },
             condition_expression="attribute_not_exists(IsRequested) OR IsRequested = :false",
             expression_attribute_values={":false": False},
         )
 
+    def _count_range_request(self, table_name: str, request_id: str) -> dict:
+        return self.dynamo_service.increment_item_counter(
+            table_name=table_name,
+            key_pair={"ID": request_id},
+            counter_field="RangeRequestCount",
+            condition_expression=(
+                "AllowRangeRequests = :true AND IsRequested = :true "
+                "AND RangeRequestsUntil > :now "
+                "AND (attribute_not_exists(RangeRequestCount) "
+                "OR RangeRequestCount < :max_range_requests)"
+            ),
+            expression_attribute_values={
+                ":true": True,
+                ":now": int(time.time()),
+                ":max_range_requests": self.MAX_RANGE_REQUESTS,
+            },
+        )
+
     @staticmethod
     def _extract_presigned_url(updated_item: dict) -> str:
         return updated_item.get("Attributes", {}).get("presignedUrl", "")
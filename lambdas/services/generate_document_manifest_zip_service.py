@@ -1,11 +1,13 @@
 import os
 import shutil
+import time
 import zipfile
-from contextlib import closing
-from io import BytesIO
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from botocore.exceptions import ClientError
 from enums.lambda_error import LambdaError
+from enums.s3_transfer_profile import S3TransferProfile
 from enums.trace_status import TraceStatus
 from models.zip_trace import DocumentManifestZipTrace
 from services.base.dynamo_service import DynamoDBService
@@ -18,6 +20,26 @@ logger = LoggingService(__name__)
 
 
 class DocumentManifestZipService:
+    # Already compressed formats barely shrink, so they are deflated at the fastest
+    # level. They are not STORED: the archive is written to a non-seekable stream,
+    # and streaming readers reject STORED members that use a data descriptor.
+    FAST_COMPRESS_LEVEL = 1
+    INCOMPRESSIBLE_FILE_EXTENSIONS = {
+        "pdf",
+        "jpg",
+        "jpeg",
+        "png",
+        "gif",
+        "tif",
+        "tiff",
+        "zip",
+        "gz",
+        "docx",
+        "xlsx",
+        "mp3",
+        "mp4",
+    }
+
     def __init__(self, zip_trace: DocumentManifestZipTrace):
         self.s3_service = S3Service()
         self.dynamo_service = DynamoDBService()
@@ -25,64 +47,27 @@ class DocumentManifestZipService:
         self.zip_output_bucket = os.environ["ZIPPED_STORE_BUCKET_NAME"]
         self.zip_trace_table = os.environ["ZIPPED_STORE_DYNAMODB_NAME"]
         self.zip_file_name = f"patient-record-{zip_trace.job_id}.zip"
+        self.prefetch_document_count = 4
 
     def handle_zip_request(self):
         self.update_status(TraceStatus.PROCESSING)
-        zip_buffer = self.stream_zip_documents()
-        self.upload_zip_file(zip_buffer)
+        self.stream_zip_documents()
         self.update_dynamo_with_fields({"job_status", "zip_file_location"})
 
-    def stream_zip_documents(self) -> BytesIO:
-        logger.info("Streaming and zipping documents in-memory")
-        documents = self.zip_trace_object.files_to_download
-
-        zip_buffer = BytesIO()
-
-        with zipfile.ZipFile(zip_buffer, "w", compression=zipfile.ZIP_DEFLATED) as zipf:
-            for document_location, document_name in documents.items():
-                file_bucket, file_key = self.get_file_bucket_and_key(document_location)
-                try:
-                    with closing(
-                        self.s3_service.get_object_stream(file_bucket, file_key)
-                    ) as s3_object_stream:
-                        with zipf.open(document_name, mode="w") as zip_member:
-                            shutil.copyfileobj(
-                                s3_object_stream, zip_member, length=64 * 1024
-                            )
-                except ClientError as e:
-                    self.update_status(TraceStatus.FAILED)
-                    msg = f"Failed to fetch S3 object {file_bucket}/{file_key}: {e}"
-                    logger.error(f"{LambdaError.ZipServiceClientError.to_str()} {msg}")
-                    raise GenerateManifestZipException(
-                        status_code=500, error=LambdaError.ZipServiceClientError
-                    )
-        zip_buffer.seek(0)
-        return zip_buffer
-
-    def get_file_bucket_and_key(self, file_location: str):
-        try:
-            file_bucket, file_key = file_location.replace("s3://", "").split("/", 1)
-            return file_bucket, file_key
-        except ValueError:
-            self.update_status(TraceStatus.FAILED)
-            raise InvalidDocumentReferenceException(
-                "Failed to parse bucket from file location string"
-            )
-
-    def upload_zip_file(self, zip_buffer: BytesIO):
-        logger.info("Uploading zip file to s3")
+    def stream_zip_documents(self):
+        logger.info("Streaming and zipping documents to s3")
         zip_file_key = f"{self.zip_file_name}"
         self.zip_trace_object.zip_file_location = (
             f"s3://{self.zip_output_bucket}/{zip_file_key}"
         )
-        try:
-            self.s3_service.upload_file_obj(
-                zip_buffer, self.zip_output_bucket, zip_file_key
-            )
-            logger.info(
-                f"Successfully uploaded ZIP file to S3: s3://{self.zip_output_bucket}/{zip_file_key}"
-            )
 
+        try:
+            with self.s3_service.open_multipart_upload_writer(
+                self.zip_output_bucket,
+                zip_file_key,
+                transfer_profile=S3TransferProfile.ZIP_ARCHIVE,
+            ) as zip_upload:
+                self.write_zip_documents(zip_upload)
         except ClientError as e:
             self.update_status(TraceStatus.FAILED)
             logger.error(e, {"Result": "Failed to create document manifest"})
@@ -90,8 +75,85 @@ class DocumentManifestZipService:
                 status_code=500, error=LambdaError.ZipServiceClientError
             )
 
+        logger.info(
+            f"Successfully uploaded ZIP file to S3: s3://{self.zip_output_bucket}/{zip_file_key}"
+        )
         self.zip_trace_object.job_status = TraceStatus.COMPLETED
 
+    def write_zip_documents(self, zip_output):
+        documents = self.zip_trace_object.files_to_download
+        executor = ThreadPoolExecutor(max_workers=self.prefetch_document_count)
+        prefetched: deque[tuple[str, str, str, Future]] = deque()
+
+        try:
+            with zipfile.ZipFile(zip_output, "w") as zipf:
+                for document_location, document_name in documents.items():
+                    file_bucket, file_key = self.get_file_bucket_and_key(
+                        document_location
+                    )
+                    document_future = executor.submit(
+                        self.s3_service.stream_s3_object_to_memory,
+                        file_bucket,
+                        file_key,
+                    )
+                    prefetched.append(
+                        (file_bucket, file_key, document_name, document_future)
+                    )
+                    if len(prefetched) > self.prefetch_document_count:
+                        self.write_zip_member(zipf, *prefetched.popleft())
+
+                while prefetched:
+                    self.write_zip_member(zipf, *prefetched.popleft())
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def write_zip_member(
+        self,
+        zipf: zipfile.ZipFile,
+        file_bucket: str,
+        file_key: str,
+        document_name: str,
+        document_future: Future,
+    ):
+        try:
+            document_stream = document_future.result()
+        except Exception as e:
+            self.update_status(TraceStatus.FAILED)
+            msg = f"Failed to fetch S3 object {file_bucket}/{file_key}: {e}"
+            logger.error(f"{LambdaError.ZipServiceClientError.to_str()} {msg}")
+            raise GenerateManifestZipException(
+                status_code=500, error=LambdaError.ZipServiceClientError
+            )
+
+        zip_info = zipfile.ZipInfo(
+            filename=document_name, date_time=time.localtime(time.time())[:6]
+        )
+        zip_info.compress_type = zipfile.ZIP_DEFLATED
+        # ZipInfo only gains a public compress_level attribute in Python 3.13.
+        zip_info._compresslevel = self.get_compress_level(document_name)
+        zip_info.file_size = document_stream.seek(0, os.SEEK_END)
+        document_stream.seek(0)
+
+        with zipf.open(zip_info, mode="w") as zip_member:
+            shutil.copyfileobj(document_stream, zip_member, length=64 * 1024)
+        document_stream.close()
+
+    def get_compress_level(self, document_name: str) -> int | None:
+        file_extension = os.path.splitext(document_name)[1].lstrip(".").lower()
+        if file_extension in self.INCOMPRESSIBLE_FILE_EXTENSIONS:
+            return self.FAST_COMPRESS_LEVEL
+        return None
+
+    def get_file_bucket_and_key(self, file_location: str):
+        try:
+            file_bucket, file_key = file_location.replace("s3://", "").split("/", 1)
+            return file_bucket, file_key
+        except ValueError:
+            self.update_status(TraceStatus.FAILED)
+            raise InvalidDocumentReferenceException(
+                "Failed to parse bucket from file location string"
+            )
+
     def update_dynamo_with_fields(self, fields: set):
         logger.info("Writing zip trace to db")
         self.dynamo_service.update_item(
@@ -5,15 +5,20 @@ from io import BytesIO
 from urllib import parse
 
 from botocore.exceptions import ClientError
+from enums.dynamo_filter import AttributeOperator
 from enums.lambda_error import LambdaError
+from enums.s3_transfer_profile import S3TransferProfile
 from enums.trace_status import TraceStatus
 from models.document_reference import DocumentReference
 from models.stitch_trace import StitchTrace
 from pikepdf import Pdf
+from pydantic import ValidationError
 from pypdf.errors import PyPdfError
 from services.base.s3_service import S3Service
 from services.document_service import DocumentService
+from services.pdf_stitch_service import append_pdf_incrementally
 from utils.audit_logging_setup import LoggingService
+from utils.dynamo_query_filter_builder import DynamoQueryFilterBuilder
 from utils.exceptions import NoAvailableDocument
 from utils.filename_utils import extract_page_number
 from utils.lambda_exceptions import LGStitchServiceException
@@ -37,6 +42,12 @@ class LloydGeorgeStitchService:
         self.stitch_trace_table = os.environ.get("STITCH_METADATA_DYNAMODB_NAME")
         self.stitch_file_name = f"patient-record-{str(uuid.uuid4())}"
         self.combined_file_folder = "combined_files"
+        self.incremental_append_enabled = (
+            os.getenv("STITCH_INCREMENTAL_APPEND", "false").lower() == "true"
+        )
+        self.linearise_output = (
+            os.getenv("STITCH_LINEARISED_OUTPUT", "false").lower() == "true"
+        )
 
     def handle_stitch_request(self):
         self.stitch_lloyd_george_record()
@@ -67,7 +78,7 @@ class LloydGeorgeStitchService:
                 ordered_documents = self.prepare_documents_for_stitching(
                     documents_for_stitching
                 )
-                stitched_lg_stream = self.stream_and_stitch_documents(ordered_documents)
+                stitched_lg_stream = self.stitch_ordered_documents(ordered_documents)
                 self.stitch_trace_object.total_file_size_in_bytes = (
                     stitched_lg_stream.getbuffer().nbytes
                 )
@@ -76,6 +87,7 @@ class LloydGeorgeStitchService:
                     stitched_lg_stream=stitched_lg_stream,
                     filename_on_bucket=destination_key,
                 )
+                self.stitch_trace_object.linearised = self.linearise_output
 
                 self.stitch_trace_object.stitched_file_location = destination_key
 
@@ -91,14 +103,103 @@ class LloydGeorgeStitchService:
             )
             raise LGStitchServiceException(500, LambdaError.StitchClient)
 
-    def fetch_pdf(self, doc: DocumentReference) -> Pdf:
+    def fetch_pdf_stream(self, doc: DocumentReference) -> BytesIO:
         s3_key = get_file_key_from_s3_url(doc.file_location)
         stream = self.s3_service.stream_s3_object_to_memory(
             bucket=self.lloyd_george_bucket_name,
             key=s3_key,
         )
         stream.seek(0)
-        return Pdf.open(stream)
+        return stream
+
+    def fetch_pdf(self, doc: DocumentReference) -> Pdf:
+        return Pdf.open(self.fetch_pdf_stream(doc))
+
+    def stitch_ordered_documents(self, documents: list[DocumentReference]) -> BytesIO:
+        # An incremental update would break the linearised layout, so appending is
+        # only attempted when linearised output is not requested.
+        if self.incremental_append_enabled and not self.linearise_output:
+            previous_stitch_trace = self.get_previous_stitch_trace()
+            if self.can_append_to_stitch_trace(previous_stitch_trace, documents):
+                try:
+                    return self.append_to_stitched_record(
+                        previous_stitch_trace, documents
+                    )
+                except (ClientError, PyPdfError) as e:
+                    logger.info(
+                        f"Unable to append to previously stitched record: {str(e)}"
+                    )
+            logger.info("Rebuilding stitched Lloyd George record from all parts")
+        return self.stream_and_stitch_documents(documents)
+
+    def append_to_stitched_record(
+        self, previous_stitch_trace: StitchTrace, documents: list[DocumentReference]
+    ) -> BytesIO:
+        new_documents = documents[len(previous_stitch_trace.stitched_document_ids) :]
+        logger.info(
+            f"Appending {len(new_documents)} new part(s) to previously stitched record"
+        )
+        stitched_stream = self.s3_service.stream_s3_object_to_memory(
+            bucket=self.lloyd_george_bucket_name,
+            key=previous_stitch_trace.stitched_file_location,
+        )
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            new_pdf_streams = list(executor.map(self.fetch_pdf_stream, new_documents))
+
+        return append_pdf_incrementally(stitched_stream, new_pdf_streams)
+
+    def can_append_to_stitch_trace(
+        self,
+        previous_stitch_trace: StitchTrace | None,
+        documents: list[DocumentReference],
+    ) -> bool:
+        if not previous_stitch_trace:
+            return False
+
+        stitched_ids = previous_stitch_trace.stitched_document_ids
+        current_ids = [doc.id for doc in documents]
+        return (
+            0 < len(stitched_ids) < len(current_ids)
+            and current_ids[: len(stitched_ids)] == stitched_ids
+        )
+
+    def get_previous_stitch_trace(self) -> StitchTrace | None:
+        filter_builder = DynamoQueryFilterBuilder()
+        not_deleted_filter = filter_builder.add_condition(
+            attribute="Deleted",
+            attr_operator=AttributeOperator.EQUAL,
+            filter_value=False,
+        ).build()
+        try:
+            response = self.document_service.dynamo_service.query_table_by_index(
+                table_name=self.stitch_trace_table,
+                index_name="NhsNumberIndex",
+                search_key="NhsNumber",
+                search_condition=self.stitch_trace_object.nhs_number,
+                query_filter=not_deleted_filter,
+            )
+            stitch_traces = [
+                StitchTrace.model_validate(item) for item in response.get("Items", [])
+            ]
+        except (ClientError, ValidationError) as e:
+            logger.info(f"Unable to retrieve previous stitch trace: {str(e)}")
+            return None
+
+        reusable_traces = [
+            trace
+            for trace in stitch_traces
+            if trace.id != self.stitch_trace_object.id
+            and trace.job_status == TraceStatus.COMPLETED
+            and trace.stitched_document_ids
+            and trace.stitched_file_location.startswith(f"{self.combined_file_folder}/")
+        ]
+        if not reusable_traces:
+            return None
+
+        return max(
+            reusable_traces, key=lambda trace: trace.convert_created_to_datetime()
+        )
 
     def stream_and_stitch_documents(
         self, documents: list[DocumentReference]
@@ -114,7 +215,7 @@ class LloydGeorgeStitchService:
                 pdf.close()
 
         output_stream = BytesIO()
-        output_pdf.save(output_stream)
+        output_pdf.save(output_stream, linearize=self.linearise_output)
         output_pdf.close()
         output_stream.seek(0)
         return output_stream
@@ -129,6 +230,7 @@ class LloydGeorgeStitchService:
         else:
             sorted_docs = self.sort_documents_by_filenames(documents)
         self.stitch_trace_object.number_of_files = len(sorted_docs)
+        self.stitch_trace_object.stitched_document_ids = [doc.id for doc in sorted_docs]
         self.stitch_trace_object.file_last_updated = self.get_most_recent_created_date(
             sorted_docs
         )
@@ -162,6 +264,7 @@ class LloydGeorgeStitchService:
                 s3_bucket_name=self.lloyd_george_bucket_name,
                 file_key=filename_on_bucket,
                 extra_args=extra_args,
+                transfer_profile=S3TransferProfile.STITCHED_PDF,
             )
             logger.info(
                 f"Uploaded stitched file to {self.lloyd_george_bucket_name} with key {filename_on_bucket}"
@@ -100,7 +100,8 @@ class LloydGeorgeStitchJobService:
                 )
             case TraceStatus.COMPLETED:
                 presigned_url = self.create_document_stitch_presigned_url(
-                    stitch_trace.stitched_file_location
+                    stitch_trace.stitched_file_location,
+                    allow_range_requests=stitch_trace.linearised,
                 )
                 logger.info(
                     "User has viewed Lloyd George records",
@@ -158,7 +159,9 @@ class LloydGeorgeStitchJobService:
         )
         return self.validate_stitch_trace(response)
 
-    def create_document_stitch_presigned_url(self, stitched_file_location):
+    def create_document_stitch_presigned_url(
+        self, stitched_file_location, allow_range_requests: bool = False
+    ):
         presign_url_response = self.s3_service.create_download_presigned_url(
             s3_bucket_name=self.lloyd_george_bucket_name,
             file_key=stitched_file_location,
@@ -168,14 +171,14 @@ class LloydGeorgeStitchJobService:
 
         ttl_half_an_hour_in_seconds = self.s3_service.presigned_url_expiry
         dynamo_item_ttl = int(deletion_date.timestamp() + ttl_half_an_hour_in_seconds)
-        self.dynamo_service.create_item(
-            self.cloudfront_table_name,
-            {
-                "ID": presigned_id,
-                "presignedUrl": presign_url_response,
-                "TTL": dynamo_item_ttl,
-            },
-        )
+        cloudfront_item = {
+            "ID": presigned_id,
+            "presignedUrl": presign_url_response,
+            "TTL": dynamo_item_ttl,
+        }
+        if allow_range_requests:
+            cloudfront_item["AllowRangeRequests"] = True
+        self.dynamo_service.create_item(self.cloudfront_table_name, cloudfront_item)
         return format_cloudfront_url(presigned_id, self.cloudfront_url)
 
     def check_lloyd_george_record_for_patient(self, nhs_number) -> None:
@@ -8,6 +8,7 @@ from enums.lambda_error import LambdaError
 from enums.metadata_field_names import DocumentReferenceMetadataFields
 from enums.patient_ods_inactive_status import PatientOdsInactiveStatus
 from enums.repository_role import RepositoryRole
+from enums.s3_transfer_profile import S3TransferProfile
 from openpyxl.workbook import Workbook
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
@@ -29,6 +30,7 @@ class OdsReportService:
         self.reports_bucket = os.getenv("STATISTICAL_REPORTS_BUCKET")
         self.temp_output_dir = ""
         self.s3_service = None
+        self.scan_total_segments = 4
 
     def get_nhs_numbers_by_ods(
         self,
@@ -72,6 +74,7 @@ class OdsReportService:
             table_name=self.table_name,
             project_expression=field_names_expression,
             filter_expression=ods_filter_expression,
+            total_segments=self.scan_total_segments,
         )
         results.extend(response)
         if not results:
@@ -99,32 +102,22 @@ class OdsReportService:
                 PatientOdsInactiveStatus.SUSPENDED,
                 PatientOdsInactiveStatus.DECEASED,
             ]
-        results = []
+        found_results = False
         for ods_code in ods_codes:
-            response = self.dynamo_service.query_table_by_index(
+            for item in self.dynamo_service.iterate_query(
                 table_name=self.table_name,
                 index_name="OdsCodeIndex",
                 search_key=DocumentReferenceMetadataFields.CURRENT_GP_ODS.value,
                 search_condition=ods_code,
+                requested_fields=[DocumentReferenceMetadataFields.NHS_NUMBER.value],
                 query_filter=NotDeleted,
-            )
-            results += response["Items"]
-
-            while "LastEvaluatedKey" in response:
-                response = self.dynamo_service.query_table_by_index(
-                    table_name=self.table_name,
-                    index_name="OdsCodeIndex",
-                    exclusive_start_key=response["LastEvaluatedKey"],
-                    search_key=DocumentReferenceMetadataFields.CURRENT_GP_ODS.value,
-                    search_condition=ods_code,
-                    query_filter=NotDeleted,
-                )
-                results += response["Items"]
+            ):
+                found_results = True
+                yield item
 
-        if not results:
+        if not found_results:
             logger.info("No records found for ODS code {}".format(ods_code))
             raise OdsReportException(404, LambdaError.NoDataFound)
-        return results
 
     def create_and_save_ods_report(
         self,
@@ -215,6 +208,7 @@ class OdsReportService:
             s3_bucket_name=self.reports_bucket,
             file_key=f"ods-reports/{ods_code}/{today.year}/{today.month}/{today.day}/{file_name}",
             file_name=temp_file_path,
+            transfer_profile=S3TransferProfile.REPORT,
         )
 
     def get_pre_signed_url(self, ods_code: str, file_name: str):
@@ -1,4 +1,5 @@
 import os
+from io import BytesIO
 from uuid import uuid4
 
 from pypdf import PdfReader, PdfWriter
@@ -27,6 +28,23 @@ def stitch_pdf(filenames: list[str], temp_folder: str = "/tmp/") -> str:
     return output_filename
 
 
+def append_pdf_incrementally(stitched_pdf: BytesIO, new_pdfs: list[BytesIO]) -> BytesIO:
+    """
+    Append the pages of new_pdfs to an already stitched PDF as an incremental update.
+
+    The original bytes of stitched_pdf are kept as they are and only the new objects
+    are written after them, so the cost scales with the pages added rather than the
+    size of the existing file.
+    """
+    writer = PdfWriter(stitched_pdf, incremental=True)
+    for pdf in new_pdfs:
+        writer.append(pdf)
+    output_stream = BytesIO()
+    writer.write(output_stream)
+    output_stream.seek(0)
+    return output_stream
+
+
 def count_page_number(filename: str) -> int:
     """
     Return the total number of pages in a PDF file
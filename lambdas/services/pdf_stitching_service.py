@@ -11,6 +11,7 @@ from botocore.exceptions import ClientError
 from enums.lambda_error import LambdaError
 from enums.metadata_field_names import DocumentReferenceMetadataFields
 from enums.nrl_sqs_upload import NrlActionTypes
+from enums.s3_transfer_profile import S3TransferProfile
 from enums.snomed_codes import SnomedCode, SnomedCodes
 from enums.supported_document_types import SupportedDocumentTypes
 from inflection import underscore
@@ -25,7 +26,7 @@ from services.base.sqs_service import SQSService
 from services.document_service import DocumentService
 from utils.audit_logging_setup import LoggingService
 from utils.common_query_filters import UploadCompleted
-from utils.exceptions import InvalidMessageException
+from utils.exceptions import DynamoServiceException, InvalidMessageException
 from utils.lambda_exceptions import PdfStitchingException
 from utils.sqs_utils import batch
 from utils.utilities import DATE_FORMAT, create_reference_id
@@ -135,8 +136,11 @@ class PdfStitchingService:
         for key in s3_object_keys:
             try:
                 data_stream = BytesIO()
-                self.s3_service.client.download_fileobj(
-                    Bucket=self.target_bucket, Key=key, Fileobj=data_stream
+                self.s3_service.download_file_obj(
+                    s3_bucket_name=self.target_bucket,
+                    file_key=key,
+                    file_obj=data_stream,
+                    transfer_profile=S3TransferProfile.STITCHED_PDF,
                 )
                 data_stream.seek(0)
 
@@ -155,10 +159,11 @@ class PdfStitchingService:
 
     def upload_stitched_file(self, stitching_data_stream: BytesIO):
         try:
-            self.s3_service.client.upload_fileobj(
-                Fileobj=stitching_data_stream,
-                Bucket=self.target_bucket,
-                Key=self.stitched_reference.s3_file_key,
+            self.s3_service.upload_file_obj(
+                file_obj=stitching_data_stream,
+                s3_bucket_name=self.target_bucket,
+                file_key=self.stitched_reference.s3_file_key,
+                transfer_profile=S3TransferProfile.STITCHED_PDF,
             )
         except ClientError as e:
             logger.error(f"Failed to upload stitched file to S3: {e}")
@@ -166,31 +171,28 @@ class PdfStitchingService:
 
     def migrate_multipart_references(self):
         logger.info("Migrating multipart references")
-        try:
-            for reference in self.multipart_references:
-                migrated_item = reference.model_dump(
-                    by_alias=True,
-                    exclude_none=True,
-                    exclude={
-                        underscore(DocumentReferenceMetadataFields.CURRENT_GP_ODS.value)
-                    },
-                )
-                self.dynamo_service.create_item(
-                    table_name=self.unstitched_lloyd_george_table_name,
-                    item=migrated_item,
-                )
-        except ClientError as e:
-            logger.error(f"Failed to migrate multipart references: {e}")
-            raise PdfStitchingException(400, LambdaError.MultipartError)
+        transaction = self.dynamo_service.transaction()
+        for reference in self.multipart_references:
+            migrated_item = reference.model_dump(
+                by_alias=True,
+                exclude_none=True,
+                exclude={
+                    underscore(DocumentReferenceMetadataFields.CURRENT_GP_ODS.value)
+                },
+            )
+            transaction.put(
+                table_name=self.unstitched_lloyd_george_table_name,
+                item=migrated_item,
+            )
+            transaction.delete(
+                table_name=self.target_dynamo_table,
+                key={DocumentReferenceMetadataFields.ID.value: reference.id},
+            )
 
         try:
-            for reference in self.multipart_references:
-                self.dynamo_service.delete_item(
-                    table_name=self.target_dynamo_table,
-                    key={DocumentReferenceMetadataFields.ID.value: reference.id},
-                )
-        except ClientError as e:
-            logger.error(f"Failed to cleanup multipart references: {e}")
+            transaction.commit()
+        except (ClientError, DynamoServiceException) as e:
+            logger.error(f"Failed to migrate multipart references: {e}")
             raise PdfStitchingException(400, LambdaError.MultipartError)
 
     def write_stitching_reference(self):
@@ -285,36 +287,44 @@ class PdfStitchingService:
 
     def rollback_reference_migration(self):
         try:
-            for document_reference in self.multipart_references:
-                original_references = self.dynamo_service.get_item(
+            id_field = DocumentReferenceMetadataFields.ID.value
+            reference_ids = [reference.id for reference in self.multipart_references]
+            original_reference_ids = {
+                item[id_field]
+                for item in self.dynamo_service.batch_get_items(
                     table_name=self.target_dynamo_table,
-                    key={
-                        DocumentReferenceMetadataFields.ID.value: document_reference.id
-                    },
+                    key_list=reference_ids,
+                    key_name=id_field,
+                    requested_fields=[id_field],
+                )
+            }
+            unstitched_reference_ids = {
+                item[id_field]
+                for item in self.dynamo_service.batch_get_items(
+                    table_name=self.unstitched_lloyd_george_table_name,
+                    key_list=reference_ids,
+                    key_name=id_field,
+                    requested_fields=[id_field],
                 )
-                if not original_references.get("Item"):
+            }
+
+            transaction = self.dynamo_service.transaction()
+            for document_reference in self.multipart_references:
+                if document_reference.id not in original_reference_ids:
                     logger.info("Reverting original multipart references deletion")
-                    self.dynamo_service.create_item(
+                    transaction.put(
                         table_name=self.target_dynamo_table,
                         item=document_reference.model_dump(
                             by_alias=True, exclude_none=True
                         ),
                     )
-
-                unstitched_references = self.dynamo_service.get_item(
-                    table_name=self.unstitched_lloyd_george_table_name,
-                    key={
-                        DocumentReferenceMetadataFields.ID.value: document_reference.id
-                    },
-                )
-                if unstitched_references.get("Item"):
+                if document_reference.id in unstitched_reference_ids:
                     logger.info("Reverting multipart references creation")
-                    self.dynamo_service.delete_item(
+                    transaction.delete(
                         table_name=self.unstitched_lloyd_george_table_name,
-                        key={
-                            DocumentReferenceMetadataFields.ID.value: document_reference.id
-                        },
+                        key={id_field: document_reference.id},
                     )
+            transaction.commit()
             logger.info("Successfully reverted migrated multipart references")
 
         except Exception as e:
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from botocore.exceptions import ClientError
+from services.base.dynamo_service import DynamoDBService
+from utils.audit_logging_setup import LoggingService
+
+logger = LoggingService(__name__)
+
+
+class SearchResultCacheService:
+    """
+    Per-patient cache for document search results.
+
+    Each NHS number has a version marker in the search cache table. The marker is
+    replaced whenever any of the patient's document references change (see
+    search_result_cache_invalidation_handler), so an ETag derived from it stays
+    valid for exactly as long as the patient's document list is unchanged.
+    Results are also kept in memory by ETag so a warm Lambda can answer repeat
+    requests without querying the document tables.
+    """
+
+    NHS_NUMBER_FIELD = "NhsNumber"
+    VERSION_FIELD = "Version"
+    EXPIRE_AT_FIELD = "ExpireAt"
+    MAX_CACHED_RESULTS = 100
+
+    _cached_results: OrderedDict[str, Any] = OrderedDict()
+
+    def __init__(self):
+        self.table_name = os.getenv("SEARCH_RESULT_CACHE_DYNAMODB_NAME")
+        self.dynamo_service = DynamoDBService()
+        self.marker_ttl = timedelta(days=30)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.table_name)
+
+    def get_etag(self, nhs_number: str, variant: str = "") -> str | None:
+        if not self.enabled:
+            return None
+
+        try:
+            version = self.get_version(nhs_number)
+        except ClientError as e:
+            logger.warning(
+                f"Unable to read search result cache version, serving uncached: {str(e)}"
+            )
+            return None
+        digest = hashlib.sha256(
+            f"{nhs_number}:{version}:{variant}".encode("utf-8")
+        ).hexdigest()
+        return f'"{digest[:32]}"'
+
+    def get_version(self, nhs_number: str) -> str:
+        # Read the marker consistently, so a bump made just before this request
+        # is never missed and an ETag for the old version handed out.
+        response = self.dynamo_service.get_item(
+            table_name=self.table_name,
+            key={self.NHS_NUMBER_FIELD: nhs_number},
+            consistent_read=True,
+        )
+        item = response.get("Item")
+        if item and item.get(self.VERSION_FIELD):
+            return item[self.VERSION_FIELD]
+
+        version = str(uuid.uuid4())
+        try:
+            self.dynamo_service.create_item(
+                table_name=self.table_name,
+                item={
+                    self.NHS_NUMBER_FIELD: nhs_number,
+                    self.VERSION_FIELD: version,
+                    self.EXPIRE_AT_FIELD: self._get_expire_at(),
+                },
+                condition_expression=f"attribute_not_exists({self.NHS_NUMBER_FIELD})",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise e
+            # Another request or a bump created the marker first, so use theirs
+            response = self.dynamo_service.get_item(
+                table_name=self.table_name,
+                key={self.NHS_NUMBER_FIELD: nhs_number},
+                consistent_read=True,
+            )
+            return response["Item"][self.VERSION_FIELD]
+        return version
+
+    def bump_version(self, nhs_number: str):
+        self.dynamo_service.update_item(
+            table_name=self.table_name,
+            key_pair={self.NHS_NUMBER_FIELD: nhs_number},
+            updated_fields={
+                self.VERSION_FIELD: str(uuid.uuid4()),
+                self.EXPIRE_AT_FIELD: self._get_expire_at(),
+            },
+        )
+
+    def get_cached_result(self, etag: str) -> Any:
+        if etag not in self._cached_results:
+            return None
+        self._cached_results.move_to_end(etag)
+        return self._cached_results[etag]
+
+    def cache_result_if_unchanged(
+        self, nhs_number: str, etag: str, result: Any, variant: str = ""
+    ):
+        # The result was read after the ETag, so if the patient's documents
+        # changed in between it may not match the version the ETag names.
+        if self.get_etag(nhs_number, variant) != etag:
+            logger.info("Search result cache version changed, not caching result")
+            return
+        self.cache_result(etag, result)
+
+    def cache_result(self, etag: str, result: Any):
+        self._cached_results[etag] = result
+        self._cached_results.move_to_end(etag)
+        while len(self._cached_results) > self.MAX_CACHED_RESULTS:
+            self._cached_results.popitem(last=False)
+
+    @staticmethod
+    def is_not_modified(event: dict, etag: str) -> bool:
+        headers = event.get("headers") or {}
+        if_none_match = next(
+            (value for key, value in headers.items() if key.lower() == "if-none-match"),
+            None,
+        )
+        if not if_none_match:
+            return False
+
+        requested_etags = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+        return etag in requested_etags or "*" in requested_etags
+
+    @staticmethod
+    def create_etag_headers(etag: str) -> dict:
+        return {
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "Access-Control-Expose-Headers": "ETag",
+        }
+
+    def _get_expire_at(self) -> int:
+        return int((datetime.now(timezone.utc) + self.marker_ttl).timestamp())
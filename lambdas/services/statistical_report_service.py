@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 
 import polars as pl
 import polars.selectors as column_select
+from enums.s3_transfer_profile import S3TransferProfile
 from inflection import humanize
 from models.report.statistics import (
     ApplicationData,
@@ -254,6 +255,7 @@ class StatisticalReportService:
                 s3_bucket_name=self.reports_bucket,
                 file_key=f"statistic-reports/{date_folder_name}/{file_name}",
                 file_name=local_file_path,
+                transfer_profile=S3TransferProfile.REPORT,
             )
 
             logger.info("The weekly report is stored in s3 bucket.")
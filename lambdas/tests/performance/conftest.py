@@ -0,0 +1,35 @@
+import time
+from typing import Callable, Iterable
+
+import pytest
+
+
+def measure_cpu_seconds_per_item(
+    func: Callable, items: Iterable, rounds: int = 3
+) -> float:
+    """Best-of-rounds process CPU time for one call of func, averaged over items."""
+    items = list(items)
+    timings = []
+    for _ in range(rounds):
+        start = time.process_time()
+        for item in items:
+            func(item)
+        timings.append(time.process_time() - start)
+    return min(timings) / len(items)
+
+
+@pytest.fixture
+def report_benchmark(capsys):
+    """Print per-item timings and the speed-up over the first (baseline) entry."""
+
+    def report(title: str, item_count: int, timings: dict[str, float]):
+        baseline = next(iter(timings.values()))
+        with capsys.disabled():
+            print(f"\n{title} ({item_count} items, CPU time per item)")
+            for name, seconds in timings.items():
+                print(
+                    f"  {name:<40} {seconds * 1_000_000:10.2f} us"
+                    f"  {baseline / seconds:6.2f}x"
+                )
+
+    return report
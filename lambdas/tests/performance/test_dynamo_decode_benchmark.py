@@ -0,0 +1,42 @@
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from services.base.dynamo_service import DynamoDBService
+from tests.performance.conftest import measure_cpu_seconds_per_item
+from tests.unit.helpers.data.dynamo.dynamo_responses import MOCK_SEARCH_RESPONSE
+
+SCAN_SIZE = 10_000
+
+
+def build_scanned_items() -> list[dict]:
+    serializer = TypeSerializer()
+    return [
+        {
+            key: serializer.serialize(value)
+            for key, value in {
+                **MOCK_SEARCH_RESPONSE["Items"][index % 3],
+                "ID": f"document-{index}",
+                "FileSize": 24000 + index,
+            }.items()
+        }
+        for index in range(SCAN_SIZE)
+    ]
+
+
+def test_dynamo_item_decode_cpu_per_item(report_benchmark):
+    items = build_scanned_items()
+    deserializer = TypeDeserializer()
+
+    def deserialise(item: dict) -> dict:
+        return {key: deserializer.deserialize(value) for key, value in item.items()}
+
+    assert DynamoDBService._decode_item(items[0]) == deserialise(items[0])
+
+    report_benchmark(
+        "DocumentReference rows decoded from a scan",
+        SCAN_SIZE,
+        {
+            "TypeDeserializer": measure_cpu_seconds_per_item(deserialise, items),
+            "DynamoDBService._decode_item": measure_cpu_seconds_per_item(
+                DynamoDBService._decode_item, items
+            ),
+        },
+    )
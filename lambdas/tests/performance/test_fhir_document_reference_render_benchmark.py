@@ -0,0 +1,48 @@
+from enums.snomed_codes import SnomedCodes
+from models.document_reference import DocumentReference
+from services.document_reference_search_service import DocumentReferenceSearchService
+from tests.performance.conftest import measure_cpu_seconds_per_item
+from tests.unit.helpers.data.dynamo.dynamo_responses import MOCK_SEARCH_RESPONSE
+
+BUNDLE_SIZE = 1000
+
+
+def build_documents() -> list[DocumentReference]:
+    return [
+        DocumentReference.model_validate(
+            {
+                **MOCK_SEARCH_RESPONSE["Items"][index % 3],
+                "ID": f"document-{index}",
+                "FileSize": 24000,
+            }
+        )
+        for index in range(BUNDLE_SIZE)
+    ]
+
+
+def test_fhir_document_reference_render_cpu_per_entry(
+    mocker, monkeypatch, report_benchmark
+):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-west-2")
+    mocker.patch("services.document_service.S3Service")
+    mocker.patch("services.document_service.DynamoDBService")
+    service = DocumentReferenceSearchService()
+    documents = build_documents()
+    assert SnomedCodes.find_by_code(documents[0].document_snomed_code_type)
+
+    validated_time = measure_cpu_seconds_per_item(
+        service._create_validated_document_reference_fhir_response,
+        [document.model_copy() for document in documents],
+    )
+    rendered_time = measure_cpu_seconds_per_item(
+        service.create_document_reference_fhir_response, documents
+    )
+
+    report_benchmark(
+        "Search bundle FHIR DocumentReference entries",
+        BUNDLE_SIZE,
+        {
+            "validated pydantic models": validated_time,
+            "render_fhir_document_reference": rendered_time,
+        },
+    )
@@ -11,6 +11,7 @@ from models.document_reference import DocumentReference
 from models.pds_models import Patient, PatientDetails
 from pydantic import ValidationError
 from requests import Response
+from services.base.aws_client_factory import clear_aws_client_cache
 from tests.unit.helpers.data.pds.pds_patient_response import PDS_PATIENT
 from utils.audit_logging_setup import LoggingService
 
@@ -380,6 +381,11 @@ def reset_logging_singletons():
     LoggingService._instances.clear()
 
 
+@pytest.fixture(autouse=True)
+def reset_aws_client_cache():
+    clear_aws_client_cache()
+
+
 @pytest.fixture(autouse=True)
 def attach_caplog_handler(caplog):
     for instance in LoggingService._instances.values():
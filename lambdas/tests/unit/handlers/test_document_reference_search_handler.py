@@ -3,6 +3,7 @@ from enum import Enum
 
 import pytest
 from handlers.document_reference_search_handler import lambda_handler
+from tests.unit.conftest import TEST_NHS_NUMBER
 from tests.unit.helpers.data.dynamo.dynamo_responses import EXPECTED_RESPONSE
 from utils.lambda_exceptions import DocumentRefSearchException
 from utils.lambda_response import ApiGatewayResponse
@@ -119,3 +120,55 @@ def test_lambda_handler_when_dynamo_tables_env_variable_not_supplied_then_return
     ).create_api_gateway_response()
     actual = lambda_handler(valid_id_event_without_auth_header, context)
     assert expected == actual
+
+
+@pytest.fixture
+def mocked_cache_service(mocker):
+    mocked_class = mocker.patch(
+        "handlers.document_reference_search_handler.SearchResultCacheService"
+    )
+    mocked_cache_service = mocked_class.return_value
+    mocked_cache_service.get_etag.return_value = '"test-etag"'
+    mocked_cache_service.create_etag_headers.return_value = {"ETag": '"test-etag"'}
+    mocked_cache_service.is_not_modified.return_value = False
+    mocked_cache_service.get_cached_result.return_value = None
+    yield mocked_cache_service
+
+
+def test_lambda_handler_returns_304_when_etag_matches(
+    mocked_service, mocked_cache_service, valid_id_event_without_auth_header, context
+):
+    mocked_cache_service.is_not_modified.return_value = True
+
+    actual = lambda_handler(valid_id_event_without_auth_header, context)
+
+    assert actual["statusCode"] == 304
+    assert actual["body"] == ""
+    assert actual["headers"]["ETag"] == '"test-etag"'
+    mocked_service.get_document_references.assert_not_called()
+
+
+def test_lambda_handler_caches_search_result_with_etag(
+    mocked_service, mocked_cache_service, valid_id_event_without_auth_header, context
+):
+    mocked_service.get_document_references.return_value = EXPECTED_RESPONSE
+
+    actual = lambda_handler(valid_id_event_without_auth_header, context)
+
+    assert actual["statusCode"] == 200
+    assert actual["headers"]["ETag"] == '"test-etag"'
+    mocked_cache_service.cache_result_if_unchanged.assert_called_once_with(
+        TEST_NHS_NUMBER, '"test-etag"', EXPECTED_RESPONSE
+    )
+
+
+def test_lambda_handler_returns_cached_result_without_searching(
+    mocked_service, mocked_cache_service, valid_id_event_without_auth_header, context
+):
+    mocked_cache_service.get_cached_result.return_value = EXPECTED_RESPONSE
+
+    actual = lambda_handler(valid_id_event_without_auth_header, context)
+
+    assert actual["statusCode"] == 200
+    assert json.loads(actual["body"]) == EXPECTED_RESPONSE
+    mocked_service.get_document_references.assert_not_called()
@@ -170,3 +170,23 @@ def test_no_event_processing_when_upload_lambda_flag_not_enabled(
     actual = lambda_handler(MOCK_VALID_EVENT, context)
 
     assert actual == expected
+
+
+def test_document_status_check_handler_returns_304_when_etag_matches(
+    set_env, context, mocker, mock_get_document_upload_status_service
+):
+    mocked_cache_service = mocker.patch(
+        "handlers.document_status_check_handler.SearchResultCacheService"
+    ).return_value
+    mocked_cache_service.get_etag.return_value = '"test-etag"'
+    mocked_cache_service.create_etag_headers.return_value = {"ETag": '"test-etag"'}
+    mocked_cache_service.is_not_modified.return_value = True
+
+    actual = lambda_handler(MOCK_VALID_EVENT, context)
+
+    assert actual["statusCode"] == 304
+    assert actual["headers"]["ETag"] == '"test-etag"'
+    mocked_cache_service.get_etag.assert_called_once_with(
+        TEST_NHS_NUMBER, variant="doc-id-1,doc-id-2"
+    )
+    mock_get_document_upload_status_service.get_document_references_by_id.assert_not_called()
@@ -4,8 +4,11 @@ from unittest.mock import MagicMock, patch
 import pytest
 from enums.lambda_error import LambdaError
 from handlers.fhir_document_reference_search_handler import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
     extract_bearer_token,
     lambda_handler,
+    parse_paging_parameters,
     parse_query_parameters,
     validate_user_access,
 )
@@ -189,25 +192,29 @@ def test_lambda_handler_returns_400_for_missing_nhs_number(
 def test_lambda_handler_with_additional_filters(
     mock_document_reference_search_service, valid_event_with_filters, context, set_env
 ):
-    mock_document_references = [
-        {"resourceType": "DocumentReference", "status": "current"},
-    ]
-    mock_document_reference_search_service.get_document_references.return_value = (
-        mock_document_references
+    mock_bundle = {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "entry": [{"resource": {"resourceType": "DocumentReference"}}],
+    }
+    mock_document_reference_search_service.get_paginated_document_references.return_value = (
+        mock_bundle
     )
 
     response = lambda_handler(valid_event_with_filters, context)
 
     assert response["statusCode"] == 200
-    assert json.loads(response["body"]) == mock_document_references
+    assert json.loads(response["body"]) == mock_bundle
 
-    # Check that the filters were correctly parsed and passed
+    # Check that the filters were correctly parsed and passed, and that a next page
+    # token without _count is paged with the default page size
     expected_filters = {"file_type": "736253002", "custodian": "Y12345"}
-    mock_document_reference_search_service.get_document_references.assert_called_once_with(
+    mock_document_reference_search_service.get_paginated_document_references.assert_called_once_with(
         nhs_number="9000000009",
-        return_fhir=True,
+        page_size=DEFAULT_PAGE_SIZE,
+        next_page_token="some-token",
         additional_filters=expected_filters,
-        check_upload_completed=False,
+        search_parameters=valid_event_with_filters["queryStringParameters"],
     )
 
 
@@ -480,3 +487,90 @@ def test_validate_user_access_authorization_failure(
         validate_user_access("Bearer valid-token", "role-id-123", "9000000009")
 
     assert e.value.status_code == 403
+
+
+def test_lambda_handler_returns_paged_bundle_when_count_is_given(
+    mock_document_reference_search_service, valid_nhs_number_event, context, set_env
+):
+    valid_nhs_number_event["queryStringParameters"]["_count"] = "10"
+    mock_bundle = {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "entry": [{"resource": {"resourceType": "DocumentReference"}}],
+    }
+    mock_document_reference_search_service.get_paginated_document_references.return_value = (
+        mock_bundle
+    )
+
+    response = lambda_handler(valid_nhs_number_event, context)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == mock_bundle
+    mock_document_reference_search_service.get_paginated_document_references.assert_called_once_with(
+        nhs_number="9000000009",
+        page_size=10,
+        next_page_token=None,
+        additional_filters={},
+        search_parameters=valid_nhs_number_event["queryStringParameters"],
+    )
+    mock_document_reference_search_service.get_document_references.assert_not_called()
+
+
+def test_lambda_handler_returns_404_when_first_page_is_empty(
+    mock_document_reference_search_service, valid_nhs_number_event, context, set_env
+):
+    valid_nhs_number_event["queryStringParameters"]["_count"] = "10"
+    mock_document_reference_search_service.get_paginated_document_references.return_value = {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "entry": [],
+    }
+
+    response = lambda_handler(valid_nhs_number_event, context)
+
+    assert response["statusCode"] == 404
+
+
+def test_lambda_handler_returns_empty_bundle_for_empty_later_page(
+    mock_document_reference_search_service, valid_nhs_number_event, context, set_env
+):
+    valid_nhs_number_event["queryStringParameters"]["_count"] = "10"
+    valid_nhs_number_event["queryStringParameters"]["next-page-token"] = "token"
+    mock_document_reference_search_service.get_paginated_document_references.return_value = {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "entry": [],
+    }
+
+    response = lambda_handler(valid_nhs_number_event, context)
+
+    assert response["statusCode"] == 200
+
+
+@pytest.mark.parametrize("count", ["0", "-1", "ten"])
+def test_lambda_handler_returns_400_for_invalid_count(
+    mock_document_reference_search_service,
+    valid_nhs_number_event,
+    context,
+    set_env,
+    count,
+):
+    valid_nhs_number_event["queryStringParameters"]["_count"] = count
+
+    response = lambda_handler(valid_nhs_number_event, context)
+
+    assert response["statusCode"] == 400
+    mock_document_reference_search_service.get_paginated_document_references.assert_not_called()
+
+
+def test_parse_paging_parameters():
+    assert parse_paging_parameters({}) == (None, None)
+    assert parse_paging_parameters({"_count": "20"}) == (20, None)
+    assert parse_paging_parameters({"next-page-token": "token"}) == (
+        DEFAULT_PAGE_SIZE,
+        "token",
+    )
+    assert parse_paging_parameters({"_count": "5000", "next-page-token": "token"}) == (
+        MAX_PAGE_SIZE,
+        "token",
+    )
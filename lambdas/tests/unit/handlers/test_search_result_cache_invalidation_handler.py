@@ -0,0 +1,78 @@
+import pytest
+from botocore.exceptions import ClientError
+from handlers.search_result_cache_invalidation_handler import (
+    extract_nhs_numbers,
+    lambda_handler,
+)
+
+
+def build_stream_record(event_name, new_nhs_number=None, old_nhs_number=None):
+    dynamodb = {"Keys": {"ID": {"S": "test-id"}}}
+    if new_nhs_number:
+        dynamodb["NewImage"] = {
+            "ID": {"S": "test-id"},
+            "NhsNumber": {"S": new_nhs_number},
+        }
+    if old_nhs_number:
+        dynamodb["OldImage"] = {
+            "ID": {"S": "test-id"},
+            "NhsNumber": {"S": old_nhs_number},
+        }
+    return {"eventName": event_name, "dynamodb": dynamodb}
+
+
+@pytest.fixture
+def mock_cache_service(set_env, monkeypatch, mocker):
+    monkeypatch.setenv("SEARCH_RESULT_CACHE_DYNAMODB_NAME", "test_cache_table")
+    mocked_class = mocker.patch(
+        "handlers.search_result_cache_invalidation_handler.SearchResultCacheService"
+    )
+    yield mocked_class.return_value
+
+
+def test_lambda_handler_bumps_version_once_per_patient(mock_cache_service, context):
+    event = {
+        "Records": [
+            build_stream_record("INSERT", new_nhs_number="9000000009"),
+            build_stream_record("MODIFY", "9000000009", "9000000009"),
+            build_stream_record("REMOVE", old_nhs_number="9000000025"),
+        ]
+    }
+    lambda_handler(event, context)
+
+    assert mock_cache_service.bump_version.call_count == 2
+    bumped = {call.args[0] for call in mock_cache_service.bump_version.call_args_list}
+    assert bumped == {"9000000009", "9000000025"}
+
+
+def test_lambda_handler_raises_when_version_cannot_be_bumped(
+    mock_cache_service, context
+):
+    mock_cache_service.bump_version.side_effect = ClientError(
+        {"Error": {"Code": "ProvisionedThroughputExceededException"}}, "UpdateItem"
+    )
+    event = {"Records": [build_stream_record("INSERT", new_nhs_number="9000000009")]}
+
+    with pytest.raises(ClientError):
+        lambda_handler(event, context)
+
+
+def test_lambda_handler_returns_400_for_invalid_stream_event(
+    mock_cache_service, context
+):
+    actual = lambda_handler({"Records": []}, context)
+
+    assert actual["statusCode"] == 400
+    mock_cache_service.bump_version.assert_not_called()
+
+
+def test_extract_nhs_numbers_includes_old_and_new_patient():
+    records = [build_stream_record("MODIFY", "9000000009", "9000000017")]
+
+    assert extract_nhs_numbers(records) == {"9000000009", "9000000017"}
+
+
+def test_extract_nhs_numbers_ignores_records_without_nhs_number():
+    records = [{"eventName": "REMOVE", "dynamodb": {"Keys": {"ID": {"S": "id"}}}}]
+
+    assert extract_nhs_numbers(records) == set()
@@ -23,6 +23,8 @@ def test_zip_trace_serializer(mock_uuid):
         "JobStatus": "Pending",
         "ZipFileLocation": "",
         "NhsNumber": TEST_NHS_NUMBER,
+        "DocumentSetFingerprint": "",
+        "ExpireAt": None,
     }
 
     actual = DocumentManifestZipTrace(
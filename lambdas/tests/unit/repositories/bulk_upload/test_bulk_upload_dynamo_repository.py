@@ -96,9 +96,10 @@ def test_rollback_transaction(repo_under_test, set_env, mock_uuid):
 
     repo_under_test.rollback_transaction()
 
-    repo_under_test.dynamo_repository.delete_item.assert_called_with(
+    mock_transaction = repo_under_test.dynamo_repository.transaction.return_value
+    mock_transaction.delete.assert_called_with(
         table_name=MOCK_LG_TABLE_NAME, key={"ID": mock_uuid}
     )
-    assert repo_under_test.dynamo_repository.delete_item.call_count == len(
-        TEST_DOCUMENT_REFERENCE_LIST
-    )
+    assert mock_transaction.delete.call_count == len(TEST_DOCUMENT_REFERENCE_LIST)
+    mock_transaction.commit.assert_called_once()
+    repo_under_test.dynamo_repository.delete_item.assert_not_called()
@@ -4,6 +4,7 @@ import pytest
 from botocore.exceptions import ClientError
 from enums.virus_scan_result import VirusScanResult
 from repositories.bulk_upload.bulk_upload_s3_repository import BulkUploadS3Repository
+from services.base.s3_service import S3ObjectHead
 from tests.unit.conftest import MOCK_LG_BUCKET, MOCK_STAGING_STORE_BUCKET
 from tests.unit.helpers.data.bulk_upload.test_data import (
     TEST_DOCUMENT_REFERENCE,
@@ -162,3 +163,19 @@ def test_create_lg_records_and_copy_files_keep_track_of_successfully_ingested_fi
     actual = repo_under_test.source_bucket_files_in_transaction
 
     assert actual == expected
+
+
+def test_files_exist_on_staging_bucket_checks_all_keys_in_one_call(
+    repo_under_test, set_env
+):
+    repo_under_test.s3_repository.head_objects.return_value = {
+        "file_1.pdf": S3ObjectHead(exists=True, size=100, etag='"etag"'),
+        "file_2.pdf": S3ObjectHead(exists=False),
+    }
+
+    actual = repo_under_test.files_exist_on_staging_bucket(["file_1.pdf", "file_2.pdf"])
+
+    assert actual == {"file_1.pdf": True, "file_2.pdf": False}
+    repo_under_test.s3_repository.head_objects.assert_called_once_with(
+        MOCK_STAGING_STORE_BUCKET, ["file_1.pdf", "file_2.pdf"]
+    )
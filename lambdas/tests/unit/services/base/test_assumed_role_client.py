@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from botocore.exceptions import ClientError
+from freezegun import freeze_time
+from services.base.assumed_role_client import AssumedRoleClient
+
+MOCK_ROLE_ARN = "arn:aws:iam::123456789012:role/test-role"
+NOW = datetime(2023, 10, 30, 10, 25, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def mock_iam_service(mocker):
+    iam_service = mocker.MagicMock()
+    iam_service.assume_role.side_effect = [
+        ("first-client", NOW + timedelta(hours=1)),
+        ("second-client", NOW + timedelta(hours=2)),
+    ]
+    yield iam_service
+
+
+@pytest.fixture
+def role_client(mock_iam_service):
+    yield AssumedRoleClient(MOCK_ROLE_ARN, "s3", iam_service=mock_iam_service)
+
+
+def wait_for_background_refresh(role_client: AssumedRoleClient):
+    role_client.refresh_thread.join(timeout=5)
+
+
+@freeze_time(NOW)
+def test_get_client_assumes_role_on_first_use(role_client, mock_iam_service):
+    assert role_client.get_client() == "first-client"
+    assert role_client.get_client() == "first-client"
+
+    mock_iam_service.assume_role.assert_called_once_with(
+        MOCK_ROLE_ARN, "s3", config=None
+    )
+
+
+def test_get_client_refreshes_in_background_before_expiry(
+    role_client, mock_iam_service
+):
+    with freeze_time(NOW):
+        role_client.get_client()
+
+    with freeze_time(NOW + timedelta(minutes=55)):
+        assert role_client.get_client() == "first-client"
+        wait_for_background_refresh(role_client)
+        assert role_client.get_client() == "second-client"
+
+    assert mock_iam_service.assume_role.call_count == 2
+
+
+def test_get_client_refreshes_synchronously_once_credentials_expire(
+    role_client, mock_iam_service
+):
+    with freeze_time(NOW):
+        role_client.get_client()
+
+    with freeze_time(NOW + timedelta(minutes=59, seconds=30)):
+        assert role_client.get_client() == "second-client"
+
+    assert role_client.refresh_thread is None
+
+
+def test_failed_background_refresh_keeps_current_client(role_client, mock_iam_service):
+    mock_iam_service.assume_role.side_effect = [
+        ("first-client", NOW + timedelta(hours=1)),
+        ClientError({"Error": {"Code": "500", "Message": "error"}}, "AssumeRole"),
+    ]
+    with freeze_time(NOW):
+        role_client.get_client()
+
+    with freeze_time(NOW + timedelta(minutes=55)):
+        role_client.get_client()
+        wait_for_background_refresh(role_client)
+        assert role_client.get_client() == "first-client"
+
+
+def test_get_client_keeps_credentials_valid_for_min_remaining_lifetime(
+    mock_iam_service,
+):
+    role_client = AssumedRoleClient(
+        MOCK_ROLE_ARN,
+        "s3",
+        iam_service=mock_iam_service,
+        min_remaining_lifetime=timedelta(minutes=30),
+    )
+    with freeze_time(NOW):
+        role_client.get_client()
+
+    with freeze_time(NOW + timedelta(minutes=29, seconds=30)):
+        assert role_client.get_client() == "second-client"
+
+    assert role_client.refresh_thread is None
+
+
+def test_get_client_starts_background_refresh_ahead_of_min_remaining_lifetime(
+    mock_iam_service,
+):
+    role_client = AssumedRoleClient(
+        MOCK_ROLE_ARN,
+        "s3",
+        iam_service=mock_iam_service,
+        min_remaining_lifetime=timedelta(minutes=30),
+    )
+    with freeze_time(NOW):
+        role_client.get_client()
+
+    with freeze_time(NOW + timedelta(minutes=20)):
+        assert role_client.get_client() == "first-client"
+        wait_for_background_refresh(role_client)
+        assert role_client.get_client() == "second-client"
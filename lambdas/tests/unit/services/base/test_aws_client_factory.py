@@ -0,0 +1,66 @@
+import pytest
+from services.base.aws_client_factory import (
+    DEFAULT_MAX_POOL_CONNECTIONS,
+    build_boto_config,
+    clear_aws_client_cache,
+    get_aws_client,
+    get_aws_resource,
+)
+
+
+@pytest.fixture
+def mock_boto3_client(mocker):
+    yield mocker.patch(
+        "boto3.client", side_effect=lambda *args, **kwargs: mocker.MagicMock()
+    )
+
+
+def test_build_boto_config_uses_shared_defaults(monkeypatch):
+    monkeypatch.delenv("AWS_MAX_POOL_CONNECTIONS", raising=False)
+
+    config = build_boto_config()
+
+    assert config.max_pool_connections == DEFAULT_MAX_POOL_CONNECTIONS
+    assert config.retries == {"max_attempts": 3, "mode": "adaptive"}
+    assert config.tcp_keepalive is True
+
+
+def test_build_boto_config_pool_size_can_be_configured(monkeypatch):
+    monkeypatch.setenv("AWS_MAX_POOL_CONNECTIONS", "100")
+
+    assert build_boto_config().max_pool_connections == 100
+    assert build_boto_config(max_pool_connections=5).max_pool_connections == 5
+
+
+def test_get_aws_client_reuses_clients(mock_boto3_client):
+    first = get_aws_client("sqs")
+    second = get_aws_client("sqs")
+
+    assert first is second
+    mock_boto3_client.assert_called_once()
+    assert mock_boto3_client.call_args.args == ("sqs",)
+    assert mock_boto3_client.call_args.kwargs["config"].tcp_keepalive is True
+
+
+def test_get_aws_client_creates_separate_clients_per_service_and_options(
+    mock_boto3_client,
+):
+    sqs_client = get_aws_client("sqs")
+    ssm_client = get_aws_client("ssm", region_name="eu-west-2")
+    tuned_sqs_client = get_aws_client("sqs", max_pool_connections=5)
+
+    assert len({id(sqs_client), id(ssm_client), id(tuned_sqs_client)}) == 3
+    assert mock_boto3_client.call_count == 3
+
+
+def test_clear_aws_client_cache_creates_new_clients(mocker, mock_boto3_client):
+    mock_boto3_resource = mocker.patch("boto3.resource")
+    get_aws_client("sqs")
+    get_aws_resource("dynamodb")
+
+    clear_aws_client_cache()
+    get_aws_client("sqs")
+    get_aws_resource("dynamodb")
+
+    assert mock_boto3_client.call_count == 2
+    assert mock_boto3_resource.call_count == 2
@@ -30,7 +30,7 @@ def mock_service(set_env, mock_logs_client, patch_sleep):
 
 @pytest.fixture
 def patch_sleep(mocker):
-    mocker.patch("time.sleep")
+    yield mocker.patch("time.sleep")
 
 
 @pytest.fixture
@@ -82,6 +82,43 @@ def test_poll_query_result_poll_result_until_complete(mock_logs_client, mock_ser
     assert mock_logs_client.get_query_results.call_count == 3
 
 
+def test_poll_query_result_backs_off_between_polls(
+    mock_logs_client, mock_service, patch_sleep
+):
+    mock_logs_client.get_query_results.side_effect = [
+        MOCK_RESPONSE_QUERY_IN_PROGRESS
+    ] * 6 + [MOCK_RESPONSE_QUERY_COMPLETE]
+
+    mock_service.poll_query_result(MOCK_QUERY_ID)
+
+    actual_intervals = [call.args[0] for call in patch_sleep.call_args_list]
+    assert actual_intervals == [0.5, 1, 2, 4, 8, 8]
+
+
+def test_query_logs_concurrently_returns_results_in_query_order(mocker, mock_service):
+    other_query_params = CloudwatchLogsQueryParams("other-lambda", MOCK_QUERY_STRING)
+    mock_query_logs = mocker.patch.object(
+        mock_service,
+        "query_logs",
+        side_effect=lambda query_params, *_args: [
+            {"lambda_name": query_params.lambda_name}
+        ],
+    )
+
+    actual = mock_service.query_logs_concurrently(
+        [MOCK_QUERY_PARAMS, other_query_params],
+        start_time=MOCK_START_TIME,
+        end_time=MOCK_END_TIME,
+    )
+
+    assert actual == [
+        [{"lambda_name": MOCK_LAMBDA_NAME}],
+        [{"lambda_name": "other-lambda"}],
+    ]
+    mock_query_logs.assert_any_call(MOCK_QUERY_PARAMS, MOCK_START_TIME, MOCK_END_TIME)
+    mock_query_logs.assert_any_call(other_query_params, MOCK_START_TIME, MOCK_END_TIME)
+
+
 def test_poll_query_result_raise_error_when_exceed_max_retries(
     mock_logs_client, mock_service
 ):
@@ -1,8 +1,10 @@
 import copy
+from decimal import Decimal
 from unittest.mock import call
 
 import pytest
 from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 from botocore.exceptions import ClientError
 from enums.dynamo_filter import AttributeOperator
 from enums.metadata_field_names import DocumentReferenceMetadataFields
@@ -17,7 +19,7 @@ from tests.unit.helpers.data.dynamo.dynamo_scan_response import (
     MOCK_RESPONSE,
 )
 from utils.dynamo_query_filter_builder import DynamoQueryFilterBuilder
-from utils.exceptions import DynamoServiceException
+from utils.exceptions import DynamoServiceException, DynamoTransactionException
 
 
 @pytest.fixture
@@ -25,7 +27,7 @@ def mock_service(set_env, mocker):
     mocker.patch("boto3.resource")
     service = DynamoDBService()
     yield service
-    DynamoDBService.instance = None
+    DynamoDBService._instance = None
 
 
 @pytest.fixture
@@ -40,10 +42,13 @@ def mock_table(mocker, mock_service):
 
 
 @pytest.fixture
-def mock_scan_method(mock_table):
-    table_instance = mock_table.return_value
-    scan_method = table_instance.scan
-    yield scan_method
+def mock_client(mock_dynamo_service):
+    yield mock_dynamo_service.meta.client
+
+
+@pytest.fixture
+def mock_scan_method(mock_client):
+    yield mock_client.scan
 
 
 @pytest.fixture
@@ -68,13 +73,33 @@ def mock_scan_implementation(**kwargs):
     return None
 
 
+def serialise_response(response: dict) -> dict:
+    serialised = copy.deepcopy(response)
+    if "Items" in serialised:
+        serialised["Items"] = [
+            DynamoDBService._serialise_item(item) for item in serialised["Items"]
+        ]
+    if "LastEvaluatedKey" in serialised:
+        serialised["LastEvaluatedKey"] = DynamoDBService._serialise_item(
+            serialised["LastEvaluatedKey"]
+        )
+    return serialised
+
+
+def mock_client_scan_implementation(**kwargs):
+    if "ExclusiveStartKey" in kwargs:
+        kwargs["ExclusiveStartKey"] = DynamoDBService._deserialise_item(
+            kwargs["ExclusiveStartKey"]
+        )
+    return serialise_response(mock_scan_implementation(**kwargs))
+
+
 def test_query_with_requested_fields_returns_items_from_dynamo(
-    mock_service, mock_table
+    mock_service, mock_client
 ):
-    search_key_obj = Key("NhsNumber").eq(TEST_NHS_NUMBER)
     expected_projection = "FileName,Created"
 
-    mock_table.return_value.query.return_value = MOCK_SEARCH_RESPONSE
+    mock_client.query.return_value = serialise_response(MOCK_SEARCH_RESPONSE)
     expected = MOCK_SEARCH_RESPONSE
 
     actual = mock_service.query_table_by_index(
@@ -88,10 +113,12 @@ def test_query_with_requested_fields_returns_items_from_dynamo(
         ],
     )
 
-    mock_table.assert_called_with(MOCK_TABLE_NAME)
-    mock_table.return_value.query.assert_called_once_with(
+    mock_client.query.assert_called_once_with(
+        TableName=MOCK_TABLE_NAME,
         IndexName="NhsNumberIndex",
-        KeyConditionExpression=search_key_obj,
+        KeyConditionExpression="#n0 = :v0",
+        ExpressionAttributeNames={"#n0": "NhsNumber"},
+        ExpressionAttributeValues={":v0": {"S": TEST_NHS_NUMBER}},
         ProjectionExpression=expected_projection,
     )
 
@@ -99,13 +126,11 @@ def test_query_with_requested_fields_returns_items_from_dynamo(
 
 
 def test_query_with_requested_fields_with_filter_returns_items_from_dynamo(
-    mock_service, mock_table, mock_filter_expression
+    mock_service, mock_client, mock_filter_expression
 ):
-    search_key_obj = Key("NhsNumber").eq(TEST_NHS_NUMBER)
     expected_projection = "FileName,Created"
-    expected_filter = Attr("Deleted").eq("")
 
-    mock_table.return_value.query.return_value = MOCK_SEARCH_RESPONSE
+    mock_client.query.return_value = serialise_response(MOCK_SEARCH_RESPONSE)
     expected = MOCK_SEARCH_RESPONSE
 
     actual = mock_service.query_table_by_index(
@@ -120,21 +145,26 @@ def test_query_with_requested_fields_with_filter_returns_items_from_dynamo(
         query_filter=mock_filter_expression,
     )
 
-    mock_table.assert_called_with(MOCK_TABLE_NAME)
-    mock_table.return_value.query.assert_called_once_with(
+    mock_client.query.assert_called_once_with(
+        TableName=MOCK_TABLE_NAME,
         IndexName="NhsNumberIndex",
-        KeyConditionExpression=search_key_obj,
+        KeyConditionExpression="#n0 = :v0",
+        FilterExpression="#n1 = :v1",
+        ExpressionAttributeNames={"#n0": "NhsNumber", "#n1": "Deleted"},
+        ExpressionAttributeValues={
+            ":v0": {"S": TEST_NHS_NUMBER},
+            ":v1": {"S": ""},
+        },
         ProjectionExpression=expected_projection,
-        FilterExpression=expected_filter,
     )
 
     assert expected == actual
 
 
 def test_query_with_requested_fields_raises_exception_when_results_are_empty(
-    mock_service, mock_table
+    mock_service, mock_client
 ):
-    mock_table.return_value.query.return_value = []
+    mock_client.query.return_value = {}
 
     with pytest.raises(DynamoServiceException):
         mock_service.query_table_by_index(
@@ -150,30 +180,30 @@ def test_query_with_requested_fields_raises_exception_when_results_are_empty(
 
 
 def test_query_with_requested_fields_raises_exception_when_fields_requested_is_none(
-    mock_service, mock_table
+    mock_service, mock_client
 ):
-    search_key_obj = Key("NhsNumber").eq(TEST_NHS_NUMBER)
-
-    mock_table.return_value.query.return_value = MOCK_SEARCH_RESPONSE
+    mock_client.query.return_value = serialise_response(MOCK_SEARCH_RESPONSE)
     expected = MOCK_SEARCH_RESPONSE
 
     actual = mock_service.query_table_by_index(
         MOCK_TABLE_NAME, "test_index", "NhsNumber", TEST_NHS_NUMBER
     )
-    mock_table.assert_called_with(MOCK_TABLE_NAME)
-    mock_table.return_value.query.assert_called_once_with(
+    mock_client.query.assert_called_once_with(
+        TableName=MOCK_TABLE_NAME,
         IndexName="test_index",
-        KeyConditionExpression=search_key_obj,
+        KeyConditionExpression="#n0 = :v0",
+        ExpressionAttributeNames={"#n0": "NhsNumber"},
+        ExpressionAttributeValues={":v0": {"S": TEST_NHS_NUMBER}},
     )
 
     assert expected == actual
 
 
 def test_query_with_requested_fields_client_error_raises_exception(
-    mock_service, mock_table
+    mock_service, mock_client
 ):
     expected_response = MOCK_CLIENT_ERROR
-    mock_table.return_value.query.side_effect = MOCK_CLIENT_ERROR
+    mock_client.query.side_effect = MOCK_CLIENT_ERROR
 
     with pytest.raises(ClientError) as actual_response:
         mock_service.query_table_by_index(
@@ -243,6 +273,19 @@ def test_create_item_is_called_with_correct_parameters(mock_service, mock_table)
     )
 
 
+def test_create_item_passes_condition_expression(mock_service, mock_table):
+    mock_service.create_item(
+        MOCK_TABLE_NAME,
+        {"NhsNumber": TEST_NHS_NUMBER},
+        condition_expression="attribute_not_exists(NhsNumber)",
+    )
+
+    mock_table.return_value.put_item.assert_called_once_with(
+        Item={"NhsNumber": TEST_NHS_NUMBER},
+        ConditionExpression="attribute_not_exists(NhsNumber)",
+    )
+
+
 def test_create_item_raise_client_error(mock_service, mock_table):
     mock_service.create_item(MOCK_TABLE_NAME, {"NhsNumber": TEST_NHS_NUMBER})
     mock_table.return_value.put_item.side_effect = MOCK_CLIENT_ERROR
@@ -286,6 +329,16 @@ def test_get_item_is_called_with_correct_parameters(mock_service, mock_table):
     )
 
 
+def test_get_item_passes_consistent_read(mock_service, mock_table):
+    mock_service.get_item(
+        MOCK_TABLE_NAME, {"NhsNumber": TEST_NHS_NUMBER}, consistent_read=True
+    )
+
+    mock_table.return_value.get_item.assert_called_once_with(
+        Key={"NhsNumber": TEST_NHS_NUMBER}, ConsistentRead=True
+    )
+
+
 def test_get_item_client_error_raises_exception(mock_service, mock_table):
     expected_response = MOCK_CLIENT_ERROR
     mock_table.return_value.get_item.side_effect = MOCK_CLIENT_ERROR
@@ -296,86 +349,169 @@ def test_get_item_client_error_raises_exception(mock_service, mock_table):
     assert expected_response == actual_response.value
 
 
-def test_batch_get_items_success(mock_service, mock_dynamo_service):
+@pytest.fixture
+def mock_batch_get_item(mock_dynamo_service):
+    yield mock_dynamo_service.meta.client.batch_get_item
+
+
+def test_batch_get_items_success(mock_service, mock_batch_get_item):
     key_list = ["id1", "id2", "id3"]
     mock_response = {
         "Responses": {
             MOCK_TABLE_NAME: [
-                {"ID": "id1", "data": "value1"},
-                {"ID": "id2", "data": "value2"},
-                {"ID": "id3", "data": "value3"},
+                {"ID": {"S": "id1"}, "data": {"S": "value1"}},
+                {"ID": {"S": "id2"}, "data": {"S": "value2"}},
+                {"ID": {"S": "id3"}, "data": {"S": "value3"}},
             ]
         }
     }
-    mock_dynamo_service.batch_get_item.return_value = mock_response
+    mock_batch_get_item.return_value = mock_response
 
     results = mock_service.batch_get_items(MOCK_TABLE_NAME, key_list)
 
     expected_request_items = {
-        MOCK_TABLE_NAME: {"Keys": [{"ID": "id1"}, {"ID": "id2"}, {"ID": "id3"}]}
+        MOCK_TABLE_NAME: {
+            "Keys": [{"ID": {"S": "id1"}}, {"ID": {"S": "id2"}}, {"ID": {"S": "id3"}}]
+        }
     }
-    mock_dynamo_service.batch_get_item.assert_called_once_with(
-        RequestItems=expected_request_items
-    )
-    assert len(results) == 3
-    assert results[0]["ID"] == "id1"
-    assert results[1]["ID"] == "id2"
-    assert results[2]["ID"] == "id3"
+    mock_batch_get_item.assert_called_once_with(RequestItems=expected_request_items)
+    assert results == [
+        {"ID": "id1", "data": "value1"},
+        {"ID": "id2", "data": "value2"},
+        {"ID": "id3", "data": "value3"},
+    ]
 
 
-def test_batch_get_items_with_unprocessed_keys(mock_service, mock_dynamo_service):
+def test_batch_get_items_with_unprocessed_keys(
+    mock_service, mock_batch_get_item, mocker
+):
+    mock_sleep = mocker.patch("time.sleep")
     key_list = ["id1", "id2", "id3"]
 
     first_response = {
-        "Responses": {MOCK_TABLE_NAME: [{"ID": "id1", "data": "value1"}]},
-        "UnprocessedKeys": {MOCK_TABLE_NAME: {"Keys": [{"ID": "id2"}, {"ID": "id3"}]}},
+        "Responses": {MOCK_TABLE_NAME: [{"ID": {"S": "id1"}}]},
+        "UnprocessedKeys": {
+            MOCK_TABLE_NAME: {"Keys": [{"ID": {"S": "id2"}}, {"ID": {"S": "id3"}}]}
+        },
     }
 
     second_response = {
-        "Responses": {
-            MOCK_TABLE_NAME: [
-                {"ID": "id2", "data": "value2"},
-                {"ID": "id3", "data": "value3"},
-            ]
-        }
+        "Responses": {MOCK_TABLE_NAME: [{"ID": {"S": "id2"}}, {"ID": {"S": "id3"}}]}
     }
 
-    mock_dynamo_service.batch_get_item.side_effect = [first_response, second_response]
+    mock_batch_get_item.side_effect = [first_response, second_response]
 
     result = mock_service.batch_get_items(MOCK_TABLE_NAME, key_list)
 
-    assert mock_dynamo_service.batch_get_item.call_count == 2
-    assert len(result) == 3
+    assert mock_batch_get_item.call_count == 2
+    assert mock_batch_get_item.call_args.kwargs["RequestItems"] == {
+        MOCK_TABLE_NAME: {"Keys": [{"ID": {"S": "id2"}}, {"ID": {"S": "id3"}}]}
+    }
     assert [item["ID"] for item in result] == ["id1", "id2", "id3"]
+    mock_sleep.assert_called_once()
+    assert 0 <= mock_sleep.call_args.args[0] <= 0.1
 
 
-def test_batch_get_items_with_too_many_keys(mock_service, mock_dynamo_service):
-    key_list = [f"id{i}" for i in range(101)]
+def test_batch_get_items_splits_keys_into_chunks_of_100(
+    mock_service, mock_batch_get_item
+):
+    key_list = [f"id{i}" for i in range(250)]
+    mock_batch_get_item.side_effect = lambda RequestItems: {
+        "Responses": {MOCK_TABLE_NAME: RequestItems[MOCK_TABLE_NAME]["Keys"]}
+    }
 
     result = mock_service.batch_get_items(MOCK_TABLE_NAME, key_list)
 
-    assert isinstance(result, DynamoServiceException)
-    assert str(result) == "Cannot fetch more than 100 items at a time"
-    mock_dynamo_service.batch_get_item.assert_not_called()
+    chunk_sizes = sorted(
+        len(request.kwargs["RequestItems"][MOCK_TABLE_NAME]["Keys"])
+        for request in mock_batch_get_item.call_args_list
+    )
+    assert chunk_sizes == [50, 100, 100]
+    assert sorted(item["ID"] for item in result) == sorted(key_list)
+
+
+def test_batch_get_items_deduplicates_keys(mock_service, mock_batch_get_item):
+    mock_batch_get_item.return_value = {"Responses": {MOCK_TABLE_NAME: []}}
+
+    mock_service.batch_get_items(MOCK_TABLE_NAME, ["id1", "id1", "id2"])
+
+    assert mock_batch_get_item.call_args.kwargs["RequestItems"] == {
+        MOCK_TABLE_NAME: {"Keys": [{"ID": {"S": "id1"}}, {"ID": {"S": "id2"}}]}
+    }
+
+
+def test_batch_get_items_supports_composite_keys_and_projection(
+    mock_service, mock_batch_get_item
+):
+    mock_batch_get_item.return_value = {
+        "Responses": {
+            MOCK_TABLE_NAME: [{"NhsNumber": {"S": TEST_NHS_NUMBER}, "Size": {"N": "5"}}]
+        }
+    }
+
+    result = mock_service.batch_get_items(
+        MOCK_TABLE_NAME,
+        [{"NhsNumber": TEST_NHS_NUMBER, "Created": "2024-01-01"}],
+        requested_fields=["NhsNumber", "Size"],
+    )
+
+    mock_batch_get_item.assert_called_once_with(
+        RequestItems={
+            MOCK_TABLE_NAME: {
+                "ProjectionExpression": "#NhsNumber_attr,#Size_attr",
+                "ExpressionAttributeNames": {
+                    "#NhsNumber_attr": "NhsNumber",
+                    "#Size_attr": "Size",
+                },
+                "Keys": [
+                    {
+                        "NhsNumber": {"S": TEST_NHS_NUMBER},
+                        "Created": {"S": "2024-01-01"},
+                    }
+                ],
+            }
+        }
+    )
+    assert result == [{"NhsNumber": TEST_NHS_NUMBER, "Size": 5}]
+
+
+def test_batch_get_items_raises_when_keys_unprocessed_at_deadline(
+    mock_service, mock_batch_get_item, mocker
+):
+    mocker.patch("time.sleep")
+    mock_batch_get_item.return_value = {
+        "Responses": {MOCK_TABLE_NAME: []},
+        "UnprocessedKeys": {MOCK_TABLE_NAME: {"Keys": [{"ID": {"S": "id1"}}]}},
+    }
+
+    with pytest.raises(DynamoServiceException):
+        mock_service.batch_get_items(MOCK_TABLE_NAME, ["id1"], max_wait_seconds=0)
+
+    mock_batch_get_item.assert_called_once()
 
 
-def test_batch_get_items_with_exception(mock_service, mock_dynamo_service):
+def test_batch_get_items_with_empty_key_list(mock_service, mock_batch_get_item):
+    assert mock_service.batch_get_items(MOCK_TABLE_NAME, []) == []
+
+    mock_batch_get_item.assert_not_called()
+
+
+def test_batch_get_items_with_exception(mock_service, mock_batch_get_item):
     key_list = ["id1", "id2"]
-    mock_dynamo_service.batch_get_item.side_effect = Exception("Test exception")
+    mock_batch_get_item.side_effect = MOCK_CLIENT_ERROR
 
-    with pytest.raises(Exception) as excinfo:
+    with pytest.raises(ClientError):
         mock_service.batch_get_items(MOCK_TABLE_NAME, key_list)
 
-    assert str(excinfo.value) == "Test exception"
-
-    expected_request_items = {MOCK_TABLE_NAME: {"Keys": [{"ID": "id1"}, {"ID": "id2"}]}}
-    mock_dynamo_service.batch_get_item.assert_called_once_with(
-        RequestItems=expected_request_items
+    mock_batch_get_item.assert_called_once_with(
+        RequestItems={
+            MOCK_TABLE_NAME: {"Keys": [{"ID": {"S": "id1"}}, {"ID": {"S": "id2"}}]}
+        }
     )
 
 
-def test_update_item_is_called_with_correct_parameters(mock_service, mock_table):
-    update_key = {"ID": "9000000009"}
+def test_update_item_is_called_with_correct_parameters(mock_service, mock_client):
+    update_key = {"ID": {"S": "9000000009"}}
     expected_update_expression = (
         "SET #FileName_attr = :FileName_val, #Deleted_attr = :Deleted_val"
     )
@@ -384,11 +520,14 @@ def test_update_item_is_called_with_correct_parameters(mock_service, mock_table)
         "#Deleted_attr": "Deleted",
     }
     expected_expr_attr_values = {
-        ":FileName_val": "test-filename",
-        ":Deleted_val": "test-delete",
+        ":FileName_val": {"S": "test-filename"},
+        ":Deleted_val": {"S": "test-delete"},
+    }
+    mock_client.update_item.return_value = {
+        "Attributes": {"ID": {"S": "9000000009"}, "FileName": {"S": "test-filename"}}
     }
 
-    mock_service.update_item(
+    actual = mock_service.update_item(
         table_name=MOCK_TABLE_NAME,
         key_pair={"ID": TEST_NHS_NUMBER},
         updated_fields={
@@ -397,8 +536,9 @@ def test_update_item_is_called_with_correct_parameters(mock_service, mock_table)
         },
     )
 
-    mock_table.assert_called_with(MOCK_TABLE_NAME)
-    mock_table.return_value.update_item.assert_called_once_with(
+    assert actual["Attributes"] == {"ID": "9000000009", "FileName": "test-filename"}
+    mock_client.update_item.assert_called_once_with(
+        TableName=MOCK_TABLE_NAME,
         Key=update_key,
         UpdateExpression=expected_update_expression,
         ExpressionAttributeNames=expected_expr_attr_names,
@@ -407,9 +547,9 @@ def test_update_item_is_called_with_correct_parameters(mock_service, mock_table)
     )
 
 
-def test_update_item_client_error_raises_exception(mock_service, mock_table):
+def test_update_item_client_error_raises_exception(mock_service, mock_client):
     expected_response = MOCK_CLIENT_ERROR
-    mock_table.return_value.update_item.side_effect = MOCK_CLIENT_ERROR
+    mock_client.update_item.side_effect = MOCK_CLIENT_ERROR
 
     with pytest.raises(ClientError) as actual_response:
         mock_service.update_item(
@@ -424,6 +564,26 @@ def test_update_item_client_error_raises_exception(mock_service, mock_table):
     assert expected_response == actual_response.value
 
 
+def test_increment_item_counter_adds_one_to_counter(mock_service, mock_table):
+    mock_service.increment_item_counter(
+        table_name=MOCK_TABLE_NAME,
+        key_pair={"ID": TEST_NHS_NUMBER},
+        counter_field="RangeRequestCount",
+        condition_expression="RangeRequestCount < :max",
+        expression_attribute_values={":max": 5},
+    )
+
+    mock_table.assert_called_with(MOCK_TABLE_NAME)
+    mock_table.return_value.update_item.assert_called_once_with(
+        Key={"ID": TEST_NHS_NUMBER},
+        UpdateExpression="ADD #counter :increment",
+        ExpressionAttributeNames={"#counter": "RangeRequestCount"},
+        ExpressionAttributeValues={":increment": 1, ":max": 5},
+        ConditionExpression="RangeRequestCount < :max",
+        ReturnValues="ALL_NEW",
+    )
+
+
 def test_scan_table_is_called_with_correct_no_args(mock_service, mock_table):
     mock_table.return_value.scan.return_value = []
 
@@ -483,7 +643,7 @@ def test_scan_whole_table_return_items_in_response(
     mock_service, mock_scan_method, mock_filter_expression
 ):
     mock_project_expression = "mock_project_expression"
-    mock_scan_method.return_value = MOCK_RESPONSE
+    mock_scan_method.return_value = serialise_response(MOCK_RESPONSE)
 
     expected = MOCK_RESPONSE["Items"]
     actual = mock_service.scan_whole_table(
@@ -494,10 +654,12 @@ def test_scan_whole_table_return_items_in_response(
 
     assert expected == actual
 
-    mock_service.get_table.assert_called_with(MOCK_TABLE_NAME)
     mock_scan_method.assert_called_with(
+        TableName=MOCK_TABLE_NAME,
         ProjectionExpression=mock_project_expression,
-        FilterExpression=mock_filter_expression,
+        FilterExpression="#n0 = :v0",
+        ExpressionAttributeNames={"#n0": "Deleted"},
+        ExpressionAttributeValues={":v0": {"S": ""}},
     )
 
 
@@ -505,23 +667,25 @@ def test_scan_whole_table_handles_pagination(
     mock_service, mock_scan_method, mock_filter_expression
 ):
     mock_project_expression = "mock_project_expression"
-    mock_scan_method.side_effect = mock_scan_implementation
+    mock_scan_method.side_effect = mock_client_scan_implementation
+    scan_arguments = {
+        "TableName": MOCK_TABLE_NAME,
+        "ProjectionExpression": mock_project_expression,
+        "FilterExpression": "#n0 = :v0",
+        "ExpressionAttributeNames": {"#n0": "Deleted"},
+        "ExpressionAttributeValues": {":v0": {"S": ""}},
+    }
 
     expected_result = EXPECTED_ITEMS_FOR_PAGINATED_RESULTS
     expected_calls = [
+        call(**scan_arguments),
         call(
-            ProjectionExpression=mock_project_expression,
-            FilterExpression=mock_filter_expression,
-        ),
-        call(
-            ProjectionExpression=mock_project_expression,
-            FilterExpression=mock_filter_expression,
-            ExclusiveStartKey={"ID": "id_token_for_page_2"},
+            **scan_arguments,
+            ExclusiveStartKey={"ID": {"S": "id_token_for_page_2"}},
         ),
         call(
-            ProjectionExpression=mock_project_expression,
-            FilterExpression=mock_filter_expression,
-            ExclusiveStartKey={"ID": "id_token_for_page_3"},
+            **scan_arguments,
+            ExclusiveStartKey={"ID": {"S": "id_token_for_page_3"}},
         ),
     ]
 
@@ -532,8 +696,6 @@ def test_scan_whole_table_handles_pagination(
     )
 
     assert expected_result == actual
-
-    mock_service.get_table.assert_called_with(MOCK_TABLE_NAME)
     mock_scan_method.assert_has_calls(expected_calls)
 
 
@@ -544,8 +706,139 @@ def test_scan_whole_table_omit_expression_arguments_if_not_given(
         table_name=MOCK_TABLE_NAME,
     )
 
-    mock_service.get_table.assert_called_with(MOCK_TABLE_NAME)
-    mock_scan_method.assert_called_with()
+    mock_scan_method.assert_called_with(TableName=MOCK_TABLE_NAME)
+
+
+def test_scan_whole_table_scans_segments_in_parallel(mock_service, mock_scan_method):
+    def scan_segment(**kwargs):
+        segment = kwargs["Segment"]
+        if "ExclusiveStartKey" not in kwargs:
+            return {
+                "Items": [{"ID": {"S": f"segment{segment}-page1"}}],
+                "LastEvaluatedKey": {"ID": {"S": f"segment{segment}-page1"}},
+            }
+        return {"Items": [{"ID": {"S": f"segment{segment}-page2"}}]}
+
+    mock_scan_method.side_effect = scan_segment
+
+    actual = mock_service.scan_whole_table(
+        table_name=MOCK_TABLE_NAME, project_expression="ID", total_segments=3
+    )
+
+    assert actual == [
+        {"ID": f"segment{segment}-page{page}"}
+        for segment in range(3)
+        for page in (1, 2)
+    ]
+    assert mock_scan_method.call_count == 6
+    mock_scan_method.assert_any_call(
+        TableName=MOCK_TABLE_NAME,
+        ProjectionExpression="ID",
+        Segment=2,
+        TotalSegments=3,
+    )
+    mock_scan_method.assert_any_call(
+        TableName=MOCK_TABLE_NAME,
+        ProjectionExpression="ID",
+        Segment=1,
+        TotalSegments=3,
+        ExclusiveStartKey={"ID": {"S": "segment1-page1"}},
+    )
+
+
+def test_scan_whole_table_caps_consumed_capacity(
+    mock_service, mock_scan_method, mocker
+):
+    mock_consume = mocker.patch(
+        "services.base.dynamo_service.CapacityRateLimiter.consume"
+    )
+    mock_scan_method.side_effect = [
+        {
+            "Items": [{"ID": {"S": "1"}}],
+            "LastEvaluatedKey": {"ID": {"S": "1"}},
+            "ConsumedCapacity": {"CapacityUnits": 12.5},
+        },
+        {"Items": [{"ID": {"S": "2"}}], "ConsumedCapacity": {"CapacityUnits": 3}},
+    ]
+
+    actual = mock_service.scan_whole_table(
+        table_name=MOCK_TABLE_NAME, max_capacity_units_per_second=10
+    )
+
+    assert actual == [{"ID": "1"}, {"ID": "2"}]
+    mock_consume.assert_called_once_with(12.5)
+    mock_scan_method.assert_called_with(
+        TableName=MOCK_TABLE_NAME,
+        ReturnConsumedCapacity="TOTAL",
+        ExclusiveStartKey={"ID": {"S": "1"}},
+    )
+
+
+def test_iterate_query_pages_stops_reading_when_caller_stops(mock_service, mock_client):
+    mock_client.query.side_effect = mock_client_scan_implementation
+
+    pages = mock_service.iterate_query_pages(
+        table_name=MOCK_TABLE_NAME,
+        search_key="NhsNumber",
+        search_condition=TEST_NHS_NUMBER,
+    )
+    first_page = next(pages)
+    pages.close()
+
+    assert first_page == MOCK_PAGINATED_RESPONSE_1["Items"]
+    mock_client.query.assert_called_once()
+
+
+def test_iterate_scan_pages_yields_each_page(mock_service, mock_scan_method):
+    mock_scan_method.side_effect = mock_client_scan_implementation
+
+    actual = list(mock_service.iterate_scan_pages(table_name=MOCK_TABLE_NAME))
+
+    assert actual == [
+        MOCK_PAGINATED_RESPONSE_1["Items"],
+        MOCK_PAGINATED_RESPONSE_2["Items"],
+        MOCK_PAGINATED_RESPONSE_3["Items"],
+    ]
+
+
+def test_iterate_scan_pages_yields_pages_from_every_segment(
+    mock_service, mock_scan_method
+):
+    def scan_segment(**kwargs):
+        segment = kwargs["Segment"]
+        if "ExclusiveStartKey" not in kwargs:
+            return {
+                "Items": [{"ID": {"S": f"segment{segment}-page1"}}],
+                "LastEvaluatedKey": {"ID": {"S": f"segment{segment}-page1"}},
+            }
+        return {"Items": [{"ID": {"S": f"segment{segment}-page2"}}]}
+
+    mock_scan_method.side_effect = scan_segment
+
+    actual = [
+        item
+        for page in mock_service.iterate_scan_pages(
+            table_name=MOCK_TABLE_NAME, total_segments=3
+        )
+        for item in page
+    ]
+
+    assert sorted(item["ID"] for item in actual) == [
+        f"segment{segment}-page{page}" for segment in range(3) for page in (1, 2)
+    ]
+
+
+def test_iterate_scan_pages_raises_segment_errors(mock_service, mock_scan_method):
+    mock_scan_method.side_effect = ClientError(
+        {"Error": {"Code": "500", "Message": "test error"}}, "Scan"
+    )
+
+    with pytest.raises(ClientError):
+        list(
+            mock_service.iterate_scan_pages(
+                table_name=MOCK_TABLE_NAME, total_segments=2
+            )
+        )
 
 
 def test_get_table_when_table_exists_then_table_is_returned_successfully(
@@ -572,6 +865,318 @@ def test_get_table_when_table_does_not_exists_then_exception_is_raised(
     assert expected_response == actual_response.value
 
 
+def test_get_table_reuses_table_handles(mock_service, mock_dynamo_service):
+    first = mock_service.get_table(MOCK_TABLE_NAME)
+    second = mock_service.get_table(MOCK_TABLE_NAME)
+
+    assert first is second
+    mock_dynamo_service.Table.assert_called_once_with(MOCK_TABLE_NAME)
+
+
+def test_query_table_by_index_fast_path_uses_client(mock_service, mock_dynamo_service):
+    mock_service.use_client_fast_path = True
+    mock_client = mock_dynamo_service.meta.client
+    mock_client.query.return_value = {
+        "Items": [
+            {
+                "ID": {"S": "test-id"},
+                "FileSize": {"N": "1024"},
+                "Uploaded": {"BOOL": True},
+            }
+        ],
+        "LastEvaluatedKey": {"ID": {"S": "test-id"}},
+    }
+
+    actual = mock_service.query_table_by_index(
+        table_name=MOCK_TABLE_NAME,
+        index_name="NhsNumberIndex",
+        search_key="NhsNumber",
+        search_condition=TEST_NHS_NUMBER,
+        requested_fields=["ID", "FileSize"],
+        query_filter=Attr("Deleted").eq(""),
+        exclusive_start_key={"ID": "previous-id"},
+    )
+
+    assert actual["Items"] == [{"ID": "test-id", "FileSize": 1024, "Uploaded": True}]
+    assert actual["LastEvaluatedKey"] == {"ID": "test-id"}
+    mock_client.query.assert_called_once_with(
+        TableName=MOCK_TABLE_NAME,
+        KeyConditionExpression="#n0 = :v0",
+        IndexName="NhsNumberIndex",
+        ProjectionExpression="ID,FileSize",
+        FilterExpression="#n1 = :v1",
+        ExclusiveStartKey={"ID": {"S": "previous-id"}},
+        ExpressionAttributeNames={"#n0": "NhsNumber", "#n1": "Deleted"},
+        ExpressionAttributeValues={":v0": {"S": TEST_NHS_NUMBER}, ":v1": {"S": ""}},
+    )
+    mock_dynamo_service.Table.assert_not_called()
+
+
+def test_get_item_fast_path_uses_client(mock_service, mock_dynamo_service):
+    mock_service.use_client_fast_path = True
+    mock_client = mock_dynamo_service.meta.client
+    mock_client.get_item.return_value = {"Item": {"ID": {"S": "test-id"}}}
+
+    actual = mock_service.get_item(MOCK_TABLE_NAME, {"ID": "test-id"})
+
+    assert actual == {"Item": {"ID": "test-id"}}
+    mock_client.get_item.assert_called_once_with(
+        TableName=MOCK_TABLE_NAME, Key={"ID": {"S": "test-id"}}
+    )
+
+
+def test_decode_item_matches_type_deserializer():
+    item = {
+        "ID": "test-id",
+        "FileSize": 1024,
+        "Ratio": Decimal("0.5"),
+        "Uploaded": True,
+        "Deleted": None,
+        "Metadata": {"Tags": ["a", "b"], "Count": -3},
+        "Codes": {"x", "y"},
+        "Sizes": {Decimal(1), Decimal("2.5")},
+        "Payload": b"payload",
+        "Blobs": {b"a", b"b"},
+    }
+    serialised = {key: TypeSerializer().serialize(value) for key, value in item.items()}
+
+    expected = {
+        key: TypeDeserializer().deserialize(value) for key, value in serialised.items()
+    }
+    actual = DynamoDBService._decode_item(serialised)
+
+    assert actual == expected
+    assert isinstance(actual["FileSize"], Decimal)
+    assert isinstance(actual["Metadata"]["Count"], Decimal)
+
+
+def test_query_table_by_index_records_metrics_when_enabled(
+    mock_service, mock_client, monkeypatch, caplog
+):
+    monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "test_search_handler")
+    mock_service.metrics_enabled = True
+    mock_client.query.return_value = serialise_response(
+        {
+            **MOCK_SEARCH_RESPONSE,
+            "ConsumedCapacity": {"TableName": MOCK_TABLE_NAME, "CapacityUnits": 1.5},
+        }
+    )
+
+    mock_service.query_table_by_index(
+        table_name=MOCK_TABLE_NAME,
+        index_name="NhsNumberIndex",
+        search_key="NhsNumber",
+        search_condition=TEST_NHS_NUMBER,
+    )
+
+    mock_client.query.assert_called_once_with(
+        TableName=MOCK_TABLE_NAME,
+        KeyConditionExpression="#n0 = :v0",
+        ExpressionAttributeNames={"#n0": "NhsNumber"},
+        ExpressionAttributeValues={":v0": {"S": TEST_NHS_NUMBER}},
+        IndexName="NhsNumberIndex",
+        ReturnConsumedCapacity="TOTAL",
+    )
+    metrics = caplog.records[-1].custom_args["DynamoDBMetrics"]
+    assert metrics["Handler"] == "test_search_handler"
+    assert metrics["Operation"] == "Query"
+    assert metrics["Table"] == MOCK_TABLE_NAME
+    assert metrics["Index"] == "NhsNumberIndex"
+    assert metrics["CapacityType"] == "RCU"
+    assert metrics["ConsumedCapacityUnits"] == 1.5
+    assert metrics["ItemCount"] == len(MOCK_SEARCH_RESPONSE["Items"])
+    assert metrics["PageCount"] == 1
+    assert metrics["DurationMs"] >= 0
+
+
+def test_metrics_are_not_recorded_by_default(mock_service, mock_table, caplog):
+    mock_service.create_item(MOCK_TABLE_NAME, {"ID": "test-id"})
+
+    mock_table.return_value.put_item.assert_called_once_with(Item={"ID": "test-id"})
+    assert all(
+        "DynamoDBMetrics" not in getattr(record, "custom_args", {})
+        for record in caplog.records
+    )
+
+
+def test_create_item_records_write_capacity(mock_service, mock_table, caplog):
+    mock_service.metrics_enabled = True
+    mock_table.return_value.put_item.return_value = {
+        "ConsumedCapacity": {"TableName": MOCK_TABLE_NAME, "CapacityUnits": 2.0}
+    }
+
+    mock_service.create_item(MOCK_TABLE_NAME, {"ID": "test-id"})
+
+    metrics = caplog.records[-1].custom_args["DynamoDBMetrics"]
+    assert metrics["Operation"] == "PutItem"
+    assert metrics["CapacityType"] == "WCU"
+    assert metrics["ConsumedCapacityUnits"] == 2.0
+    assert metrics["ItemCount"] == 1
+
+
+def test_scan_whole_table_records_one_metric_per_segment(
+    mock_service, mock_scan_method, caplog
+):
+    mock_service.metrics_enabled = True
+    mock_scan_method.side_effect = [
+        serialise_response(
+            {
+                "Items": [{"ID": "1"}, {"ID": "2"}],
+                "LastEvaluatedKey": {"ID": "2"},
+                "ConsumedCapacity": {"CapacityUnits": 4},
+            }
+        ),
+        serialise_response(
+            {"Items": [{"ID": "3"}], "ConsumedCapacity": {"CapacityUnits": 1.5}}
+        ),
+    ]
+
+    mock_service.scan_whole_table(table_name=MOCK_TABLE_NAME)
+
+    metric_records = [
+        record.custom_args["DynamoDBMetrics"]
+        for record in caplog.records
+        if "DynamoDBMetrics" in getattr(record, "custom_args", {})
+    ]
+    assert len(metric_records) == 1
+    assert metric_records[0]["ConsumedCapacityUnits"] == 5.5
+    assert metric_records[0]["ItemCount"] == 3
+    assert metric_records[0]["PageCount"] == 2
+    mock_scan_method.assert_called_with(
+        TableName=MOCK_TABLE_NAME,
+        ReturnConsumedCapacity="TOTAL",
+        ExclusiveStartKey={"ID": {"S": "2"}},
+    )
+
+
+def test_transaction_builds_transact_write_items(mock_service, mock_dynamo_service):
+    mock_client = mock_dynamo_service.meta.client
+
+    transaction = mock_service.transaction()
+    transaction.put(MOCK_TABLE_NAME, {"ID": "new-id", "FileSize": 10})
+    transaction.update(
+        MOCK_TABLE_NAME,
+        {"ID": "updated-id"},
+        {"DocStatus": "deprecated"},
+        condition_expression=Attr("ID").exists(),
+    )
+    transaction.delete(
+        MOCK_TABLE_NAME,
+        {"ID": "deleted-id"},
+        condition_expression="attribute_exists(ID)",
+    )
+    transaction.condition_check(
+        MOCK_TABLE_NAME, {"ID": "checked-id"}, Attr("Deleted").eq("")
+    )
+    transaction.commit()
+
+    mock_client.transact_write_items.assert_called_once_with(
+        TransactItems=[
+            {
+                "Put": {
+                    "TableName": MOCK_TABLE_NAME,
+                    "Item": {"ID": {"S": "new-id"}, "FileSize": {"N": "10"}},
+                }
+            },
+            {
+                "Update": {
+                    "TableName": MOCK_TABLE_NAME,
+                    "Key": {"ID": {"S": "updated-id"}},
+                    "UpdateExpression": "SET #DocStatus_attr = :DocStatus_val",
+                    "ConditionExpression": "attribute_exists(#n0)",
+                    "ExpressionAttributeNames": {
+                        "#DocStatus_attr": "DocStatus",
+                        "#n0": "ID",
+                    },
+                    "ExpressionAttributeValues": {
+                        ":DocStatus_val": {"S": "deprecated"}
+                    },
+                }
+            },
+            {
+                "Delete": {
+                    "TableName": MOCK_TABLE_NAME,
+                    "Key": {"ID": {"S": "deleted-id"}},
+                    "ConditionExpression": "attribute_exists(ID)",
+                }
+            },
+            {
+                "ConditionCheck": {
+                    "TableName": MOCK_TABLE_NAME,
+                    "Key": {"ID": {"S": "checked-id"}},
+                    "ConditionExpression": "#n0 = :v0",
+                    "ExpressionAttributeNames": {"#n0": "Deleted"},
+                    "ExpressionAttributeValues": {":v0": {"S": ""}},
+                }
+            },
+        ]
+    )
+    assert len(transaction) == 0
+
+
+def test_transaction_commits_in_chunks_of_100(mock_service, mock_dynamo_service):
+    mock_client = mock_dynamo_service.meta.client
+    transaction = mock_service.transaction()
+    for index in range(250):
+        transaction.delete(MOCK_TABLE_NAME, {"ID": str(index)})
+
+    transaction.commit()
+
+    chunk_sizes = [
+        len(call_args.kwargs["TransactItems"])
+        for call_args in mock_client.transact_write_items.call_args_list
+    ]
+    assert chunk_sizes == [100, 100, 50]
+
+
+def test_empty_transaction_is_not_sent(mock_service, mock_dynamo_service):
+    mock_service.transaction().commit()
+
+    mock_dynamo_service.meta.client.transact_write_items.assert_not_called()
+
+
+def test_cancelled_transaction_raises_decoded_reasons(
+    mock_service, mock_dynamo_service
+):
+    mock_dynamo_service.meta.client.transact_write_items.side_effect = ClientError(
+        {
+            "Error": {"Code": "TransactionCanceledException", "Message": "cancelled"},
+            "CancellationReasons": [
+                {"Code": "None"},
+                {"Code": "ConditionalCheckFailed", "Message": "condition failed"},
+            ],
+        },
+        "TransactWriteItems",
+    )
+    transaction = mock_service.transaction()
+    transaction.put(MOCK_TABLE_NAME, {"ID": "new-id"})
+    transaction.delete(
+        MOCK_TABLE_NAME, {"ID": "deleted-id"}, condition_expression=Attr("ID").exists()
+    )
+
+    with pytest.raises(DynamoTransactionException) as error:
+        transaction.commit()
+
+    assert error.value.cancellation_reasons == [
+        {
+            "Action": "Delete",
+            "TableName": MOCK_TABLE_NAME,
+            "Key": {"ID": "deleted-id"},
+            "Code": "ConditionalCheckFailed",
+            "Message": "condition failed",
+        }
+    ]
+
+
+def test_transaction_client_errors_are_raised(mock_service, mock_dynamo_service):
+    mock_dynamo_service.meta.client.transact_write_items.side_effect = MOCK_CLIENT_ERROR
+    transaction = mock_service.transaction()
+    transaction.delete(MOCK_TABLE_NAME, {"ID": "deleted-id"})
+
+    with pytest.raises(ClientError):
+        transaction.commit()
+
+
 def test_dynamo_service_singleton_instance(mocker):
     mocker.patch("boto3.resource")
 
@@ -581,23 +1186,20 @@ def test_dynamo_service_singleton_instance(mocker):
     assert instance_1 is instance_2
 
 
-def test_query_with_pagination(mock_service, mock_table):
-    mock_table.return_value.query.side_effect = mock_scan_implementation
+def test_query_with_pagination(mock_service, mock_client):
+    mock_client.query.side_effect = mock_client_scan_implementation
     expected_result = EXPECTED_ITEMS_FOR_PAGINATED_RESULTS
-    search_key_obj = Key("NhsNumber").eq(TEST_NHS_NUMBER)
+    key_condition = {
+        "TableName": MOCK_TABLE_NAME,
+        "KeyConditionExpression": "#n0 = :v0",
+        "ExpressionAttributeNames": {"#n0": "NhsNumber"},
+        "ExpressionAttributeValues": {":v0": {"S": TEST_NHS_NUMBER}},
+    }
 
     expected_calls = [
-        call(
-            KeyConditionExpression=search_key_obj,
-        ),
-        call(
-            KeyConditionExpression=search_key_obj,
-            ExclusiveStartKey={"ID": "id_token_for_page_2"},
-        ),
-        call(
-            KeyConditionExpression=search_key_obj,
-            ExclusiveStartKey={"ID": "id_token_for_page_3"},
-        ),
+        call(**key_condition),
+        call(**key_condition, ExclusiveStartKey={"ID": {"S": "id_token_for_page_2"}}),
+        call(**key_condition, ExclusiveStartKey={"ID": {"S": "id_token_for_page_3"}}),
     ]
 
     actual = mock_service.query_with_pagination(
@@ -606,5 +1208,4 @@ def test_query_with_pagination(mock_service, mock_table):
         search_condition=TEST_NHS_NUMBER,
     )
     assert expected_result == actual
-    mock_table.assert_called_with(MOCK_TABLE_NAME)
-    mock_table.return_value.query.assert_has_calls(expected_calls)
+    mock_client.query.assert_has_calls(expected_calls)
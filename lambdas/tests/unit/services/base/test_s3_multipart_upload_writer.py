@@ -0,0 +1,117 @@
+import zipfile
+
+import pytest
+from botocore.exceptions import ClientError
+from services.base.s3_multipart_upload_writer import S3MultipartUploadWriter
+from tests.unit.conftest import MOCK_BUCKET, TEST_FILE_KEY
+
+PART_SIZE = S3MultipartUploadWriter.MIN_PART_SIZE
+
+
+@pytest.fixture
+def mock_client(mocker):
+    client = mocker.MagicMock()
+    client.create_multipart_upload.return_value = {"UploadId": "test-upload-id"}
+    client.upload_part.side_effect = lambda **kwargs: {
+        "ETag": f"etag-{kwargs['PartNumber']}"
+    }
+    yield client
+
+
+@pytest.fixture
+def writer(mock_client):
+    yield S3MultipartUploadWriter(
+        mock_client, MOCK_BUCKET, TEST_FILE_KEY, part_size=PART_SIZE
+    )
+
+
+def test_small_object_is_uploaded_with_single_put(writer, mock_client):
+    with writer:
+        writer.write(b"small content")
+
+    mock_client.put_object.assert_called_once_with(
+        Bucket=MOCK_BUCKET, Key=TEST_FILE_KEY, Body=b"small content"
+    )
+    mock_client.create_multipart_upload.assert_not_called()
+
+
+def test_parts_are_flushed_as_data_is_written(writer, mock_client):
+    with writer:
+        writer.write(b"a" * PART_SIZE)
+        assert mock_client.upload_part.call_count == 1
+        assert len(writer.buffer) == 0
+
+        writer.write(b"b" * (PART_SIZE + 10))
+        assert mock_client.upload_part.call_count == 2
+        assert len(writer.buffer) == 10
+
+    assert mock_client.upload_part.call_count == 3
+    last_part = mock_client.upload_part.call_args.kwargs
+    assert last_part["PartNumber"] == 3
+    assert last_part["Body"] == b"b" * 10
+    mock_client.complete_multipart_upload.assert_called_once_with(
+        Bucket=MOCK_BUCKET,
+        Key=TEST_FILE_KEY,
+        UploadId="test-upload-id",
+        MultipartUpload={
+            "Parts": [
+                {"ETag": "etag-1", "PartNumber": 1},
+                {"ETag": "etag-2", "PartNumber": 2},
+                {"ETag": "etag-3", "PartNumber": 3},
+            ]
+        },
+    )
+    mock_client.put_object.assert_not_called()
+
+
+def test_extra_args_are_passed_to_upload_creation(mock_client):
+    extra_args = {"ContentType": "application/zip"}
+
+    with S3MultipartUploadWriter(
+        mock_client, MOCK_BUCKET, TEST_FILE_KEY, PART_SIZE, extra_args
+    ) as writer:
+        writer.write(b"a" * PART_SIZE)
+
+    mock_client.create_multipart_upload.assert_called_once_with(
+        Bucket=MOCK_BUCKET, Key=TEST_FILE_KEY, ContentType="application/zip"
+    )
+
+
+def test_upload_is_aborted_when_writing_fails(writer, mock_client):
+    with pytest.raises(RuntimeError):
+        with writer:
+            writer.write(b"a" * PART_SIZE)
+            raise RuntimeError("zip failed")
+
+    mock_client.abort_multipart_upload.assert_called_once_with(
+        Bucket=MOCK_BUCKET, Key=TEST_FILE_KEY, UploadId="test-upload-id"
+    )
+    mock_client.complete_multipart_upload.assert_not_called()
+    assert writer.closed
+
+
+def test_upload_is_aborted_when_completion_fails(writer, mock_client):
+    mock_client.complete_multipart_upload.side_effect = ClientError(
+        {"Error": {"Code": "500", "Message": "test error"}}, "CompleteMultipartUpload"
+    )
+
+    with pytest.raises(ClientError):
+        with writer:
+            writer.write(b"a" * PART_SIZE)
+
+    mock_client.abort_multipart_upload.assert_called_once()
+
+
+def test_part_size_below_s3_minimum_raises_value_error(mock_client):
+    with pytest.raises(ValueError):
+        S3MultipartUploadWriter(mock_client, MOCK_BUCKET, TEST_FILE_KEY, part_size=1)
+
+
+def test_writer_can_be_used_as_non_seekable_zip_output(writer, mock_client):
+    with writer:
+        with zipfile.ZipFile(writer, "w", compression=zipfile.ZIP_DEFLATED) as zipf:
+            zipf.writestr("test.txt", b"test content")
+
+    uploaded = mock_client.put_object.call_args.kwargs["Body"]
+    assert uploaded.startswith(b"PK")
+    assert writer.closed
@@ -1,10 +1,14 @@
 import datetime
 from io import BytesIO
+from unittest.mock import call
 
 import pytest
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, IncompleteReadError
+from botocore.response import StreamingBody
+from enums.s3_transfer_profile import S3TransferProfile
 from freezegun import freeze_time
-from services.base.s3_service import S3Service
+from services.base.assumed_role_client import AssumedRoleClient
+from services.base.s3_service import S3ObjectHead, S3Service
 from tests.unit.conftest import (
     MOCK_BUCKET,
     MOCK_CLIENT_ERROR,
@@ -36,11 +40,11 @@ def mock_service(mocker, set_env):
     mocker.patch("boto3.client")
     mocker.patch("services.base.iam_service.IAMService")
     service = S3Service(custom_aws_role="mock_arn_custom_role")
-    service.expiration_time = datetime.datetime.now(
+    service.custom_role_client.expiration_time = datetime.datetime.now(
         datetime.timezone.utc
     ) + datetime.timedelta(hours=1)
     yield service
-    S3Service._instance = None
+    S3Service._instances.clear()
 
 
 @pytest.fixture
@@ -51,7 +55,7 @@ def mock_client(mocker, mock_service):
 
 @pytest.fixture
 def mock_custom_client(mocker, mock_service):
-    client = mocker.patch.object(mock_service, "custom_client")
+    client = mocker.patch.object(mock_service.custom_role_client, "client")
     yield client
 
 
@@ -61,30 +65,20 @@ def mock_list_objects_paginate(mock_client):
     return mock_paginator_method
 
 
-def test_create_upload_presigned_url(mock_service, mocker, mock_custom_client):
+def test_create_upload_presigned_url(mock_service, mock_custom_client):
     mock_custom_client.generate_presigned_post.return_value = (
         MOCK_PRESIGNED_URL_RESPONSE
     )
 
-    mock_service.iam_service = mocker.MagicMock()
-    mock_service.iam_service.assume_role.return_value = (
-        mock_custom_client,
-        mock_service.expiration_time,
-    )
-
     response = mock_service.create_upload_presigned_url(MOCK_BUCKET, TEST_UUID)
 
     assert response == MOCK_PRESIGNED_URL_RESPONSE
     mock_custom_client.generate_presigned_post.assert_called_once()
 
 
-def test_create_download_presigned_url(mock_service, mocker, mock_custom_client):
+def test_create_download_presigned_url(mock_service, mock_custom_client):
     mock_custom_client.generate_presigned_url.return_value = MOCK_PRESIGNED_URL_RESPONSE
-    mock_service.iam_service = mocker.MagicMock()
-    mock_service.iam_service.assume_role.return_value = (
-        mock_custom_client,
-        mock_service.expiration_time,
-    )
+
     response = mock_service.create_download_presigned_url(MOCK_BUCKET, TEST_FILE_KEY)
 
     assert response == MOCK_PRESIGNED_URL_RESPONSE
@@ -95,7 +89,28 @@ def test_download_file(mock_service, mock_client):
     mock_service.download_file(MOCK_BUCKET, TEST_FILE_KEY, TEST_DOWNLOAD_PATH)
 
     mock_client.download_file.assert_called_once_with(
-        MOCK_BUCKET, TEST_FILE_KEY, TEST_DOWNLOAD_PATH
+        MOCK_BUCKET,
+        TEST_FILE_KEY,
+        TEST_DOWNLOAD_PATH,
+        Config=mock_service.transfer_configs[S3TransferProfile.DEFAULT],
+    )
+
+
+def test_download_file_obj_uses_requested_transfer_profile(mock_service, mock_client):
+    file_obj = BytesIO()
+
+    mock_service.download_file_obj(
+        MOCK_BUCKET,
+        TEST_FILE_KEY,
+        file_obj,
+        transfer_profile=S3TransferProfile.STITCHED_PDF,
+    )
+
+    mock_client.download_fileobj.assert_called_once_with(
+        Bucket=MOCK_BUCKET,
+        Key=TEST_FILE_KEY,
+        Fileobj=file_obj,
+        Config=mock_service.transfer_configs[S3TransferProfile.STITCHED_PDF],
     )
 
 
@@ -103,9 +118,25 @@ def test_upload_file(mock_service, mock_client):
     mock_service.upload_file(TEST_FILE_NAME, MOCK_BUCKET, TEST_FILE_KEY)
 
     mock_client.upload_file.assert_called_with(
-        TEST_FILE_NAME, MOCK_BUCKET, TEST_FILE_KEY
+        TEST_FILE_NAME,
+        MOCK_BUCKET,
+        TEST_FILE_KEY,
+        Config=mock_service.transfer_configs[S3TransferProfile.DEFAULT],
+    )
+
+
+def test_upload_file_uses_requested_transfer_profile(mock_service, mock_client):
+    mock_service.upload_file(
+        TEST_FILE_NAME,
+        MOCK_BUCKET,
+        TEST_FILE_KEY,
+        transfer_profile=S3TransferProfile.REPORT,
     )
 
+    config = mock_client.upload_file.call_args.kwargs["Config"]
+    assert config.multipart_threshold == 64 * 1024 * 1024
+    assert config.max_concurrency == 2
+
 
 def test_upload_file_with_extra_args(mock_service, mock_client):
     test_extra_args = {"mock_tag": 123, "apple": "red", "banana": "true"}
@@ -115,7 +146,11 @@ def test_upload_file_with_extra_args(mock_service, mock_client):
     )
 
     mock_client.upload_file.assert_called_with(
-        TEST_FILE_NAME, MOCK_BUCKET, TEST_FILE_KEY, test_extra_args
+        TEST_FILE_NAME,
+        MOCK_BUCKET,
+        TEST_FILE_KEY,
+        test_extra_args,
+        Config=mock_service.transfer_configs[S3TransferProfile.DEFAULT],
     )
 
 
@@ -304,19 +339,22 @@ def test_not_created_custom_client_without_client_role(mocker):
     mock_service = S3Service()
 
     iam_service.assert_not_called()
-    assert mock_service.custom_client is None
+    assert mock_service.custom_role_client is None
 
 
 @freeze_time("2023-10-30T10:25:00")
 def test_created_custom_client_when_client_role_is_passed(mocker):
-    S3Service._instance = None
+    S3Service._instances.clear()
 
     mocker.patch("boto3.client")
     iam_service_instance = mocker.MagicMock()
     iam_service = mocker.patch(
-        "services.base.s3_service.IAMService", return_value=iam_service_instance
+        "services.base.assumed_role_client.IAMService",
+        return_value=iam_service_instance,
     )
-    mock_expiration_time = datetime.datetime.now(datetime.timezone.utc)
+    mock_expiration_time = datetime.datetime.now(
+        datetime.timezone.utc
+    ) + datetime.timedelta(hours=1)
     custom_client_mock = mocker.MagicMock()
     iam_service_instance.assume_role.return_value = (
         custom_client_mock,
@@ -325,9 +363,40 @@ def test_created_custom_client_when_client_role_is_passed(mocker):
 
     mock_service = S3Service(custom_aws_role="test")
 
-    iam_service.assert_called()
-    assert mock_service.custom_client == custom_client_mock
-    iam_service_instance.assume_role.assert_called()
+    iam_service.assert_not_called()
+    assert mock_service.custom_role_client.get_client() == custom_client_mock
+    iam_service.assert_called_once()
+    iam_service_instance.assume_role.assert_called_once_with(
+        "test", "s3", config=mock_service.config
+    )
+    assert mock_service.custom_role_client.required_lifetime == (
+        datetime.timedelta(seconds=mock_service.presigned_url_expiry)
+        + AssumedRoleClient.EXPIRY_MARGIN
+    )
+    S3Service._instances.clear()
+
+
+def test_s3_service_keeps_separate_instance_per_role(mocker):
+    S3Service._instances.clear()
+    mocker.patch("boto3.client")
+    iam_service_instance = mocker.patch(
+        "services.base.assumed_role_client.IAMService"
+    ).return_value
+    iam_service_instance.assume_role.side_effect = lambda role, *args, **kwargs: (
+        f"{role}-client",
+        datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1),
+    )
+
+    default_service = S3Service()
+    upload_service = S3Service(custom_aws_role="upload-role")
+    download_service = S3Service(custom_aws_role="download-role")
+
+    assert S3Service() is default_service
+    assert S3Service(custom_aws_role="upload-role") is upload_service
+    assert upload_service.custom_role_client.get_client() == "upload-role-client"
+    assert download_service.custom_role_client.get_client() == "download-role-client"
+    assert default_service.client is upload_service.client
+    S3Service._instances.clear()
 
 
 def test_list_all_objects_return_a_list_of_file_details(
@@ -372,6 +441,79 @@ def test_list_all_objects_raises_client_error_if_unexpected_response(
         mock_service.list_all_objects(MOCK_BUCKET)
 
 
+def test_iterate_object_pages_yields_only_requested_fields(
+    mock_service, mock_client, mock_list_objects_paginate
+):
+    mock_list_objects_paginate.return_value = MOCK_LIST_OBJECTS_PAGINATED_RESPONSES
+
+    actual = list(
+        mock_service.iterate_object_pages(
+            MOCK_BUCKET, prefix=f"{TEST_NHS_NUMBER}/", fields=["Key", "Size"]
+        )
+    )
+
+    assert actual == [
+        [
+            {"Key": s3_object["Key"], "Size": s3_object["Size"]}
+            for s3_object in page["Contents"]
+        ]
+        for page in MOCK_LIST_OBJECTS_PAGINATED_RESPONSES
+    ]
+    mock_list_objects_paginate.assert_called_once_with(
+        Bucket=MOCK_BUCKET, Prefix=f"{TEST_NHS_NUMBER}/"
+    )
+
+
+def test_iterate_objects_lists_partitions_in_parallel_without_overlap(
+    mock_service, mock_client, mock_list_objects_paginate
+):
+    all_keys = ["1", "1/a", "2/a", "5/a", "5/b", "9/a", "user_upload/a"]
+
+    def mock_paginate(Bucket, StartAfter=None):
+        keys = [key for key in all_keys if StartAfter is None or key > StartAfter]
+        return iter(
+            [{"Contents": [{"Key": key, "Size": 1} for key in keys]}] if keys else []
+        )
+
+    mock_list_objects_paginate.side_effect = mock_paginate
+
+    actual = list(
+        mock_service.iterate_objects(
+            MOCK_BUCKET, fields=["Key"], partition_boundaries=["5", "2"]
+        )
+    )
+
+    assert sorted(s3_object["Key"] for s3_object in actual) == all_keys
+    mock_list_objects_paginate.assert_has_calls(
+        [
+            call(Bucket=MOCK_BUCKET),
+            call(Bucket=MOCK_BUCKET, StartAfter="2"),
+            call(Bucket=MOCK_BUCKET, StartAfter="5"),
+        ],
+        any_order=True,
+    )
+
+
+def test_iterate_objects_stops_listing_a_partition_at_its_last_key(
+    mock_service, mock_client, mock_list_objects_paginate
+):
+    unread_page = {"Contents": [{"Key": "3/a"}]}
+    first_range_pages = iter(
+        [{"Contents": [{"Key": "1/a"}, {"Key": "2/a"}]}, unread_page]
+    )
+    second_range_pages = iter([{"Contents": [{"Key": "2/a"}, {"Key": "3/a"}]}])
+    mock_list_objects_paginate.side_effect = lambda Bucket, StartAfter=None: (
+        second_range_pages if StartAfter else first_range_pages
+    )
+
+    actual = list(
+        mock_service.iterate_objects(MOCK_BUCKET, partition_boundaries=["1/z"])
+    )
+
+    assert sorted(s3_object["Key"] for s3_object in actual) == ["1/a", "2/a", "3/a"]
+    assert next(first_range_pages) == unread_page
+
+
 def test_file_size_return_int(mock_service, mock_client):
     mock_response = {
         "ResponseMetadata": {
@@ -401,6 +543,122 @@ def test_file_size_return_int(mock_service, mock_client):
     )
 
 
+def make_list_objects_page(keys: list[str], is_truncated: bool) -> dict:
+    return {
+        "Contents": [
+            {"Key": key, "Size": 100, "ETag": f'"etag-{key}"'} for key in keys
+        ],
+        "IsTruncated": is_truncated,
+    }
+
+
+def test_head_objects_returns_existence_size_and_etag_per_key(
+    mock_service, mock_client
+):
+    def mock_head_object(Bucket, Key):
+        if Key == "missing.pdf":
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"ContentLength": 3191, "ETag": f'"etag-{Key}"'}
+
+    mock_client.head_object.side_effect = mock_head_object
+
+    actual = mock_service.head_objects(
+        MOCK_BUCKET, ["file_1.pdf", "missing.pdf", "file_1.pdf"]
+    )
+
+    assert actual == {
+        "file_1.pdf": S3ObjectHead(exists=True, size=3191, etag='"etag-file_1.pdf"'),
+        "missing.pdf": S3ObjectHead(exists=False),
+    }
+    assert mock_client.head_object.call_count == 2
+    mock_client.get_paginator.assert_not_called()
+
+
+def test_head_objects_raises_client_error_if_unexpected_response(
+    mock_service, mock_client
+):
+    mock_client.head_object.side_effect = MOCK_CLIENT_ERROR
+
+    with pytest.raises(ClientError):
+        mock_service.head_objects(MOCK_BUCKET, [TEST_FILE_NAME])
+
+
+def test_head_objects_lists_shared_prefix_for_many_keys(
+    mock_service, mock_client, mock_list_objects_paginate
+):
+    mock_service.head_objects_listing_threshold = 3
+    mock_service.head_objects_keys_per_list_page = 1
+    keys = [f"{TEST_NHS_NUMBER}/{index}.pdf" for index in range(4)]
+    mock_list_objects_paginate.return_value = [
+        make_list_objects_page(keys[:2], is_truncated=True),
+        make_list_objects_page([keys[3]], is_truncated=False),
+    ]
+
+    actual = mock_service.head_objects(MOCK_BUCKET, keys)
+
+    mock_list_objects_paginate.assert_called_once_with(
+        Bucket=MOCK_BUCKET, Prefix=f"{TEST_NHS_NUMBER}/"
+    )
+    mock_client.head_object.assert_not_called()
+    assert [object_head.exists for object_head in actual.values()] == [
+        True,
+        True,
+        False,
+        True,
+    ]
+    assert actual[keys[0]] == S3ObjectHead(
+        exists=True, size=100, etag=f'"etag-{keys[0]}"'
+    )
+
+
+def test_head_objects_falls_back_to_head_object_when_listing_is_too_long(
+    mock_service, mock_client, mock_list_objects_paginate
+):
+    mock_service.head_objects_listing_threshold = 3
+    mock_service.head_objects_keys_per_list_page = 3
+    keys = [f"{TEST_NHS_NUMBER}/{index}.pdf" for index in range(3)]
+    mock_list_objects_paginate.return_value = iter(
+        [
+            make_list_objects_page([keys[0], f"{TEST_NHS_NUMBER}/00.pdf"], True),
+            make_list_objects_page([keys[1], keys[2]], False),
+        ]
+    )
+    mock_client.head_object.return_value = {"ContentLength": 5, "ETag": '"etag"'}
+
+    actual = mock_service.head_objects(MOCK_BUCKET, keys)
+
+    assert actual[keys[0]].size == 100
+    assert actual[keys[1]] == S3ObjectHead(exists=True, size=5, etag='"etag"')
+    assert actual[keys[2]] == S3ObjectHead(exists=True, size=5, etag='"etag"')
+    assert mock_client.head_object.call_count == 2
+
+
+def test_head_objects_falls_back_to_head_object_when_listing_is_denied(
+    mock_service, mock_client, mock_list_objects_paginate
+):
+    mock_service.head_objects_listing_threshold = 2
+    keys = [f"{TEST_NHS_NUMBER}/{index}.pdf" for index in range(2)]
+    mock_list_objects_paginate.side_effect = ClientError(
+        {"Error": {"Code": "AccessDenied"}}, "ListObjectsV2"
+    )
+    mock_client.head_object.return_value = {"ContentLength": 5, "ETag": '"etag"'}
+
+    actual = mock_service.head_objects(MOCK_BUCKET, keys)
+
+    assert all(object_head.exists for object_head in actual.values())
+    assert mock_client.head_object.call_count == 2
+
+
+def test_open_multipart_upload_writer_uses_transfer_profile_part_size(
+    mock_service, mock_client
+):
+    writer = mock_service.open_multipart_upload_writer(
+        MOCK_BUCKET, TEST_FILE_KEY, transfer_profile=S3TransferProfile.ZIP_ARCHIVE
+    )
+
+    assert writer.part_size == 32 * 1024 * 1024
+
+
 def test_save_or_create_file(mock_service, mock_client):
     body = TEST_FILE_KEY.encode("utf-8")
     mock_service.save_or_create_file(MOCK_BUCKET, TEST_FILE_NAME, body)
@@ -441,6 +699,7 @@ def test_upload_file_obj_success(mock_service, mock_client):
         Bucket=MOCK_BUCKET,
         Key=TEST_FILE_KEY,
         ExtraArgs=extra_args,
+        Config=mock_service.transfer_configs[S3TransferProfile.DEFAULT],
     )
 
 
@@ -459,6 +718,7 @@ def test_upload_file_obj_raises_client_error(mock_service, mock_client):
         Bucket=MOCK_BUCKET,
         Key=TEST_FILE_KEY,
         ExtraArgs={},
+        Config=mock_service.transfer_configs[S3TransferProfile.DEFAULT],
     )
 
 
@@ -485,3 +745,119 @@ def test_stream_s3_object_to_memory(mock_service, mock_client, mocker):
     result = mock_service.stream_s3_object_to_memory(MOCK_BUCKET, TEST_FILE_KEY)
 
     assert result.getvalue() == b"first-chunksecond-chunk"
+
+
+def test_stream_s3_object_to_memory_preallocates_from_content_length(
+    mock_service, mock_client
+):
+    content = b"0123456789" * 10_000
+    mock_client.get_object.return_value = {
+        "Body": BytesIO(content),
+        "ContentLength": len(content),
+    }
+
+    result = mock_service.stream_s3_object_to_memory(MOCK_BUCKET, TEST_FILE_KEY)
+
+    assert result.tell() == 0
+    assert result.getvalue() == content
+    mock_client.get_object.assert_called_once_with(
+        Bucket=MOCK_BUCKET, Key=TEST_FILE_KEY
+    )
+
+
+def test_stream_s3_object_to_memory_handles_empty_object(mock_service, mock_client):
+    mock_client.get_object.return_value = {"Body": BytesIO(b""), "ContentLength": 0}
+
+    result = mock_service.stream_s3_object_to_memory(MOCK_BUCKET, TEST_FILE_KEY)
+
+    assert result.getvalue() == b""
+
+
+def test_stream_s3_object_to_memory_uses_ranged_gets_for_large_objects(
+    mock_service, mock_client
+):
+    content = bytes(range(256)) * 40
+    mock_service.ranged_get_threshold = 1024
+    mock_service.ranged_get_part_size = 1000
+
+    def get_object(**kwargs):
+        if "Range" not in kwargs:
+            return {
+                "Body": BytesIO(content),
+                "ContentLength": len(content),
+                "ETag": '"etag"',
+            }
+        start, end = map(int, kwargs["Range"].removeprefix("bytes=").split("-"))
+        return {"Body": BytesIO(content[start : end + 1])}
+
+    mock_client.get_object.side_effect = get_object
+
+    result = mock_service.stream_s3_object_to_memory(MOCK_BUCKET, TEST_FILE_KEY)
+
+    assert result.getvalue() == content
+    ranges = sorted(
+        call.kwargs["Range"]
+        for call in mock_client.get_object.call_args_list
+        if "Range" in call.kwargs
+    )
+    assert ranges == sorted(
+        f"bytes={start}-{min(start + 1000, len(content)) - 1}"
+        for start in range(1000, len(content), 1000)
+    )
+    assert all(
+        call.kwargs["IfMatch"] == '"etag"'
+        for call in mock_client.get_object.call_args_list
+        if "Range" in call.kwargs
+    )
+
+
+def test_stream_s3_object_to_memory_reads_through_streaming_body(
+    mock_service, mock_client
+):
+    content = b"0123456789" * 10_000
+    mock_client.get_object.return_value = {
+        "Body": StreamingBody(BytesIO(content), len(content)),
+        "ContentLength": len(content),
+    }
+
+    result = mock_service.stream_s3_object_to_memory(MOCK_BUCKET, TEST_FILE_KEY)
+
+    assert result.getvalue() == content
+
+
+def test_stream_s3_object_to_memory_raises_when_streaming_body_is_truncated(
+    mock_service, mock_client
+):
+    mock_client.get_object.return_value = {
+        "Body": StreamingBody(BytesIO(b"short"), 100),
+        "ContentLength": 100,
+    }
+
+    with pytest.raises(IncompleteReadError):
+        mock_service.stream_s3_object_to_memory(MOCK_BUCKET, TEST_FILE_KEY)
+
+
+def test_stream_s3_object_to_memory_raises_when_range_length_does_not_match(
+    mock_service, mock_client
+):
+    content = bytes(range(256)) * 40
+    mock_service.ranged_get_threshold = 1024
+    mock_service.ranged_get_part_size = 1000
+
+    mock_client.get_object.side_effect = lambda **kwargs: {
+        "Body": BytesIO(content),
+        "ContentLength": len(content),
+    }
+
+    with pytest.raises(IncompleteReadError):
+        mock_service.stream_s3_object_to_memory(MOCK_BUCKET, TEST_FILE_KEY)
+
+
+def test_stream_s3_object_to_memory_raises_on_truncated_body(mock_service, mock_client):
+    mock_client.get_object.return_value = {
+        "Body": BytesIO(b"short"),
+        "ContentLength": 100,
+    }
+
+    with pytest.raises(IncompleteReadError):
+        mock_service.stream_s3_object_to_memory(MOCK_BUCKET, TEST_FILE_KEY)
@@ -5,6 +5,7 @@ from unittest.mock import call
 
 import pytest
 from botocore.exceptions import ClientError
+from enums.s3_transfer_profile import S3TransferProfile
 from enums.upload_status import UploadStatus
 from freezegun import freeze_time
 from models.staging_metadata import (
@@ -281,6 +282,7 @@ def test_download_metadata_from_s3(mock_s3_service, test_service):
         s3_bucket_name=test_service.staging_bucket_name,
         file_key=expected_file_key,
         download_path=expected_download_path,
+        transfer_profile=S3TransferProfile.REPORT,
     )
 
     assert result == expected_download_path
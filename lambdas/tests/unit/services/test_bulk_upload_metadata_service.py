@@ -4,6 +4,7 @@ from unittest.mock import call
 
 import pytest
 from botocore.exceptions import ClientError
+from enums.s3_transfer_profile import S3TransferProfile
 from freezegun import freeze_time
 
 from models.staging_metadata import METADATA_FILENAME
@@ -192,6 +193,7 @@ def test_download_metadata_from_s3(
         s3_bucket_name=MOCK_STAGING_STORE_BUCKET,
         file_key=metadata_filename,
         download_path=f"{MOCK_TEMP_FOLDER}/{metadata_filename}",
+        transfer_profile=S3TransferProfile.REPORT,
     )
     assert actual == expected
 
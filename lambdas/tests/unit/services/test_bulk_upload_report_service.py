@@ -5,6 +5,7 @@ from unittest.mock import call
 import pytest
 from boto3.dynamodb.conditions import Attr
 from enums.metadata_report import MetadataReport
+from enums.s3_transfer_profile import S3TransferProfile
 from freezegun import freeze_time
 from services.bulk_upload_report_service import BulkUploadReportService, OdsReport
 from tests.unit.conftest import (
@@ -21,10 +22,6 @@ from tests.unit.helpers.data.bulk_upload.dynamo_responses import (
     TEST_UPLOADER_ODS_2,
 )
 from tests.unit.helpers.data.bulk_upload.test_data import readfile
-from tests.unit.helpers.data.dynamo.dynamo_scan_response import (
-    MOCK_EMPTY_RESPONSE,
-    UNEXPECTED_RESPONSE,
-)
 from utils.utilities import generate_date_folder_name
 
 MOCK_END_REPORT_TIME = datetime(2012, 1, 14, 7, 0, 0, 0)
@@ -129,30 +126,22 @@ def test_get_time_for_scan_at_7am(bulk_upload_report_service):
     assert expected_end_report_time == actual_end_time
 
 
-def test_get_dynamo_data_2_calls(bulk_upload_report_service, mock_filter):
-    mock_last_key = {
-        "FilePath": "/9000000010/2of2_Lloyd_George_Record_[NAME_2]_[9000000010]_[DOB].pdf"
-    }
-    bulk_upload_report_service.db_service.scan_table.side_effect = [
-        MOCK_REPORT_RESPONSE_ALL_WITH_LAST_KEY,
-        MOCK_REPORT_RESPONSE_ALL,
-    ]
+def test_get_dynamo_data_reads_every_page(bulk_upload_report_service, mock_filter):
+    bulk_upload_report_service.db_service.iterate_scan_pages.return_value = iter(
+        [
+            MOCK_REPORT_RESPONSE_ALL_WITH_LAST_KEY["Items"],
+            MOCK_REPORT_RESPONSE_ALL["Items"],
+        ]
+    )
 
     actual = bulk_upload_report_service.get_dynamodb_report_items(
         int(MOCK_START_REPORT_TIME.timestamp()), int(MOCK_END_REPORT_TIME.timestamp())
     )
 
     assert actual == MOCK_REPORT_ITEMS_ALL * 2
-    assert bulk_upload_report_service.db_service.scan_table.call_count == 2
-    calls = [
-        call(MOCK_BULK_REPORT_TABLE_NAME, filter_expression=mock_filter),
-        call(
-            MOCK_BULK_REPORT_TABLE_NAME,
-            exclusive_start_key=mock_last_key,
-            filter_expression=mock_filter,
-        ),
-    ]
-    bulk_upload_report_service.db_service.scan_table.assert_has_calls(calls)
+    bulk_upload_report_service.db_service.iterate_scan_pages.assert_called_once_with(
+        MOCK_BULK_REPORT_TABLE_NAME, filter_expression=mock_filter
+    )
 
 
 def test_get_dynamo_data_handles_invalid_dynamo_data(
@@ -164,12 +153,12 @@ def test_get_dynamo_data_handles_invalid_dynamo_data(
         "Reason": "Lloyd George file already exists",
         "UploadStatus": "failed",
     }
-    mock_response = {"Items": [invalid_data, MOCK_REPORT_RESPONSE_ALL["Items"][1]]}
+    mock_page = [invalid_data, MOCK_REPORT_RESPONSE_ALL["Items"][1]]
     expected_message = "Failed to parse bulk update report dynamo item"
 
-    bulk_upload_report_service.db_service.scan_table.side_effect = [
-        mock_response,
-    ]
+    bulk_upload_report_service.db_service.iterate_scan_pages.return_value = iter(
+        [mock_page]
+    )
 
     actual = bulk_upload_report_service.get_dynamodb_report_items(
         int(MOCK_START_REPORT_TIME.timestamp()), int(MOCK_END_REPORT_TIME.timestamp())
@@ -179,44 +168,26 @@ def test_get_dynamo_data_handles_invalid_dynamo_data(
     assert expected_message in caplog.records[-1].msg
 
 
-def test_get_dynamo_data_with_no_start_key(bulk_upload_report_service, mock_filter):
-    bulk_upload_report_service.db_service.scan_table.side_effect = [
-        MOCK_REPORT_RESPONSE_ALL
-    ]
+def test_get_dynamo_data_with_single_page(bulk_upload_report_service, mock_filter):
+    bulk_upload_report_service.db_service.iterate_scan_pages.return_value = iter(
+        [MOCK_REPORT_RESPONSE_ALL["Items"]]
+    )
 
     actual = bulk_upload_report_service.get_dynamodb_report_items(
         int(MOCK_START_REPORT_TIME.timestamp()), int(MOCK_END_REPORT_TIME.timestamp())
     )
 
     assert actual == MOCK_REPORT_ITEMS_ALL
-    bulk_upload_report_service.db_service.scan_table.assert_called_once()
-    bulk_upload_report_service.db_service.scan_table.assert_called_with(
-        MOCK_BULK_REPORT_TABLE_NAME, filter_expression=mock_filter
-    )
 
 
 def test_get_dynamo_data_with_no_items_returns_empty_list(bulk_upload_report_service):
-    bulk_upload_report_service.db_service.scan_table.side_effect = [MOCK_EMPTY_RESPONSE]
-
-    actual = bulk_upload_report_service.get_dynamodb_report_items(
-        int(MOCK_START_REPORT_TIME.timestamp()), int(MOCK_END_REPORT_TIME.timestamp())
-    )
-
-    assert actual == []
-    bulk_upload_report_service.db_service.scan_table.assert_called_once()
-
-
-def test_get_dynamo_data_with_bad_response_returns_empty_list(
-    bulk_upload_report_service,
-):
-    bulk_upload_report_service.db_service.scan_table.side_effect = [UNEXPECTED_RESPONSE]
+    bulk_upload_report_service.db_service.iterate_scan_pages.return_value = iter([[]])
 
     actual = bulk_upload_report_service.get_dynamodb_report_items(
         int(MOCK_START_REPORT_TIME.timestamp()), int(MOCK_END_REPORT_TIME.timestamp())
     )
 
     assert actual == []
-    bulk_upload_report_service.db_service.scan_table.assert_called_once()
 
 
 def test_report_handler_no_items_returns_expected_log(
@@ -288,46 +259,55 @@ def test_report_handler_with_items_uploads_summary_report_to_bucket(
             s3_bucket_name=MOCK_STATISTICS_REPORT_BUCKET_NAME,
             file_key=f"bulk-upload-reports/2012-01-13/daily_statistical_report_bulk_upload_ods_summary_{MOCK_TIMESTAMP}_uploaded_by_Y12345.csv",
             file_name=f"/tmp/daily_statistical_report_bulk_upload_ods_summary_{MOCK_TIMESTAMP}_uploaded_by_Y12345.csv",
+            transfer_profile=S3TransferProfile.REPORT,
         ),
         call(
             s3_bucket_name=MOCK_STATISTICS_REPORT_BUCKET_NAME,
             file_key=f"bulk-upload-reports/2012-01-13/daily_statistical_report_bulk_upload_ods_summary_{MOCK_TIMESTAMP}_uploaded_by_Z12345.csv",
             file_name=f"/tmp/daily_statistical_report_bulk_upload_ods_summary_{MOCK_TIMESTAMP}_uploaded_by_Z12345.csv",
+            transfer_profile=S3TransferProfile.REPORT,
         ),
         call(
             s3_bucket_name=MOCK_STATISTICS_REPORT_BUCKET_NAME,
             file_key=f"bulk-upload-reports/2012-01-13/daily_statistical_report_bulk_upload_summary_{MOCK_TIMESTAMP}.csv",
             file_name=f"/tmp/daily_statistical_report_bulk_upload_summary_{MOCK_TIMESTAMP}.csv",
+            transfer_profile=S3TransferProfile.REPORT,
         ),
         call(
             s3_bucket_name=MOCK_STATISTICS_REPORT_BUCKET_NAME,
             file_key=f"bulk-upload-reports/2012-01-13/daily_statistical_report_entire_bulk_upload_{str(MOCK_START_REPORT_TIME)}_to_{str(MOCK_END_REPORT_TIME)}.csv",
             file_name=f"/tmp/daily_statistical_report_entire_bulk_upload_{str(MOCK_START_REPORT_TIME)}_to_{str(MOCK_END_REPORT_TIME)}.csv",
+            transfer_profile=S3TransferProfile.REPORT,
         ),
         call(
             s3_bucket_name=MOCK_STATISTICS_REPORT_BUCKET_NAME,
             file_key=f"bulk-upload-reports/2012-01-13/daily_statistical_report_bulk_upload_success_{MOCK_TIMESTAMP}.csv",
             file_name=f"/tmp/daily_statistical_report_bulk_upload_success_{MOCK_TIMESTAMP}.csv",
+            transfer_profile=S3TransferProfile.REPORT,
         ),
         call(
             s3_bucket_name=MOCK_STATISTICS_REPORT_BUCKET_NAME,
             file_key=f"bulk-upload-reports/2012-01-13/daily_statistical_report_bulk_upload_suspended_{MOCK_TIMESTAMP}.csv",
             file_name=f"/tmp/daily_statistical_report_bulk_upload_suspended_{MOCK_TIMESTAMP}.csv",
+            transfer_profile=S3TransferProfile.REPORT,
         ),
         call(
             s3_bucket_name=MOCK_STATISTICS_REPORT_BUCKET_NAME,
             file_key=f"bulk-upload-reports/2012-01-13/daily_statistical_report_bulk_upload_deceased_{MOCK_TIMESTAMP}.csv",
             file_name=f"/tmp/daily_statistical_report_bulk_upload_deceased_{MOCK_TIMESTAMP}.csv",
+            transfer_profile=S3TransferProfile.REPORT,
         ),
         call(
             s3_bucket_name=MOCK_STATISTICS_REPORT_BUCKET_NAME,
             file_key=f"bulk-upload-reports/2012-01-13/daily_statistical_report_bulk_upload_restricted_{MOCK_TIMESTAMP}.csv",
             file_name=f"/tmp/daily_statistical_report_bulk_upload_restricted_{MOCK_TIMESTAMP}.csv",
+            transfer_profile=S3TransferProfile.REPORT,
         ),
         call(
             s3_bucket_name=MOCK_STATISTICS_REPORT_BUCKET_NAME,
             file_key=f"bulk-upload-reports/2012-01-13/daily_statistical_report_bulk_upload_rejected_{MOCK_TIMESTAMP}.csv",
             file_name=f"/tmp/daily_statistical_report_bulk_upload_rejected_{MOCK_TIMESTAMP}.csv",
+            transfer_profile=S3TransferProfile.REPORT,
         ),
     ]
 
@@ -389,6 +369,7 @@ def test_generate_individual_ods_report_writes_csv_report(
         s3_bucket_name=MOCK_STATISTICS_REPORT_BUCKET_NAME,
         file_key=f"bulk-upload-reports/2012-01-13/{mock_file_name}",
         file_name=f"/tmp/{mock_file_name}",
+        transfer_profile=S3TransferProfile.REPORT,
     )
 
 
@@ -660,4 +641,5 @@ def test_write_and_upload_additional_reports_creates_csv_and_writes_to_s3(
         s3_bucket_name=MOCK_STATISTICS_REPORT_BUCKET_NAME,
         file_key=f"bulk-upload-reports/2012-01-13/{mock_file_name}",
         file_name=f"/tmp/{mock_file_name}",
+        transfer_profile=S3TransferProfile.REPORT,
     )
@@ -279,8 +279,8 @@ def set_up_mocks_for_non_ascii_files(
         make_valid_lg_file_names(total_number=3, patient_name=patient_name_on_s3)
     )
 
-    def mock_file_exist_on_s3(file_key: str) -> bool:
-        return file_key in expected_s3_file_paths
+    def mock_files_exist_on_staging_bucket(file_keys: list[str]) -> dict[str, bool]:
+        return {file_key: file_key in expected_s3_file_paths for file_key in file_keys}
 
     def mock_get_tag_value(s3_bucket_name: str, file_key: str, tag_key: str) -> str:
         if (
@@ -308,7 +308,9 @@ def set_up_mocks_for_non_ascii_files(
 
     service.s3_service.get_tag_value.side_effect = mock_get_tag_value
     service.s3_service.copy_across_bucket.side_effect = mock_copy_across_bucket
-    service.s3_service.file_exists_on_staging_bucket.side_effect = mock_file_exist_on_s3
+    service.bulk_upload_s3_repository.files_exist_on_staging_bucket.side_effect = (
+        mock_files_exist_on_staging_bucket
+    )
 
 
 @pytest.mark.parametrize(
@@ -803,14 +805,13 @@ def test_resolve_source_file_path_when_filenames_dont_have_accented_chars(
 def test_resolve_source_file_path_when_filenames_have_accented_chars(
     set_env, mocker, patient_name_on_s3, patient_name_in_metadata_file, repo_under_test
 ):
-    patient_name = "Évèlynêë François Ågāřdñ"
     expected_cache = {}
     for i in range(1, 4):
         file_path_in_metadata = (
             f"/9000000009/{i}of3_Lloyd_George_Record_"
             f"[{patient_name_in_metadata_file}]_[9000000009]_[22-10-2010].pdf"
         )
-        file_path_on_s3 = f"9000000009/{i}of3_Lloyd_George_Record_[{patient_name}]_[9000000009]_[22-10-2010].pdf"
+        file_path_on_s3 = f"9000000009/{i}of3_Lloyd_George_Record_[{patient_name_on_s3}]_[9000000009]_[22-10-2010].pdf"
         expected_cache[file_path_in_metadata] = file_path_on_s3
 
     set_up_mocks_for_non_ascii_files(repo_under_test, mocker, patient_name_on_s3)
@@ -828,10 +829,6 @@ def test_resolves_source_file_path_raise_S3FileNotFoundException_if_filename_can
 ):
     patient_name_on_s3 = "Some Name That Not Matching Metadata File"
     patient_name_in_metadata_file = NAME_WITH_ACCENT_NFC_FORM
-    repo_under_test.bulk_upload_s3_repository.file_exists_on_staging_bucket.return_value = (
-        False
-    )
-
     set_up_mocks_for_non_ascii_files(repo_under_test, mocker, patient_name_on_s3)
     test_staging_metadata = build_test_staging_metadata_from_patient_name(
         patient_name_in_metadata_file
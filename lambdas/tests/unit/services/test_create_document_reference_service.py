@@ -55,7 +55,7 @@ MOCK_ALLOWED_ODS_CODES_LIST_PILOT = {
 
 @pytest.fixture
 def mock_create_doc_ref_service(mocker, set_env):
-    mocker.patch("services.base.s3_service.IAMService")
+    mocker.patch("services.base.assumed_role_client.IAMService")
     mocker.patch("services.create_document_reference_service.S3Service")
     mocker.patch("services.create_document_reference_service.DocumentService")
     mocker.patch("services.create_document_reference_service.DynamoDBService")
@@ -3,6 +3,7 @@ from decimal import Decimal
 from random import shuffle
 from unittest.mock import call
 
+import polars as pl
 import pytest
 from freezegun import freeze_time
 from pytest_unordered import unordered
@@ -69,14 +70,14 @@ from utils.common_query_filters import UploadCompleted
 def mock_dynamo_service(mocker):
     def mock_implementation(table_name, **_kwargs):
         if table_name == MOCK_LG_TABLE_NAME:
-            return MOCK_LG_SCAN_RESULT
+            return iter([MOCK_LG_SCAN_RESULT])
         elif table_name == MOCK_ARF_TABLE_NAME:
-            return MOCK_ARF_SCAN_RESULT
+            return iter([MOCK_ARF_SCAN_RESULT])
 
     patched_instance = mocker.patch(
         "services.data_collection_service.DynamoDBService", spec=DynamoDBService
     ).return_value
-    patched_method = patched_instance.scan_whole_table
+    patched_method = patched_instance.iterate_scan_pages
     patched_method.side_effect = mock_implementation
 
     yield patched_instance
@@ -86,46 +87,56 @@ def mock_dynamo_service(mocker):
 def mock_s3_list_all_objects(mocker):
     def mock_implementation(bucket_name, **_kwargs):
         if bucket_name == MOCK_LG_BUCKET:
-            return MOCK_LG_LIST_OBJECTS_RESULT
+            return iter([MOCK_LG_LIST_OBJECTS_RESULT])
         elif bucket_name == MOCK_ARF_BUCKET:
-            return MOCK_ARF_LIST_OBJECTS_RESULT
+            return iter([MOCK_ARF_LIST_OBJECTS_RESULT])
 
     patched_instance = mocker.patch(
         "services.data_collection_service.S3Service", spec=S3Service
     ).return_value
-    patched_method = patched_instance.list_all_objects
+    patched_method = patched_instance.iterate_object_pages
     patched_method.side_effect = mock_implementation
 
     yield patched_method
 
 
+MOCK_QUERY_RESULTS = {
+    LloydGeorgeRecordsViewed: MOCK_LG_VIEWED,
+    LloydGeorgeRecordsDownloaded: MOCK_LG_DOWNLOADED,
+    LloydGeorgeRecordsDeleted: MOCK_LG_DELETED,
+    LloydGeorgeRecordsStored: MOCK_LG_STORED,
+    UniqueActiveUserIds: MOCK_UNIQUE_ACTIVE_USER_IDS,
+    LloydGeorgeRecordsSearched: MOCK_PATIENT_SEARCHED,
+    CountUsersAccessedDeceasedPatient: MOCK_DECEASED_ACCESS,
+    OdsReportsRequested: MOCK_ODS_REPORT_REQUESTED,
+    OdsReportsCreated: MOCK_ODS_REPORT_CREATED,
+}
+
+
+def with_day_for_each_day_of_week(query_result: list[dict]) -> list[dict]:
+    return [
+        {
+            **row,
+            "day": (START_DATE + timedelta(days=i)).strftime("%Y-%m-%d 00:00:00.000"),
+        }
+        for i in range(7)
+        for row in query_result
+    ]
+
+
 @pytest.fixture
 def mock_query_logs(mocker):
-    def mock_implementation(query_params: CloudwatchLogsQueryParams, **_kwargs):
-        if query_params == LloydGeorgeRecordsViewed:
-            return MOCK_LG_VIEWED
-        elif query_params == LloydGeorgeRecordsDownloaded:
-            return MOCK_LG_DOWNLOADED
-        elif query_params == LloydGeorgeRecordsDeleted:
-            return MOCK_LG_DELETED
-        elif query_params == LloydGeorgeRecordsStored:
-            return MOCK_LG_STORED
-        elif query_params == UniqueActiveUserIds:
-            return MOCK_UNIQUE_ACTIVE_USER_IDS
-        elif query_params == LloydGeorgeRecordsSearched:
-            return MOCK_PATIENT_SEARCHED
-        elif query_params == CountUsersAccessedDeceasedPatient:
-            return MOCK_DECEASED_ACCESS
-        elif query_params == OdsReportsRequested:
-            return MOCK_ODS_REPORT_REQUESTED
-        elif query_params == OdsReportsCreated:
-            return MOCK_ODS_REPORT_CREATED
+    def mock_implementation(queries: list[CloudwatchLogsQueryParams], **_kwargs):
+        return [
+            with_day_for_each_day_of_week(MOCK_QUERY_RESULTS[query_params])
+            for query_params in queries
+        ]
 
     patched_instance = mocker.patch(
         "services.data_collection_service.CloudwatchService",
         spec=CloudwatchService,
     ).return_value
-    mocked_method = patched_instance.query_logs
+    mocked_method = patched_instance.query_logs_concurrently
     mocked_method.side_effect = mock_implementation
 
     yield mocked_method
@@ -170,7 +181,17 @@ def larger_mock_data():
     shuffle(mock_dynamo_scan_result)
     shuffle(mock_s3_list_objects_result)
 
-    return mock_dynamo_scan_result, mock_s3_list_objects_result
+    return pl.DataFrame(mock_dynamo_scan_result), pl.DataFrame(
+        mock_s3_list_objects_result
+    )
+
+
+@pytest.fixture
+def mock_ods_code_metrics(mock_service):
+    return mock_service.get_metrics_by_ods_code(
+        pl.DataFrame(MOCK_ARF_SCAN_RESULT + MOCK_LG_SCAN_RESULT),
+        pl.DataFrame(MOCK_ARF_LIST_OBJECTS_RESULT + MOCK_LG_LIST_OBJECTS_RESULT),
+    )
 
 
 @freeze_time("2024-06-04T00:00:00Z")
@@ -219,7 +240,7 @@ def test_write_to_dynamodb_table(mock_dynamo_service, mock_service):
 
 
 def test_scan_dynamodb_tables(mock_dynamo_service, mock_service):
-    mock_service.scan_dynamodb_tables()
+    actual = mock_service.scan_dynamodb_tables()
 
     expected_project_expression = "CurrentGpOds,NhsNumber,FileLocation,ContentType"
     expected_filter_expression = UploadCompleted
@@ -229,46 +250,74 @@ def test_scan_dynamodb_tables(mock_dynamo_service, mock_service):
             table_name=MOCK_ARF_TABLE_NAME,
             project_expression=expected_project_expression,
             filter_expression=expected_filter_expression,
+            total_segments=mock_service.scan_total_segments,
+            max_capacity_units_per_second=None,
         ),
         call(
             table_name=MOCK_LG_TABLE_NAME,
             project_expression=expected_project_expression,
             filter_expression=expected_filter_expression,
+            total_segments=mock_service.scan_total_segments,
+            max_capacity_units_per_second=None,
         ),
     ]
-    mock_dynamo_service.scan_whole_table.assert_has_calls(expected_calls)
+    mock_dynamo_service.iterate_scan_pages.assert_has_calls(expected_calls)
+    assert actual.to_dicts() == unordered(MOCK_ARF_SCAN_RESULT + MOCK_LG_SCAN_RESULT)
+
+
+def test_scan_dynamodb_tables_returns_empty_frame_when_tables_are_empty(
+    mock_dynamo_service, mock_service
+):
+    mock_dynamo_service.iterate_scan_pages.side_effect = lambda **_kwargs: iter([])
+
+    actual = mock_service.scan_dynamodb_tables()
+
+    assert actual.is_empty()
+    assert actual.columns == [
+        "CurrentGpOds",
+        "NhsNumber",
+        "FileLocation",
+        "ContentType",
+    ]
 
 
 def test_get_all_s3_files_info(mock_s3_list_all_objects, mock_service):
-    mock_service.get_all_s3_files_info()
+    actual = mock_service.get_all_s3_files_info()
 
     expected_calls = [
-        call(MOCK_ARF_BUCKET),
-        call(MOCK_LG_BUCKET),
+        call(
+            MOCK_ARF_BUCKET,
+            fields=["Key", "Size"],
+            partition_boundaries=list("123456789"),
+        ),
+        call(
+            MOCK_LG_BUCKET,
+            fields=["Key", "Size"],
+            partition_boundaries=list("123456789"),
+        ),
     ]
 
-    mock_s3_list_all_objects.assert_has_calls(expected_calls)
+    mock_s3_list_all_objects.assert_has_calls(expected_calls, any_order=True)
+    assert actual.sort("Key").to_dicts() == sorted(
+        MOCK_ARF_LIST_OBJECTS_RESULT + MOCK_LG_LIST_OBJECTS_RESULT,
+        key=lambda s3_object: s3_object["Key"],
+    )
 
 
-def test_get_record_store_data(mock_uuid, mock_service):
+def test_get_record_store_data(mock_uuid, mock_service, mock_ods_code_metrics):
     mock_service.today_date = START_DATE_STR
 
-    mock_dynamo_scan_result = MOCK_ARF_SCAN_RESULT + MOCK_LG_SCAN_RESULT
-    s3_list_objects_result = MOCK_ARF_LIST_OBJECTS_RESULT + MOCK_LG_LIST_OBJECTS_RESULT
-
-    actual = mock_service.get_record_store_data(
-        mock_dynamo_scan_result, s3_list_objects_result
-    )
+    actual = mock_service.get_record_store_data(mock_ods_code_metrics)
     expected = unordered(MOCK_RECORD_STORE_DATA)
 
     assert actual == expected
 
 
-def test_get_organisation_data(mock_uuid, mock_service):
-    mock_dynamo_scan_result = MOCK_ARF_SCAN_RESULT + MOCK_LG_SCAN_RESULT
-
+def test_get_organisation_data(mock_uuid, mock_service, mock_ods_code_metrics):
     actual = mock_service.get_organisation_data(
-        mock_dynamo_scan_result, start_date=START_DATE, end_date=END_DATE
+        mock_ods_code_metrics,
+        date=START_DATE_STR,
+        daily_query_results=MOCK_QUERY_RESULTS,
     )
     expected = unordered(MOCK_ORGANISATION_DATA)
 
@@ -276,15 +325,15 @@ def test_get_organisation_data(mock_uuid, mock_service):
 
 
 def test_get_application_data(mock_uuid, mock_service):
-    actual = mock_service.get_application_data(start_date=START_DATE, end_date=END_DATE)
+    actual = mock_service.get_application_data(
+        date=START_DATE_STR, daily_query_results=MOCK_QUERY_RESULTS
+    )
     expected = unordered(MOCK_APPLICATION_DATA)
 
     assert actual == expected
 
 
-def test_get_active_user_list(set_env, mock_query_logs):
-    mock_query_logs.return_value = MOCK_UNIQUE_ACTIVE_USER_IDS
-    service = DataCollectionService()
+def test_get_active_user_list():
     expected = {
         "H81109": [
             HASHED_USER_ID_1_WITH_ADMIN_ROLE,
@@ -292,180 +341,143 @@ def test_get_active_user_list(set_env, mock_query_logs):
         ],
         "Y12345": [HASHED_USER_ID_1_WITH_PCSE_ROLE],
     }
-    actual = service.get_active_user_list(start_date=START_DATE, end_date=END_DATE)
+    actual = DataCollectionService.get_active_user_list(MOCK_UNIQUE_ACTIVE_USER_IDS)
 
     assert actual == expected
 
 
-def test_get_cloud_watch_query_result(set_env, mock_query_logs):
-    mock_query_param = CloudwatchLogsQueryParams("mock", "test")
-    service = DataCollectionService()
-
-    service.get_cloud_watch_query_result(mock_query_param, START_DATE, END_DATE)
+def test_get_cloud_watch_query_results_by_day_runs_each_query_once_for_the_week(
+    mock_service, mock_query_logs
+):
+    actual = mock_service.get_cloud_watch_query_results_by_day(START_DATE, END_DATE)
 
-    mock_query_logs.assert_called_with(
-        query_params=mock_query_param,
+    mock_query_logs.assert_called_once_with(
+        unordered(list(MOCK_QUERY_RESULTS)),
         start_time=int(START_DATE.timestamp()),
         end_time=int(END_DATE.timestamp()),
     )
+    assert set(actual) == set(MOCK_QUERY_RESULTS)
+    for query_params, results_by_day in actual.items():
+        assert len(results_by_day) == 7
+        assert results_by_day[START_DATE_STR] == MOCK_QUERY_RESULTS[query_params]
 
 
-def test_get_total_number_of_records(mock_service):
-    actual = mock_service.get_total_number_of_records(
-        MOCK_ARF_SCAN_RESULT + MOCK_LG_SCAN_RESULT
-    )
-    expected = [
-        {"ods_code": "Y12345", "total_number_of_records": 2},
-        {"ods_code": "H81109", "total_number_of_records": 6},
+def test_group_query_result_by_day():
+    query_result = [
+        {"day": "2024-05-28 00:00:00.000", "ods_code": "Y12345", "count": "1"},
+        {"day": "2024-05-29 00:00:00.000", "ods_code": "Y12345", "count": "2"},
+        {"day": "2024-05-28 00:00:00.000", "ods_code": "H81109", "count": "3"},
     ]
+    expected = {
+        "20240528": [
+            {"ods_code": "Y12345", "count": "1"},
+            {"ods_code": "H81109", "count": "3"},
+        ],
+        "20240529": [{"ods_code": "Y12345", "count": "2"}],
+    }
 
-    assert actual == expected
-
-
-def test_get_total_number_of_records_larger_mock_data(mock_service, larger_mock_data):
-    mock_dynamo_scan_result, _ = larger_mock_data
-
-    actual = mock_service.get_total_number_of_records(mock_dynamo_scan_result)
-    expected = unordered(
-        [
-            {"ods_code": "H81109", "total_number_of_records": 135 + 246 + 369},
-            {"ods_code": "Y12345", "total_number_of_records": 4812 + 5101},
-        ]
-    )
-
-    assert actual == expected
-
-
-def test_get_number_of_patients(mock_service):
-    actual = mock_service.get_number_of_patients(
-        MOCK_ARF_SCAN_RESULT + MOCK_LG_SCAN_RESULT
-    )
-    expected = unordered(
-        [
-            {"ods_code": "Y12345", "number_of_patients": 1},
-            {"ods_code": "H81109", "number_of_patients": 2},
-        ]
-    )
+    actual = DataCollectionService.group_query_result_by_day(query_result)
 
     assert actual == expected
 
 
-def test_get_metrics_for_total_and_average_file_sizes(mock_service):
-    mock_dynamo_scan_result = MOCK_ARF_SCAN_RESULT + MOCK_LG_SCAN_RESULT
-    mock_s3_list_objects_result = (
-        MOCK_ARF_LIST_OBJECTS_RESULT + MOCK_LG_LIST_OBJECTS_RESULT
-    )
-
-    actual = mock_service.get_metrics_for_total_and_average_file_sizes(
-        mock_dynamo_scan_result, mock_s3_list_objects_result
-    )
-
+def test_get_metrics_by_ods_code(mock_service, mock_ods_code_metrics):
     expected = unordered(
         [
             {
                 "ods_code": "H81109",
+                "total_number_of_records": 6,
+                "number_of_patients": 2,
+                "average_records_per_patient": 3,
+                "total_size_of_records_in_megabytes": TOTAL_FILE_SIZE_FOR_H81109,
                 "average_size_of_documents_per_patient_in_megabytes": TOTAL_FILE_SIZE_FOR_H81109
                 / 2,
-                "total_size_of_records_in_megabytes": TOTAL_FILE_SIZE_FOR_H81109,
+                "number_of_document_types": 2,
             },
             {
                 "ods_code": "Y12345",
-                "average_size_of_documents_per_patient_in_megabytes": TOTAL_FILE_SIZE_FOR_Y12345,
+                "total_number_of_records": 2,
+                "number_of_patients": 1,
+                "average_records_per_patient": 2,
                 "total_size_of_records_in_megabytes": TOTAL_FILE_SIZE_FOR_Y12345,
+                "average_size_of_documents_per_patient_in_megabytes": TOTAL_FILE_SIZE_FOR_Y12345,
+                "number_of_document_types": 2,
             },
         ]
     )
 
-    assert actual == expected
+    assert mock_ods_code_metrics.to_dicts() == expected
 
 
-def test_get_metrics_for_total_and_average_file_sizes_larger_mock_data(
-    mock_service, larger_mock_data
-):
+def test_get_metrics_by_ods_code_counts_document_types_per_ods_code(mock_service):
+    actual = mock_service.get_metrics_by_ods_code(
+        pl.DataFrame(MOCK_ARF_SCAN_RESULT),
+        pl.DataFrame(MOCK_ARF_LIST_OBJECTS_RESULT),
+    )
+    expected = unordered(
+        [
+            {"ods_code": "Y12345", "number_of_document_types": 2},
+            {"ods_code": "H81109", "number_of_document_types": 1},
+        ]
+    )
+
+    assert actual.select("ods_code", "number_of_document_types").to_dicts() == expected
+
+
+def test_get_metrics_by_ods_code_larger_mock_data(mock_service, larger_mock_data):
     mock_dynamo_scan_result, mock_s3_list_objects_result = larger_mock_data
-    actual = mock_service.get_metrics_for_total_and_average_file_sizes(
+
+    actual = mock_service.get_metrics_by_ods_code(
         mock_dynamo_scan_result, mock_s3_list_objects_result
     )
-
     expected = unordered(
         [
             {
                 "ods_code": "H81109",
+                "total_number_of_records": 135 + 246 + 369,
+                "number_of_patients": 3,
+                "average_records_per_patient": Decimal(135 + 246 + 369) / 3,
+                "total_size_of_records_in_megabytes": (123 + 456 + 789),
                 "average_size_of_documents_per_patient_in_megabytes": (123 + 456 + 789)
                 / 3,
-                "total_size_of_records_in_megabytes": (123 + 456 + 789),
+                "number_of_document_types": 1,
             },
             {
                 "ods_code": "Y12345",
-                "average_size_of_documents_per_patient_in_megabytes": (9876 + 5432) / 2,
+                "total_number_of_records": 4812 + 5101,
+                "number_of_patients": 2,
+                "average_records_per_patient": Decimal(4812 + 5101) / 2,
                 "total_size_of_records_in_megabytes": (9876 + 5432),
+                "average_size_of_documents_per_patient_in_megabytes": (9876 + 5432) / 2,
+                "number_of_document_types": 1,
             },
         ]
     )
 
-    assert actual == expected
+    assert actual.to_dicts() == expected
 
 
-def test_get_number_of_document_types(mock_service):
-    actual = mock_service.get_number_of_document_types(MOCK_ARF_SCAN_RESULT)
-    expected = unordered(
-        [
-            {"ods_code": "Y12345", "number_of_document_types": 2},
-            {"ods_code": "H81109", "number_of_document_types": 1},
-        ]
-    )
-
-    assert actual == expected
-
-    actual = mock_service.get_number_of_document_types(
-        MOCK_ARF_SCAN_RESULT + MOCK_LG_SCAN_RESULT
-    )
-    expected = unordered(
-        [
-            {"ods_code": "Y12345", "number_of_document_types": 2},
-            {"ods_code": "H81109", "number_of_document_types": 2},
-        ]
+def test_get_metrics_by_ods_code_counts_missing_s3_objects_as_zero_size(
+    mock_service,
+):
+    actual = mock_service.get_metrics_by_ods_code(
+        pl.DataFrame(MOCK_LG_SCAN_RESULT),
+        pl.DataFrame(MOCK_LG_LIST_OBJECTS_RESULT[:3]),
     )
 
-    assert actual == expected
+    assert actual.row(0, named=True)["total_size_of_records_in_megabytes"] == 1 + 2 + 3
 
 
-def test_get_average_number_of_file_per_patient(mock_service):
-    actual = mock_service.get_average_number_of_files_per_patient(
-        MOCK_ARF_SCAN_RESULT + MOCK_LG_SCAN_RESULT
-    )
-    expected = unordered(
-        [
-            {"ods_code": "Y12345", "average_records_per_patient": 2},
-            {"ods_code": "H81109", "average_records_per_patient": 3},
-        ]
-    )
+def test_get_metrics_by_ods_code_returns_empty_frame_for_empty_scan(mock_service):
+    mock_dynamo_service = mock_service.dynamodb_service
+    mock_dynamo_service.iterate_scan_pages.side_effect = lambda **_kwargs: iter([])
 
-    assert actual == expected
-
-
-def test_get_average_number_of_file_per_patient_larger_mock_data(
-    mock_service, larger_mock_data
-):
-    mock_dynamo_scan_result, _ = larger_mock_data
-
-    actual = mock_service.get_average_number_of_files_per_patient(
-        mock_dynamo_scan_result
-    )
-    expected = unordered(
-        [
-            {
-                "ods_code": "H81109",
-                "average_records_per_patient": Decimal(135 + 246 + 369) / 3,
-            },
-            {
-                "ods_code": "Y12345",
-                "average_records_per_patient": Decimal(4812 + 5101) / 2,
-            },
-        ]
+    actual = mock_service.get_metrics_by_ods_code(
+        mock_service.scan_dynamodb_tables(), mock_service.get_all_s3_files_info()
     )
 
-    assert actual == expected
+    assert actual.is_empty()
+    assert mock_service.get_record_store_data(actual) == []
 
 
 def test_generate_daily_ranges(mock_service):
@@ -1,6 +1,7 @@
 from unittest.mock import call
 
 import pytest
+from botocore.exceptions import ClientError
 from enums.dynamo_filter import AttributeOperator
 from enums.lambda_error import LambdaError
 from enums.supported_document_types import SupportedDocumentTypes
@@ -553,7 +554,13 @@ def test_write_zip_trace_valid(manifest_service, mock_dynamo_service, mock_uuid)
 
     mock_dynamo_service.create_item.assert_called_with(
         MOCK_ZIP_TRACE_TABLE,
-        TEST_ZIP_TRACE_DATA,
+        {
+            **TEST_ZIP_TRACE_DATA,
+            "DocumentSetFingerprint": manifest_service.create_document_set_fingerprint(
+                TEST_NHS_NUMBER
+            ),
+            "ExpireAt": 1704153600,
+        },
     )
 
     assert expected == actual
@@ -709,3 +716,163 @@ def test_query_zip_trace_empty_response_object_raises_exception(
     assert e.value == DocumentManifestJobServiceException(
         404, LambdaError.ManifestMissingJob
     )
+
+
+def test_create_document_set_fingerprint_ignores_document_order(manifest_service):
+    manifest_service.documents = create_test_lloyd_george_doc_store_refs()
+    fingerprint = manifest_service.create_document_set_fingerprint(TEST_NHS_NUMBER)
+
+    manifest_service.documents = list(reversed(manifest_service.documents))
+
+    assert (
+        manifest_service.create_document_set_fingerprint(TEST_NHS_NUMBER) == fingerprint
+    )
+
+
+def test_create_document_set_fingerprint_changes_with_document_version(
+    manifest_service,
+):
+    manifest_service.documents = create_test_lloyd_george_doc_store_refs()
+    fingerprint = manifest_service.create_document_set_fingerprint(TEST_NHS_NUMBER)
+
+    manifest_service.documents[0].version = "2"
+
+    assert (
+        manifest_service.create_document_set_fingerprint(TEST_NHS_NUMBER) != fingerprint
+    )
+
+
+@freeze_time("2024-01-01T12:00:00Z")
+def test_find_reusable_manifest_job_returns_latest_completed_job(
+    manifest_service, mock_dynamo_service, mock_s3_service
+):
+    older_trace = {
+        **TEST_ZIP_TRACE_DATA,
+        "JobId": "older-job",
+        "JobStatus": TraceStatus.COMPLETED,
+        "ZipFileLocation": TEST_DOCUMENT_LOCATION,
+        "Created": "2024-01-01T10:00:00Z",
+    }
+    newer_trace = {
+        **older_trace,
+        "JobId": "newer-job",
+        "Created": "2024-01-01T11:00:00Z",
+    }
+    mock_dynamo_service.query_table_by_index.return_value = {
+        "Items": [older_trace, newer_trace]
+    }
+    mock_s3_service.file_exist_on_s3.return_value = True
+
+    actual = manifest_service.find_reusable_manifest_job(TEST_NHS_NUMBER)
+
+    assert actual == "newer-job"
+    query_args = mock_dynamo_service.query_table_by_index.call_args.kwargs
+    assert query_args["index_name"] == "DocumentSetFingerprintIndex"
+    assert query_args["search_condition"] == (
+        manifest_service.create_document_set_fingerprint(TEST_NHS_NUMBER)
+    )
+
+
+def test_find_reusable_manifest_job_skips_completed_job_with_missing_archive(
+    manifest_service, mock_dynamo_service, mock_s3_service
+):
+    mock_dynamo_service.query_table_by_index.return_value = {
+        "Items": [
+            {
+                **TEST_ZIP_TRACE_DATA,
+                "JobStatus": TraceStatus.COMPLETED,
+                "ZipFileLocation": TEST_DOCUMENT_LOCATION,
+            }
+        ]
+    }
+    mock_s3_service.file_exist_on_s3.return_value = False
+
+    assert manifest_service.find_reusable_manifest_job(TEST_NHS_NUMBER) is None
+
+
+@freeze_time("2024-01-01T12:10:00Z")
+@pytest.mark.parametrize("job_status", [TraceStatus.PENDING, TraceStatus.PROCESSING])
+def test_find_reusable_manifest_job_reuses_recent_in_progress_job(
+    manifest_service, mock_dynamo_service, mock_s3_service, job_status
+):
+    mock_dynamo_service.query_table_by_index.return_value = {
+        "Items": [{**TEST_ZIP_TRACE_DATA, "JobStatus": job_status}]
+    }
+
+    actual = manifest_service.find_reusable_manifest_job(TEST_NHS_NUMBER)
+
+    assert actual == TEST_UUID
+    mock_s3_service.file_exist_on_s3.assert_not_called()
+
+
+@freeze_time("2024-01-01T12:20:00Z")
+@pytest.mark.parametrize("job_status", [TraceStatus.PENDING, TraceStatus.PROCESSING])
+def test_find_reusable_manifest_job_skips_stale_in_progress_job(
+    manifest_service, mock_dynamo_service, mock_s3_service, job_status
+):
+    mock_dynamo_service.query_table_by_index.return_value = {
+        "Items": [{**TEST_ZIP_TRACE_DATA, "JobStatus": job_status}]
+    }
+
+    assert manifest_service.find_reusable_manifest_job(TEST_NHS_NUMBER) is None
+    mock_s3_service.file_exist_on_s3.assert_not_called()
+
+
+@freeze_time("2024-01-01T12:20:00Z")
+def test_find_reusable_manifest_job_prefers_completed_job_over_stale_in_progress_job(
+    manifest_service, mock_dynamo_service, mock_s3_service
+):
+    mock_dynamo_service.query_table_by_index.return_value = {
+        "Items": [
+            {
+                **TEST_ZIP_TRACE_DATA,
+                "JobId": "stale-job",
+                "JobStatus": TraceStatus.PROCESSING,
+                "Created": "2024-01-01T12:00:00Z",
+            },
+            {
+                **TEST_ZIP_TRACE_DATA,
+                "JobId": "completed-job",
+                "JobStatus": TraceStatus.COMPLETED,
+                "ZipFileLocation": TEST_DOCUMENT_LOCATION,
+                "Created": "2024-01-01T11:00:00Z",
+            },
+        ]
+    }
+    mock_s3_service.file_exist_on_s3.return_value = True
+
+    actual = manifest_service.find_reusable_manifest_job(TEST_NHS_NUMBER)
+
+    assert actual == "completed-job"
+
+
+def test_find_reusable_manifest_job_returns_none_on_client_error(
+    manifest_service, mock_dynamo_service
+):
+    mock_dynamo_service.query_table_by_index.side_effect = ClientError(
+        {"Error": {"Code": "ValidationException", "Message": "missing index"}},
+        "Query",
+    )
+
+    assert manifest_service.find_reusable_manifest_job(TEST_NHS_NUMBER) is None
+
+
+def test_create_document_manifest_job_returns_reusable_job(
+    manifest_service,
+    mock_document_service,
+    mock_write_zip_trace,
+    mocker,
+):
+    mock_document_service.fetch_available_document_references_by_type.return_value = (
+        TEST_DOC_STORE_DOCUMENT_REFS
+    )
+    mocker.patch.object(
+        manifest_service, "find_reusable_manifest_job", return_value="existing-job"
+    )
+
+    actual = manifest_service.create_document_manifest_job(
+        nhs_number=TEST_NHS_NUMBER, doc_types=[SupportedDocumentTypes.ARF]
+    )
+
+    assert actual == "existing-job"
+    mock_write_zip_trace.assert_not_called()
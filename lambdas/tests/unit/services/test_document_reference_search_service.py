@@ -1,6 +1,8 @@
 import json
+import time
 from json import JSONDecodeError
 from unittest.mock import MagicMock, call
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 from boto3.dynamodb.conditions import Attr
@@ -12,6 +14,7 @@ from enums.snomed_codes import SnomedCodes
 from freezegun import freeze_time
 from models.document_reference import DocumentReference
 from pydantic import ValidationError
+from services.base.s3_service import MISSING_OBJECT, S3ObjectHead
 from services.document_reference_search_service import DocumentReferenceSearchService
 from tests.unit.conftest import APIM_API_URL
 from tests.unit.helpers.data.dynamo.dynamo_responses import MOCK_SEARCH_RESPONSE
@@ -39,6 +42,10 @@ def mock_document_service(mocker, set_env):
     service = DocumentReferenceSearchService()
     mock_s3_service = mocker.patch.object(service, "s3_service")
     mocker.patch.object(mock_s3_service, "get_file_size", return_value=MOCK_FILE_SIZE)
+    mock_s3_service.head_objects.side_effect = lambda **kwargs: {
+        file_key: S3ObjectHead(exists=True, size=MOCK_FILE_SIZE)
+        for file_key in kwargs["file_keys"]
+    }
     mocker.patch.object(service, "dynamo_service")
     mocker.patch.object(service, "fetch_documents_from_table_with_nhs_number")
     mocker.patch.object(service, "is_upload_in_process", return_value=False)
@@ -135,6 +142,9 @@ def test_get_document_references_dynamo_return_successful_response_single_table(
 
 def test_build_document_model_response(mock_document_service, monkeypatch):
     expected_results = [EXPECTED_RESPONSE]
+    mock_document_service._populate_missing_file_sizes(
+        MOCK_DOCUMENT_REFERENCE, "table1"
+    )
     actual = mock_document_service._process_documents(MOCK_DOCUMENT_REFERENCE, False)
 
     assert actual == expected_results
@@ -199,7 +209,9 @@ def test_get_document_references_exception(mock_document_service, mocker):
 
 
 def test_search_tables_for_documents_non_fhir(mock_document_service, mocker):
-    mock_fetch_document_method = mocker.MagicMock(return_value=MOCK_DOCUMENT_REFERENCE)
+    mock_fetch_document_method = mocker.MagicMock(
+        return_value=MOCK_SEARCH_RESPONSE["Items"][:1]
+    )
     mock_document_service.fetch_documents_from_table_with_nhs_number = (
         mock_fetch_document_method
     )
@@ -227,8 +239,18 @@ def test_search_tables_for_documents_non_fhir(mock_document_service, mocker):
 
     mock_fetch_document_method.assert_has_calls(
         [
-            call("1234567890", "table1", query_filter=UploadCompleted),
-            call("1234567890", "table2", query_filter=UploadCompleted),
+            call(
+                "1234567890",
+                "table1",
+                query_filter=UploadCompleted,
+                projection=DocumentReferenceSearchService.SEARCH_RESULT_FIELDS,
+            ),
+            call(
+                "1234567890",
+                "table2",
+                query_filter=UploadCompleted,
+                projection=DocumentReferenceSearchService.SEARCH_RESULT_FIELDS,
+            ),
         ]
     )
 
@@ -486,3 +508,336 @@ def test_build_filter_expression_defaults(mock_document_service):
     actual_filter = mock_document_service._build_filter_expression(filter_values)
 
     assert actual_filter == expected_filter
+
+
+def test_search_tables_for_documents_merges_results_in_table_order(
+    mock_document_service, mocker
+):
+    def fetch_documents(nhs_number, table_name, query_filter=None, projection=None):
+        if table_name == "table1":
+            time.sleep(0.05)
+        return [table_name]
+
+    mock_document_service.fetch_documents_from_table_with_nhs_number = mocker.MagicMock(
+        side_effect=fetch_documents
+    )
+    mock_document_service._process_documents = mocker.MagicMock(
+        side_effect=lambda documents, return_fhir: [{"table": documents[0]}]
+    )
+    mocker.patch.object(mock_document_service, "_populate_missing_file_sizes")
+    mocker.patch.object(
+        mock_document_service,
+        "validate_document_items",
+        side_effect=lambda items: items,
+    )
+
+    actual = mock_document_service._search_tables_for_documents(
+        "1234567890", ["table1", "table2", "table3"], return_fhir=False
+    )
+
+    assert actual == [{"table": "table1"}, {"table": "table2"}, {"table": "table3"}]
+
+
+def test_search_tables_for_documents_raises_error_from_any_table(
+    mock_document_service, mocker
+):
+    mock_document_service.fetch_documents_from_table_with_nhs_number = mocker.MagicMock(
+        return_value=MOCK_DOCUMENT_REFERENCE
+    )
+    mock_document_service._validate_upload_status = mocker.MagicMock(
+        side_effect=[
+            None,
+            DocumentRefSearchException(423, LambdaError.UploadInProgressError),
+        ]
+    )
+    mock_document_service._process_documents = mocker.MagicMock(
+        return_value=[EXPECTED_RESPONSE]
+    )
+
+    with pytest.raises(DocumentRefSearchException) as exc_info:
+        mock_document_service._search_tables_for_documents(
+            "1234567890",
+            ["table1", "table2"],
+            return_fhir=False,
+            check_upload_completed=True,
+        )
+
+    assert exc_info.value.status_code == 423
+
+
+def test_populate_missing_file_sizes_looks_up_and_stores_missing_sizes(
+    mock_document_service, mocker
+):
+    documents = [
+        document.model_copy(update={"id": document_id, "file_size": file_size})
+        for document in MOCK_DOCUMENT_REFERENCE
+        for document_id, file_size in [("doc-1", None), ("doc-2", 100), ("doc-3", None)]
+    ]
+    mock_update = mocker.patch.object(
+        mock_document_service, "update_document_file_size"
+    )
+
+    mock_document_service._populate_missing_file_sizes(documents, "table1")
+
+    assert [document.file_size for document in documents] == [
+        MOCK_FILE_SIZE,
+        100,
+        MOCK_FILE_SIZE,
+    ]
+    mock_document_service.s3_service.head_objects.assert_called_once_with(
+        s3_bucket_name=documents[0].s3_bucket_name,
+        file_keys=[documents[0].s3_file_key, documents[2].s3_file_key],
+        max_workers=2,
+    )
+    mock_update.assert_has_calls(
+        [call("table1", documents[0]), call("table1", documents[2])], any_order=True
+    )
+    assert mock_update.call_count == 2
+
+
+def test_populate_missing_file_sizes_skips_documents_being_uploaded(
+    mock_document_service, mocker
+):
+    documents = [
+        document.model_copy(update={"file_size": None})
+        for document in MOCK_DOCUMENT_REFERENCE
+    ]
+    mock_document_service.is_upload_in_process.return_value = True
+    mock_update = mocker.patch.object(
+        mock_document_service, "update_document_file_size"
+    )
+
+    mock_document_service._populate_missing_file_sizes(documents, "table1")
+
+    mock_document_service.s3_service.head_objects.assert_not_called()
+    mock_update.assert_not_called()
+
+
+def test_populate_missing_file_sizes_ignores_failed_write_back(
+    mock_document_service, mocker
+):
+    documents = [
+        document.model_copy(update={"file_size": None})
+        for document in MOCK_DOCUMENT_REFERENCE
+    ]
+    mocker.patch.object(
+        mock_document_service,
+        "update_document_file_size",
+        side_effect=ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+        ),
+    )
+
+    mock_document_service._populate_missing_file_sizes(documents, "table1")
+
+    assert documents[0].file_size == MOCK_FILE_SIZE
+
+
+def test_populate_missing_file_sizes_leaves_size_unset_for_missing_objects(
+    mock_document_service, mocker
+):
+    documents = [
+        document.model_copy(update={"file_size": None})
+        for document in MOCK_DOCUMENT_REFERENCE
+    ]
+    mock_document_service.s3_service.head_objects.side_effect = lambda **kwargs: {
+        file_key: MISSING_OBJECT for file_key in kwargs["file_keys"]
+    }
+    mock_update = mocker.patch.object(
+        mock_document_service, "update_document_file_size"
+    )
+
+    mock_document_service._populate_missing_file_sizes(documents, "table1")
+
+    assert documents[0].file_size is None
+    mock_update.assert_not_called()
+    mock_document_service.s3_service.get_file_size.assert_not_called()
+
+
+def test_get_paginated_document_references_fills_page_across_tables(
+    mock_document_service, mocker, set_env
+):
+    mocker.patch.object(
+        mock_document_service, "_get_table_names", return_value=["table1", "table2"]
+    )
+    mock_document_service.dynamo_service.query_table_by_index.side_effect = [
+        {"Items": MOCK_SEARCH_RESPONSE["Items"][:1]},
+        {
+            "Items": MOCK_SEARCH_RESPONSE["Items"][1:3],
+            "LastEvaluatedKey": {
+                "ID": MOCK_SEARCH_RESPONSE["Items"][2]["ID"],
+                "NhsNumber": "9000000009",
+            },
+        },
+    ]
+    mock_document_service._process_documents = mocker.MagicMock(
+        side_effect=lambda documents, return_fhir: [
+            {"id": document.id} for document in documents
+        ]
+    )
+
+    result = mock_document_service.get_paginated_document_references(
+        "9000000009",
+        page_size=2,
+        search_parameters={"_count": "2"},
+    )
+
+    assert len(result["entry"]) == 2
+    assert "total" not in result
+    query_calls = (
+        mock_document_service.dynamo_service.query_table_by_index.call_args_list
+    )
+    assert query_calls[0].kwargs["table_name"] == "table1"
+    assert query_calls[0].kwargs["limit"] == 3
+    assert query_calls[1].kwargs["table_name"] == "table2"
+    assert query_calls[1].kwargs["limit"] == 2
+
+    links = {link["relation"]: link["url"] for link in result["link"]}
+    assert links["self"] == f"{APIM_API_URL}/DocumentReference?_count=2"
+    next_token = parse_qs(urlparse(links["next"]).query)["next-page-token"][0]
+    assert mock_document_service._decode_page_token(next_token, "9000000009", 2) == (
+        1,
+        {"ID": MOCK_SEARCH_RESPONSE["Items"][1]["ID"], "NhsNumber": "9000000009"},
+    )
+
+
+def test_get_paginated_document_references_omits_next_link_when_nothing_remains(
+    mock_document_service, mocker, set_env
+):
+    mocker.patch.object(
+        mock_document_service, "_get_table_names", return_value=["table1", "table2"]
+    )
+    mock_document_service.dynamo_service.query_table_by_index.side_effect = [
+        {"Items": MOCK_SEARCH_RESPONSE["Items"][:2]},
+        {"Items": []},
+    ]
+    mock_document_service._process_documents = mocker.MagicMock(
+        side_effect=lambda documents, return_fhir: [
+            {"id": document.id} for document in documents
+        ]
+    )
+
+    result = mock_document_service.get_paginated_document_references(
+        "9000000009", page_size=2, search_parameters={"_count": "2"}
+    )
+
+    assert len(result["entry"]) == 2
+    assert [link["relation"] for link in result["link"]] == ["self"]
+    query_calls = (
+        mock_document_service.dynamo_service.query_table_by_index.call_args_list
+    )
+    assert [query_call.kwargs["limit"] for query_call in query_calls] == [3, 1]
+
+
+def test_get_paginated_document_references_links_next_table_when_it_has_results(
+    mock_document_service, mocker, set_env
+):
+    mocker.patch.object(
+        mock_document_service, "_get_table_names", return_value=["table1", "table2"]
+    )
+    mock_document_service.dynamo_service.query_table_by_index.side_effect = [
+        {"Items": MOCK_SEARCH_RESPONSE["Items"][:2]},
+        {
+            "Items": MOCK_SEARCH_RESPONSE["Items"][2:3],
+            "LastEvaluatedKey": {
+                "ID": MOCK_SEARCH_RESPONSE["Items"][2]["ID"],
+                "NhsNumber": "9000000009",
+            },
+        },
+    ]
+    mock_document_service._process_documents = mocker.MagicMock(
+        side_effect=lambda documents, return_fhir: [
+            {"id": document.id} for document in documents
+        ]
+    )
+
+    result = mock_document_service.get_paginated_document_references(
+        "9000000009", page_size=2, search_parameters={"_count": "2"}
+    )
+
+    assert len(result["entry"]) == 2
+    links = {link["relation"]: link["url"] for link in result["link"]}
+    next_token = parse_qs(urlparse(links["next"]).query)["next-page-token"][0]
+    assert mock_document_service._decode_page_token(next_token, "9000000009", 2) == (
+        1,
+        None,
+    )
+
+
+def test_get_paginated_document_references_resumes_from_token(
+    mock_document_service, mocker, set_env
+):
+    mocker.patch.object(
+        mock_document_service, "_get_table_names", return_value=["table1", "table2"]
+    )
+    start_key = {"ID": "doc-2", "NhsNumber": "9000000009"}
+    token = mock_document_service._encode_page_token(1, start_key)
+    mock_document_service.dynamo_service.query_table_by_index.return_value = {
+        "Items": MOCK_SEARCH_RESPONSE["Items"][:1]
+    }
+    mock_document_service._process_documents = mocker.MagicMock(
+        return_value=[{"id": "doc-3"}]
+    )
+
+    result = mock_document_service.get_paginated_document_references(
+        "9000000009", page_size=5, next_page_token=token
+    )
+
+    mock_document_service.dynamo_service.query_table_by_index.assert_called_once()
+    query_kwargs = (
+        mock_document_service.dynamo_service.query_table_by_index.call_args.kwargs
+    )
+    assert query_kwargs["table_name"] == "table2"
+    assert query_kwargs["exclusive_start_key"] == start_key
+    assert [link["relation"] for link in result["link"]] == ["self"]
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not-a-token",
+        DocumentReferenceSearchService._encode_page_token(5, None),
+        DocumentReferenceSearchService._encode_page_token(
+            0, {"ID": "doc-1", "NhsNumber": "9000000001"}
+        ),
+    ],
+)
+def test_get_paginated_document_references_rejects_invalid_token(
+    mock_document_service, mocker, set_env, token
+):
+    mocker.patch.object(
+        mock_document_service, "_get_table_names", return_value=["table1", "table2"]
+    )
+
+    with pytest.raises(DocumentRefSearchException) as exc_info:
+        mock_document_service.get_paginated_document_references(
+            "9000000009", page_size=5, next_page_token=token
+        )
+
+    assert exc_info.value.status_code == 400
+    mock_document_service.dynamo_service.query_table_by_index.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {},
+        {"custodian": "SUSP", "author": "Y11111"},
+        {"custodian": None, "author": None},
+        {"custodian": None, "author": None, "current_gp_ods": None},
+        {"document_scan_creation": None, "doc_status": "preliminary"},
+        {"document_snomed_code_type": SnomedCodes.PATIENT_DATA.value.code},
+    ],
+)
+def test_create_document_reference_fhir_response_matches_validated_models(
+    mock_document_service, overrides
+):
+    document = MOCK_DOCUMENT_REFERENCE[0].model_copy(update=overrides)
+
+    expected = mock_document_service._create_validated_document_reference_fhir_response(
+        document.model_copy()
+    )
+    actual = mock_document_service.create_document_reference_fhir_response(document)
+
+    assert actual == expected
+    assert list(actual) == list(expected)
@@ -80,6 +80,7 @@ def test_fetch_available_document_references_by_type_lg_returns_list_of_doc_refe
         index_name="NhsNumberIndex",
         search_key="NhsNumber",
         search_condition=TEST_NHS_NUMBER,
+        requested_fields=None,
         query_filter=mock_filter_expression,
         exclusive_start_key=None,
     )
@@ -103,6 +104,7 @@ def test_fetch_available_document_references_by_type_arf_returns_list_of_doc_ref
         index_name="NhsNumberIndex",
         search_key="NhsNumber",
         search_condition=TEST_NHS_NUMBER,
+        requested_fields=None,
         query_filter=mock_filter_expression,
         exclusive_start_key=None,
     )
@@ -122,6 +124,7 @@ def test_fetch_available_document_references_by_type_lg_returns_empty_list_of_do
         index_name="NhsNumberIndex",
         search_key="NhsNumber",
         search_condition=TEST_NHS_NUMBER,
+        requested_fields=None,
         query_filter=mock_filter_expression,
         exclusive_start_key=None,
     )
@@ -136,6 +139,7 @@ def test_fetch_documents_from_table_with_filter_returns_list_of_doc_references(
             index_name="NhsNumberIndex",
             search_key="NhsNumber",
             search_condition=TEST_NHS_NUMBER,
+            requested_fields=None,
             query_filter=mock_filter_expression,
             exclusive_start_key=None,
         )
@@ -167,6 +171,7 @@ def test_fetch_documents_from_table_with_filter_returns_empty_list_of_doc_refere
             index_name="NhsNumberIndex",
             search_key="NhsNumber",
             search_condition=TEST_NHS_NUMBER,
+            requested_fields=None,
             query_filter=mock_filter_expression,
             exclusive_start_key=None,
         )
@@ -203,11 +208,13 @@ def test_delete_documents_soft_delete(mock_service, mock_dynamo_service):
         MOCK_TABLE_NAME, [test_doc_ref], DocumentRetentionDays.SOFT_DELETE
     )
 
-    mock_dynamo_service.update_item.assert_called_once_with(
+    mock_transaction = mock_dynamo_service.transaction.return_value
+    mock_transaction.update.assert_called_once_with(
         table_name=MOCK_TABLE_NAME,
-        key_pair={"ID": test_doc_ref.id},
+        key={"ID": test_doc_ref.id},
         updated_fields=test_update_fields,
     )
+    mock_transaction.commit.assert_called_once()
 
 
 @freeze_time("2023-10-1 13:00:00")
@@ -227,11 +234,13 @@ def test_delete_documents_death_delete(mock_service, mock_dynamo_service):
         MOCK_TABLE_NAME, [test_doc_ref], DocumentRetentionDays.DEATH
     )
 
-    mock_dynamo_service.update_item.assert_called_once_with(
+    mock_transaction = mock_dynamo_service.transaction.return_value
+    mock_transaction.update.assert_called_once_with(
         table_name=MOCK_TABLE_NAME,
-        key_pair={"ID": test_doc_ref.id},
+        key={"ID": test_doc_ref.id},
         updated_fields=test_update_fields,
     )
+    mock_transaction.commit.assert_called_once()
 
 
 def test_update_document(mock_service, mock_dynamo_service):
@@ -250,6 +259,20 @@ def test_update_document(mock_service, mock_dynamo_service):
     mock_dynamo_service.update_item.assert_has_calls([update_item_call])
 
 
+def test_update_document_file_size(mock_service, mock_dynamo_service):
+    test_doc_ref = DocumentReference.model_validate(MOCK_DOCUMENT)
+    test_doc_ref.file_size = 1234
+
+    mock_service.update_document_file_size(MOCK_TABLE_NAME, test_doc_ref)
+
+    mock_dynamo_service.update_item.assert_called_once_with(
+        table_name=MOCK_TABLE_NAME,
+        key_pair={"ID": test_doc_ref.id},
+        updated_fields={"FileSize": 1234},
+        condition_expression="attribute_exists(ID) AND attribute_not_exists(FileSize)",
+    )
+
+
 def test_hard_delete_metadata_records(mock_service, mock_dynamo_service):
     test_doc_refs = [
         DocumentReference.model_validate(mock_document)
@@ -341,12 +364,16 @@ def test_get_nhs_numbers_based_on_ods_code(mock_service, mocker):
     ods_code = "Y12345"
     expected_nhs_number = "9000000009"
 
-    mock_documents = create_test_lloyd_george_doc_store_refs()
+    mock_items = [
+        {"NhsNumber": expected_nhs_number},
+        {"NhsNumber": expected_nhs_number},
+        {},
+    ]
 
     mock_fetch = mocker.patch.object(
         mock_service,
-        "fetch_documents_from_table",
-        return_value=mock_documents,
+        "iterate_documents_from_table",
+        return_value=iter(mock_items),
     )
 
     result = mock_service.get_nhs_numbers_based_on_ods_code(ods_code)
@@ -359,9 +386,45 @@ def test_get_nhs_numbers_based_on_ods_code(mock_service, mocker):
         search_key=DocumentReferenceMetadataFields.CURRENT_GP_ODS.value,
         search_condition=ods_code,
         query_filter=NotDeleted,
+        projection=[DocumentReferenceMetadataFields.NHS_NUMBER.value],
+    )
+
+
+def test_fetch_documents_from_table_with_projection_returns_raw_items(
+    mock_service, mock_dynamo_service
+):
+    projection = ["ID", "FileName"]
+    mock_dynamo_service.query_table_by_index.return_value = {
+        "Items": [{"ID": "doc-1", "FileName": "file.pdf"}]
+    }
+
+    results = mock_service.fetch_documents_from_table_with_nhs_number(
+        nhs_number=TEST_NHS_NUMBER,
+        table=MOCK_LG_TABLE_NAME,
+        projection=projection,
+    )
+
+    assert results == [{"ID": "doc-1", "FileName": "file.pdf"}]
+    mock_dynamo_service.query_table_by_index.assert_called_once_with(
+        table_name=MOCK_LG_TABLE_NAME,
+        index_name="NhsNumberIndex",
+        search_key="NhsNumber",
+        search_condition=TEST_NHS_NUMBER,
+        requested_fields=projection,
+        query_filter=None,
+        exclusive_start_key=None,
     )
 
 
+def test_validate_document_items_skips_invalid_items(mock_service):
+    items = [MOCK_SEARCH_RESPONSE["Items"][0], {"ID": "missing-required-fields"}]
+
+    results = mock_service.validate_document_items(items)
+
+    assert len(results) == 1
+    assert isinstance(results[0], DocumentReference)
+
+
 def test_get_batch_document_references_by_id_success(mock_service):
     document_ids = ["doc1", "doc2"]
     doc_type = SupportedDocumentTypes.LG
@@ -1,7 +1,9 @@
+from datetime import datetime, timezone
 from unittest.mock import patch
 
 import pytest
 from botocore.exceptions import ClientError
+from freezegun import freeze_time
 from services.edge_presign_service import EdgePresignService
 from tests.unit.conftest import MOCK_TABLE_NAME, MOCKED_LG_BUCKET_URL
 from tests.unit.enums.test_edge_presign_values import (
@@ -92,6 +94,142 @@ def test_attempt_presigned_ingestion_client_error(edge_presign_service):
     assert exc_info.value.message == EXPECTED_EDGE_NO_CLIENT_ERROR_MESSAGE
 
 
+def test_use_presigned_with_range_header_retrieves_reusable_url(
+    edge_presign_service, request_values, mocker
+):
+    request_values["headers"]["range"] = [{"key": "Range", "value": "bytes=0-1023"}]
+    mock_attempt_presigned_ingestion = mocker.patch.object(
+        edge_presign_service, "_attempt_presigned_ingestion"
+    )
+    mock_attempt_range_retrieval = mocker.patch.object(
+        edge_presign_service, "_attempt_range_presigned_retrieval"
+    )
+    mock_attempt_range_retrieval.return_value = (
+        "https://example.com/someother/path?querystring"
+    )
+
+    request_result = edge_presign_service.use_presigned(request_values)
+
+    mock_attempt_range_retrieval.assert_called_once_with(
+        "some/path", MOCKED_LG_BUCKET_URL
+    )
+    mock_attempt_presigned_ingestion.assert_not_called()
+    assert request_result.get("uri") == "/someother/path"
+
+
+CONDITIONAL_CHECK_FAILED = ClientError(
+    {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+)
+
+
+@freeze_time("2026-10-19T12:00:00Z")
+def test_attempt_range_presigned_retrieval_counts_range_requests_on_consumed_entry(
+    edge_presign_service,
+):
+    mock_dynamo_service = edge_presign_service.dynamo_service
+    mock_dynamo_service.increment_item_counter.return_value = {
+        "Attributes": {
+            "presignedUrl": f"https://{MOCKED_LG_BUCKET_URL}/some/path?querystring"
+        }
+    }
+
+    result = edge_presign_service._attempt_range_presigned_retrieval(
+        "random id", MOCKED_LG_BUCKET_URL
+    )
+
+    assert result == f"https://{MOCKED_LG_BUCKET_URL}/some/path?querystring"
+    mock_dynamo_service.update_item.assert_not_called()
+    counter_call = mock_dynamo_service.increment_item_counter.call_args.kwargs
+    assert counter_call["key_pair"] == {"ID": "random id"}
+    assert counter_call["counter_field"] == "RangeRequestCount"
+    assert "IsRequested = :true" in counter_call["condition_expression"]
+    assert "RangeRequestsUntil > :now" in counter_call["condition_expression"]
+    assert (
+        "RangeRequestCount < :max_range_requests"
+        in counter_call["condition_expression"]
+    )
+    assert counter_call["expression_attribute_values"] == {
+        ":true": True,
+        ":now": int(datetime(2026, 10, 19, 12, tzinfo=timezone.utc).timestamp()),
+        ":max_range_requests": EdgePresignService.MAX_RANGE_REQUESTS,
+    }
+
+
+def test_attempt_range_presigned_retrieval_consumes_unrequested_entry(
+    edge_presign_service,
+):
+    mock_dynamo_service = edge_presign_service.dynamo_service
+    mock_dynamo_service.increment_item_counter.side_effect = CONDITIONAL_CHECK_FAILED
+    mock_dynamo_service.update_item.return_value = {
+        "Attributes": {
+            "presignedUrl": f"https://{MOCKED_LG_BUCKET_URL}/some/path?querystring"
+        }
+    }
+
+    result = edge_presign_service._attempt_range_presigned_retrieval(
+        "random id", MOCKED_LG_BUCKET_URL
+    )
+
+    assert result == f"https://{MOCKED_LG_BUCKET_URL}/some/path?querystring"
+    mock_dynamo_service.update_item.assert_called_once()
+    assert (
+        mock_dynamo_service.update_item.call_args.kwargs["condition_expression"]
+        == "attribute_not_exists(IsRequested) OR IsRequested = :false"
+    )
+
+
+def test_attempt_range_presigned_retrieval_rejects_consumed_entry_outside_range_limits(
+    edge_presign_service,
+):
+    # Covers consumed entries that are not range enabled, have used up their range
+    # requests, or are past RangeRequestsUntil: each fails the counter condition.
+    mock_dynamo_service = edge_presign_service.dynamo_service
+    mock_dynamo_service.increment_item_counter.side_effect = CONDITIONAL_CHECK_FAILED
+    mock_dynamo_service.update_item.side_effect = CONDITIONAL_CHECK_FAILED
+
+    with pytest.raises(CloudFrontEdgeException) as exc_info:
+        edge_presign_service._attempt_range_presigned_retrieval(
+            "random id", MOCKED_LG_BUCKET_URL
+        )
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.err_code == EXPECTED_EDGE_NO_CLIENT_ERROR_CODE
+    mock_dynamo_service.update_item.assert_called_once()
+
+
+def test_attempt_range_presigned_retrieval_client_error_does_not_consume_entry(
+    edge_presign_service,
+):
+    mock_dynamo_service = edge_presign_service.dynamo_service
+    mock_dynamo_service.increment_item_counter.side_effect = ClientError(
+        {"Error": {"Code": "InternalServerError"}}, "UpdateItem"
+    )
+
+    with pytest.raises(CloudFrontEdgeException) as exc_info:
+        edge_presign_service._attempt_range_presigned_retrieval(
+            "random id", MOCKED_LG_BUCKET_URL
+        )
+
+    assert exc_info.value.status_code == 400
+    mock_dynamo_service.update_item.assert_not_called()
+
+
+@freeze_time("2026-10-19T12:00:00Z")
+def test_update_dynamo_item_opens_range_request_window(edge_presign_service):
+    edge_presign_service._update_dynamo_item(MOCK_TABLE_NAME, "random id")
+
+    updated_fields = edge_presign_service.dynamo_service.update_item.call_args.kwargs[
+        "updated_fields"
+    ]
+    assert updated_fields == {
+        "IsRequested": True,
+        "RangeRequestsUntil": int(
+            datetime(2026, 10, 19, 12, tzinfo=timezone.utc).timestamp()
+        )
+        + EdgePresignService.RANGE_REQUEST_WINDOW_SECONDS,
+    }
+
+
 def test_update_s3_headers(edge_presign_service, request_values):
     response = edge_presign_service.update_s3_headers(request_values)
     assert "authorization" not in response["headers"]
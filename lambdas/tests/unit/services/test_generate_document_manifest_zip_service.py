@@ -1,12 +1,15 @@
 import io
 import shutil
+import struct
 import zipfile
 
 import pytest
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, IncompleteReadError
 from enums.lambda_error import LambdaError
+from enums.s3_transfer_profile import S3TransferProfile
 from enums.trace_status import TraceStatus
 from models.zip_trace import DocumentManifestZipTrace
+from services.base.s3_multipart_upload_writer import S3MultipartUploadWriter
 from services.generate_document_manifest_zip_service import DocumentManifestZipService
 from utils.exceptions import InvalidDocumentReferenceException
 from utils.lambda_exceptions import GenerateManifestZipException
@@ -88,50 +91,6 @@ def test_get_file_bucket_and_key_throws_exception_when_not_passed_incorrect_form
     assert mock_service.zip_trace_object.job_status == TraceStatus.FAILED
 
 
-def test_upload_zip_file(mocker, mock_service, mock_s3_service):
-    zip_buffer = io.BytesIO(b"Fake ZIP content")
-    zip_buffer.seek(0)
-
-    mock_upload = mocker.patch.object(mock_s3_service, "upload_file_obj")
-
-    mock_service.upload_zip_file(zip_buffer)
-
-    expected_key = mock_service.zip_file_name
-    expected_location = f"s3://{mock_service.zip_output_bucket}/{expected_key}"
-
-    mock_upload.assert_called_once_with(
-        zip_buffer, mock_service.zip_output_bucket, expected_key
-    )
-
-    assert mock_service.zip_trace_object.zip_file_location == expected_location
-    assert mock_service.zip_trace_object.job_status == TraceStatus.COMPLETED
-
-
-def test_upload_zip_file_raises_exception(mocker, mock_service, mock_s3_service):
-    zip_buffer = io.BytesIO(b"Fake ZIP content")
-    zip_buffer.seek(0)
-
-    error_response = {"Error": {"Code": "500", "Message": "test error"}}
-    mocker.patch.object(
-        mock_s3_service,
-        "upload_file_obj",
-        side_effect=ClientError(error_response, "UploadObject"),
-    )
-
-    with pytest.raises(GenerateManifestZipException) as exc_info:
-        mock_service.upload_zip_file(zip_buffer)
-
-    expected_key = mock_service.zip_file_name
-    expected_location = f"s3://{mock_service.zip_output_bucket}/{expected_key}"
-
-    assert mock_service.zip_trace_object.zip_file_location == expected_location
-    assert mock_service.zip_trace_object.job_status == TraceStatus.FAILED
-    exception = exc_info.value
-    assert isinstance(exception, GenerateManifestZipException)
-    assert exception.status_code == 500
-    assert exception.error == LambdaError.ZipServiceClientError
-
-
 def test_update_dynamo(mock_service, mock_dynamo_service):
     mock_service.update_dynamo_with_fields({"job_status"})
 
@@ -154,21 +113,43 @@ def test_update_failed_status(mock_service):
     assert mock_service.zip_trace_object.job_status == TraceStatus.FAILED
 
 
+@pytest.fixture
+def mock_upload_client(mocker, mock_s3_service):
+    upload_client = mocker.MagicMock()
+    mock_s3_service.open_multipart_upload_writer.side_effect = (
+        lambda bucket, key, **kwargs: S3MultipartUploadWriter(
+            upload_client, bucket, key
+        )
+    )
+    yield upload_client
+
+
 def test_stream_zip_documents(
-    mocker, mock_service, mock_s3_service, mock_stream_context_manager
+    mocker,
+    mock_service,
+    mock_s3_service,
+    mock_stream_context_manager,
+    mock_upload_client,
 ):
     file_content = b"Dummy file content"
 
-    mock_s3_service.get_object_stream.side_effect = (
+    mock_s3_service.stream_s3_object_to_memory.side_effect = (
         lambda *args, **kwargs: mock_stream_context_manager(file_content)
     )
     mock_copyfileobj = mocker.patch("shutil.copyfileobj", wraps=shutil.copyfileobj)
 
-    zip_buffer = mock_service.stream_zip_documents()
+    mock_service.stream_zip_documents()
 
+    expected_key = mock_service.zip_file_name
+    mock_s3_service.open_multipart_upload_writer.assert_called_once_with(
+        mock_service.zip_output_bucket,
+        expected_key,
+        transfer_profile=S3TransferProfile.ZIP_ARCHIVE,
+    )
+    uploaded_zip = mock_upload_client.put_object.call_args.kwargs["Body"]
     expected_files = list(mock_service.zip_trace_object.files_to_download.values())
 
-    with zipfile.ZipFile(zip_buffer, "r") as zipf:
+    with zipfile.ZipFile(io.BytesIO(uploaded_zip), "r") as zipf:
         file_list = zipf.namelist()
         assert sorted(file_list) == sorted(expected_files)
 
@@ -177,12 +158,35 @@ def test_stream_zip_documents(
                 assert f.read() == file_content
 
     assert mock_copyfileobj.called
+    assert (
+        mock_service.zip_trace_object.zip_file_location
+        == f"s3://{mock_service.zip_output_bucket}/{expected_key}"
+    )
+    assert mock_service.zip_trace_object.job_status == TraceStatus.COMPLETED
+
+
+def test_stream_zip_documents_raises_exception_when_upload_fails(
+    mock_service, mock_s3_service, mock_stream_context_manager, mock_upload_client
+):
+    mock_s3_service.stream_s3_object_to_memory.side_effect = (
+        lambda *args, **kwargs: mock_stream_context_manager(b"Dummy file content")
+    )
+    mock_upload_client.put_object.side_effect = ClientError(
+        {"Error": {"Code": "500", "Message": "test error"}}, "PutObject"
+    )
+
+    with pytest.raises(GenerateManifestZipException) as exc_info:
+        mock_service.stream_zip_documents()
+
+    assert mock_service.zip_trace_object.job_status == TraceStatus.FAILED
+    assert exc_info.value.status_code == 500
+    assert exc_info.value.error == LambdaError.ZipServiceClientError
 
 
 def test_stream_zip_documents_raises_client_error(
-    mocker, mock_service, mock_s3_service
+    mocker, mock_service, mock_s3_service, mock_upload_client
 ):
-    mock_s3_service.get_object_stream.side_effect = MOCK_CLIENT_ERROR
+    mock_s3_service.stream_s3_object_to_memory.side_effect = MOCK_CLIENT_ERROR
 
     mocker.patch.object(
         mock_service, "get_file_bucket_and_key", return_value=("bucket", "key")
@@ -194,3 +198,86 @@ def test_stream_zip_documents_raises_client_error(
     assert exc_info.value.error == LambdaError.ZipServiceClientError
     assert exc_info.value.status_code == 500
     assert mock_service.zip_trace_object.job_status == TraceStatus.FAILED
+    mock_upload_client.put_object.assert_not_called()
+
+
+def test_stream_zip_documents_prefetches_documents_in_order(
+    mock_service, mock_s3_service, mock_upload_client
+):
+    mock_service.prefetch_document_count = 2
+    mock_service.zip_trace_object = DocumentManifestZipTrace(
+        nhs_number=TEST_NHS_NUMBER,
+        files_to_download={
+            f"s3://{MOCK_BUCKET}/file-{index}": f"file-{index}.txt"
+            for index in range(5)
+        },
+    )
+    mock_s3_service.stream_s3_object_to_memory.side_effect = (
+        lambda bucket, key: io.BytesIO(key.encode())
+    )
+
+    mock_service.stream_zip_documents()
+
+    uploaded_zip = mock_upload_client.put_object.call_args.kwargs["Body"]
+    with zipfile.ZipFile(io.BytesIO(uploaded_zip), "r") as zipf:
+        assert zipf.namelist() == [f"file-{index}.txt" for index in range(5)]
+        for index in range(5):
+            assert zipf.read(f"file-{index}.txt") == f"file-{index}".encode()
+    assert mock_s3_service.stream_s3_object_to_memory.call_count == 5
+
+
+def test_stream_zip_documents_deflates_every_member(
+    mock_service, mock_s3_service, mock_upload_client
+):
+    mock_service.zip_trace_object = DocumentManifestZipTrace(
+        nhs_number=TEST_NHS_NUMBER,
+        files_to_download={
+            f"s3://{MOCK_BUCKET}/record": "record.PDF",
+            f"s3://{MOCK_BUCKET}/scan": "scan.jpeg",
+            f"s3://{MOCK_BUCKET}/notes": "notes.txt",
+        },
+    )
+    mock_s3_service.stream_s3_object_to_memory.side_effect = (
+        lambda bucket, key: io.BytesIO(b"content " * 100)
+    )
+
+    mock_service.stream_zip_documents()
+
+    uploaded_zip = mock_upload_client.put_object.call_args.kwargs["Body"]
+    with zipfile.ZipFile(io.BytesIO(uploaded_zip), "r") as zipf:
+        infos = zipf.infolist()
+        for info in infos:
+            assert zipf.read(info) == b"content " * 100
+
+    for info in infos:
+        local_header = uploaded_zip[info.header_offset : info.header_offset + 30]
+        flags, method = struct.unpack("<HH", local_header[6:10])
+        assert method == zipfile.ZIP_DEFLATED
+        assert flags & 0x08
+
+
+def test_stream_zip_documents_fails_trace_when_prefetch_raises(
+    mock_service, mock_s3_service, mock_upload_client
+):
+    mock_s3_service.stream_s3_object_to_memory.side_effect = IncompleteReadError(
+        actual_bytes=1, expected_bytes=10
+    )
+
+    with pytest.raises(GenerateManifestZipException) as exc_info:
+        mock_service.stream_zip_documents()
+
+    assert exc_info.value.error == LambdaError.ZipServiceClientError
+    assert mock_service.zip_trace_object.job_status == TraceStatus.FAILED
+
+
+@pytest.mark.parametrize(
+    ["document_name", "expected"],
+    [
+        ("1of2_Lloyd_George_Record.pdf", 1),
+        ("image.JPG", 1),
+        ("letter.txt", None),
+        ("no_extension", None),
+    ],
+)
+def test_get_compress_level(mock_service, document_name, expected):
+    assert mock_service.get_compress_level(document_name) == expected
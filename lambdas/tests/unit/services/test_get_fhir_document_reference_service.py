@@ -19,7 +19,7 @@ from utils.ods_utils import PCSE_ODS_CODE
 
 @pytest.fixture
 def patched_service(mocker, set_env, context):
-    mocker.patch("services.base.s3_service.IAMService")
+    mocker.patch("services.base.assumed_role_client.IAMService")
     mocker.patch("services.get_fhir_document_reference_service.S3Service")
     mocker.patch("services.get_fhir_document_reference_service.SSMService")
     mocker.patch("services.get_fhir_document_reference_service.DocumentService")
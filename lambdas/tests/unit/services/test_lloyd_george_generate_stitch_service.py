@@ -4,11 +4,12 @@ from io import BytesIO
 import pytest
 from boto3.dynamodb.conditions import Attr, ConditionBase
 from botocore.exceptions import ClientError
+from enums.s3_transfer_profile import S3TransferProfile
 from enums.supported_document_types import SupportedDocumentTypes
 from enums.trace_status import TraceStatus
 from models.document_reference import DocumentReference
 from models.stitch_trace import StitchTrace
-from pypdf import PdfWriter
+from pypdf import PdfReader, PdfWriter
 from services.document_service import DocumentService
 from services.lloyd_george_generate_stitch_service import LloydGeorgeStitchService
 from tests.unit.conftest import MOCK_LG_BUCKET, TEST_NHS_NUMBER, TEST_UUID
@@ -272,6 +273,7 @@ def test_upload_stitched_lg_record_and_retrieve_presign_url(mock_s3, stitch_serv
             "ContentDisposition": "inline",
             "ContentType": "application/pdf",
         },
+        transfer_profile=S3TransferProfile.STITCHED_PDF,
     )
 
 
@@ -430,3 +432,196 @@ def test_fetch_pdf_calls_expected_methods(stitch_service, mocker, single_mock_do
 
     assert mock_get_file_key.called
     assert mock_stream_s3.called
+
+
+def build_previous_stitch_trace(stitched_document_ids: list[str]) -> StitchTrace:
+    return StitchTrace(
+        nhs_number=TEST_NHS_NUMBER,
+        expire_at=9999999,
+        job_status=TraceStatus.COMPLETED,
+        stitched_file_location=MOCK_STITCHED_FILE_ON_S3,
+        stitched_document_ids=stitched_document_ids,
+    )
+
+
+def build_lg_doc_refs_with_ids(page_numbers: list[int]) -> list[DocumentReference]:
+    documents = build_lg_doc_ref_list(page_numbers)
+    for page_number, document in zip(page_numbers, documents):
+        document.id = f"doc-{page_number}"
+    return documents
+
+
+def test_can_append_to_stitch_trace_when_new_parts_sort_after_existing(
+    stitch_service,
+):
+    documents = build_lg_doc_refs_with_ids([1, 2, 3])
+    previous_stitch_trace = build_previous_stitch_trace(["doc-1", "doc-2"])
+
+    assert stitch_service.can_append_to_stitch_trace(previous_stitch_trace, documents)
+
+
+@pytest.mark.parametrize(
+    "stitched_document_ids",
+    [[], ["doc-2", "doc-3"], ["doc-1", "doc-2", "doc-3"], ["doc-1", "doc-4"]],
+)
+def test_can_append_to_stitch_trace_returns_false_when_not_a_prefix(
+    stitch_service, stitched_document_ids
+):
+    documents = build_lg_doc_refs_with_ids([1, 2, 3])
+    previous_stitch_trace = build_previous_stitch_trace(stitched_document_ids)
+
+    assert not stitch_service.can_append_to_stitch_trace(
+        previous_stitch_trace, documents
+    )
+
+
+def test_can_append_to_stitch_trace_returns_false_without_previous_trace(
+    stitch_service, multiple_mock_docs
+):
+    assert not stitch_service.can_append_to_stitch_trace(None, multiple_mock_docs)
+
+
+def test_stitch_ordered_documents_rebuilds_when_incremental_append_disabled(
+    stitch_service, mocker, multiple_mock_docs
+):
+    mock_get_previous = mocker.patch.object(stitch_service, "get_previous_stitch_trace")
+    mock_stream_and_stitch = mocker.patch.object(
+        stitch_service, "stream_and_stitch_documents", return_value=MOCK_STITCHED_STREAM
+    )
+
+    actual = stitch_service.stitch_ordered_documents(multiple_mock_docs)
+
+    assert actual == MOCK_STITCHED_STREAM
+    mock_get_previous.assert_not_called()
+    mock_stream_and_stitch.assert_called_once_with(multiple_mock_docs)
+
+
+def test_stitch_ordered_documents_appends_new_parts_to_previous_record(
+    stitch_service, mocker
+):
+    documents = build_lg_doc_refs_with_ids([1, 2, 3])
+    stitch_service.incremental_append_enabled = True
+    stitch_service.s3_service = mocker.Mock()
+    stitch_service.s3_service.stream_s3_object_to_memory.side_effect = [
+        create_mock_pdf_stream(),
+        create_mock_pdf_stream(),
+    ]
+    mocker.patch.object(
+        stitch_service,
+        "get_previous_stitch_trace",
+        return_value=build_previous_stitch_trace(["doc-1", "doc-2"]),
+    )
+    mock_stream_and_stitch = mocker.patch.object(
+        stitch_service, "stream_and_stitch_documents"
+    )
+
+    result = stitch_service.stitch_ordered_documents(documents)
+
+    assert len(PdfReader(result).pages) == 2
+    stitch_service.s3_service.stream_s3_object_to_memory.assert_any_call(
+        bucket=MOCK_LG_BUCKET, key=MOCK_STITCHED_FILE_ON_S3
+    )
+    assert stitch_service.s3_service.stream_s3_object_to_memory.call_count == 2
+    mock_stream_and_stitch.assert_not_called()
+
+
+def test_stitch_ordered_documents_falls_back_when_previous_file_is_missing(
+    stitch_service, mocker
+):
+    documents = build_lg_doc_refs_with_ids([1, 2, 3])
+    stitch_service.incremental_append_enabled = True
+    stitch_service.s3_service = mocker.Mock()
+    stitch_service.s3_service.stream_s3_object_to_memory.side_effect = MOCK_CLIENT_ERROR
+    mocker.patch.object(
+        stitch_service,
+        "get_previous_stitch_trace",
+        return_value=build_previous_stitch_trace(["doc-1", "doc-2"]),
+    )
+    mock_stream_and_stitch = mocker.patch.object(
+        stitch_service, "stream_and_stitch_documents", return_value=MOCK_STITCHED_STREAM
+    )
+
+    actual = stitch_service.stitch_ordered_documents(documents)
+
+    assert actual == MOCK_STITCHED_STREAM
+    mock_stream_and_stitch.assert_called_once_with(documents)
+
+
+def test_get_previous_stitch_trace_returns_latest_completed_trace(
+    stitch_service, mocker
+):
+    older_trace = build_previous_stitch_trace(["doc-1"])
+    older_trace.created = "2024-01-01T10:00:00.000000Z"
+    newer_trace = build_previous_stitch_trace(["doc-1", "doc-2"])
+    newer_trace.created = "2024-01-02T10:00:00.000000Z"
+    pending_trace = StitchTrace(nhs_number=TEST_NHS_NUMBER, expire_at=9999999)
+
+    stitch_service.document_service = mocker.MagicMock()
+    stitch_service.document_service.dynamo_service.query_table_by_index.return_value = {
+        "Items": [
+            trace.model_dump(by_alias=True)
+            for trace in [older_trace, newer_trace, pending_trace]
+        ]
+    }
+
+    actual = stitch_service.get_previous_stitch_trace()
+
+    assert actual == newer_trace
+
+
+def test_get_previous_stitch_trace_returns_none_on_client_error(stitch_service, mocker):
+    stitch_service.document_service = mocker.MagicMock()
+    stitch_service.document_service.dynamo_service.query_table_by_index.side_effect = (
+        MOCK_CLIENT_ERROR
+    )
+
+    assert stitch_service.get_previous_stitch_trace() is None
+
+
+def test_prepare_documents_for_stitching_records_stitched_document_ids(
+    stitch_service, mocker
+):
+    documents = build_lg_doc_refs_with_ids([3, 1, 2])
+    mocker.patch.object(stitch_service, "update_trace_status")
+    stitch_service.stitch_trace_object = StitchTrace(
+        nhs_number=TEST_NHS_NUMBER, expire_at=9999999
+    )
+
+    stitch_service.prepare_documents_for_stitching(documents)
+
+    assert stitch_service.stitch_trace_object.stitched_document_ids == [
+        "doc-1",
+        "doc-2",
+        "doc-3",
+    ]
+
+
+def test_stream_and_stitch_documents_writes_linearised_output_when_enabled(
+    stitch_service, mocker, multiple_mock_docs
+):
+    stitch_service.linearise_output = True
+    stitch_service.s3_service = mocker.Mock()
+    stitch_service.s3_service.stream_s3_object_to_memory.side_effect = [
+        create_mock_pdf_stream() for _ in multiple_mock_docs
+    ]
+
+    result = stitch_service.stream_and_stitch_documents(multiple_mock_docs)
+
+    assert b"/Linearized" in result.getvalue()[:1024]
+    assert len(PdfReader(result).pages) == 3
+
+
+def test_stitch_ordered_documents_skips_append_when_linearising(
+    stitch_service, mocker, multiple_mock_docs
+):
+    stitch_service.incremental_append_enabled = True
+    stitch_service.linearise_output = True
+    mock_get_previous = mocker.patch.object(stitch_service, "get_previous_stitch_trace")
+    mock_stream_and_stitch = mocker.patch.object(
+        stitch_service, "stream_and_stitch_documents", return_value=MOCK_STITCHED_STREAM
+    )
+
+    stitch_service.stitch_ordered_documents(multiple_mock_docs)
+
+    mock_get_previous.assert_not_called()
+    mock_stream_and_stitch.assert_called_once_with(multiple_mock_docs)
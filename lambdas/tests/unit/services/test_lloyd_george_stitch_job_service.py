@@ -56,6 +56,20 @@ def test_create_document_stitch_presigned_url(stitch_service, mocker):
     )
 
 
+@pytest.mark.parametrize("allow_range_requests", [True, False])
+def test_create_document_stitch_presigned_url_flags_range_requests(
+    stitch_service, mocker, allow_range_requests
+):
+    mocker.patch("services.lloyd_george_stitch_job_service.format_cloudfront_url")
+
+    stitch_service.create_document_stitch_presigned_url(
+        "path/to/stitched/file", allow_range_requests=allow_range_requests
+    )
+
+    cloudfront_item = stitch_service.dynamo_service.create_item.call_args.args[1]
+    assert cloudfront_item.get("AllowRangeRequests", False) == allow_range_requests
+
+
 def test_check_lloyd_george_record_for_patient(stitch_service):
     stitch_service.check_lloyd_george_record_for_patient(TEST_NHS_NUMBER)
     stitch_service.document_service.get_available_lloyd_george_record_for_patient.assert_called_once_with(
@@ -4,10 +4,12 @@ import tempfile
 import pytest
 from enums.file_type import FileType
 from enums.metadata_field_names import DocumentReferenceMetadataFields
+from enums.s3_transfer_profile import S3TransferProfile
 from freezegun import freeze_time
 from openpyxl.reader.excel import load_workbook
 from pypdf import PdfReader
 from services.ods_report_service import OdsReportService
+from utils.common_query_filters import NotDeleted
 from utils.lambda_exceptions import OdsReportException
 
 
@@ -117,6 +119,10 @@ def test_scan_table_with_filter(
 
     assert len(results) == 3
     assert mock_dynamo_service_scan_table.call_count == 1
+    assert (
+        mock_dynamo_service_scan_table.call_args.kwargs["total_segments"]
+        == ods_report_service.scan_total_segments
+    )
 
 
 def test_scan_table_with_filter_no_results(
@@ -128,6 +134,36 @@ def test_scan_table_with_filter_no_results(
         ods_report_service.scan_table_with_filter("ODS123")
 
 
+def test_query_table_by_index_yields_items_from_every_page(
+    ods_report_service, mocked_context
+):
+    ods_report_service.dynamo_service.iterate_query.return_value = iter(
+        [
+            {DocumentReferenceMetadataFields.NHS_NUMBER.value: "NHS123"},
+            {DocumentReferenceMetadataFields.NHS_NUMBER.value: "NHS456"},
+        ]
+    )
+
+    results = list(ods_report_service.query_table_by_index("ODS123"))
+
+    assert len(results) == 2
+    ods_report_service.dynamo_service.iterate_query.assert_called_once_with(
+        table_name=ods_report_service.table_name,
+        index_name="OdsCodeIndex",
+        search_key=DocumentReferenceMetadataFields.CURRENT_GP_ODS.value,
+        search_condition="ODS123",
+        requested_fields=[DocumentReferenceMetadataFields.NHS_NUMBER.value],
+        query_filter=NotDeleted,
+    )
+
+
+def test_query_table_by_index_no_results(ods_report_service, mocked_context):
+    ods_report_service.dynamo_service.iterate_query.return_value = iter([])
+
+    with pytest.raises(OdsReportException):
+        list(ods_report_service.query_table_by_index("ODS123"))
+
+
 @freeze_time("2024-01-01T12:00:00Z")
 def test_create_and_save_ods_report_create_csv(
     ods_report_service,
@@ -302,6 +338,7 @@ def test_save_report_to_s3(ods_report_service, mocker):
         s3_bucket_name="test_statistics_report_bucket",
         file_key="ods-reports/ODS123/2024/1/1/test_report.csv",
         file_name="path/to/file",
+        transfer_profile=S3TransferProfile.REPORT,
     )
 
 
@@ -3,9 +3,13 @@ import tempfile
 from io import BytesIO
 
 import pytest
-from pypdf import PdfWriter
+from pypdf import PdfReader, PdfWriter
 from pypdf.errors import PyPdfError
-from services.pdf_stitch_service import count_page_number, stitch_pdf
+from services.pdf_stitch_service import (
+    append_pdf_incrementally,
+    count_page_number,
+    stitch_pdf,
+)
 
 
 def test_stitch_pdf():
@@ -66,3 +70,21 @@ def create_in_memory_pdf(page_count: int = 1) -> BytesIO:
     writer.write(stream)
     stream.seek(0)
     return stream
+
+
+def test_append_pdf_incrementally_appends_new_pages():
+    stitched_pdf = create_in_memory_pdf(page_count=3)
+    new_pdfs = [create_in_memory_pdf(page_count=2), create_in_memory_pdf()]
+
+    result = append_pdf_incrementally(stitched_pdf, new_pdfs)
+
+    assert len(PdfReader(result).pages) == 6
+
+
+def test_append_pdf_incrementally_keeps_original_bytes_as_prefix():
+    stitched_pdf = create_in_memory_pdf(page_count=3)
+    original_bytes = stitched_pdf.getvalue()
+
+    result = append_pdf_incrementally(stitched_pdf, [create_in_memory_pdf()])
+
+    assert result.getvalue().startswith(original_bytes)
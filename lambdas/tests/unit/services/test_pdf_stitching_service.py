@@ -4,11 +4,12 @@ import os
 import sys
 from io import BytesIO
 from random import shuffle
-from unittest.mock import call
+from unittest.mock import ANY, call
 
 import pytest
 from enums.lambda_error import LambdaError
 from enums.nrl_sqs_upload import NrlActionTypes
+from enums.s3_transfer_profile import S3TransferProfile
 from enums.snomed_codes import SnomedCodes
 from enums.supported_document_types import SupportedDocumentTypes
 from freezegun.api import freeze_time
@@ -30,6 +31,7 @@ from tests.unit.helpers.data.test_documents import (
     create_singular_test_lloyd_george_doc_store_ref,
     create_test_lloyd_george_doc_store_refs,
 )
+from utils.exceptions import DynamoTransactionException
 from utils.lambda_exceptions import PdfStitchingException
 
 from lambdas.services.pdf_stitching_service import PdfStitchingService
@@ -109,11 +111,11 @@ def mock_rollback_reference_migration(mocker, mock_service):
 @pytest.fixture
 def mock_download_fileobj():
     def _mock_download_fileobj(
-        s3_object_data: dict[str, BytesIO], Bucket: str, Key: str, Fileobj: BytesIO
+        s3_object_data: dict[str, BytesIO], file_key: str, file_obj: BytesIO
     ):
-        if Key in s3_object_data:
-            Fileobj.write(s3_object_data[Key].read())
-        Fileobj.seek(0)
+        if file_key in s3_object_data:
+            file_obj.write(s3_object_data[file_key].read())
+        file_obj.seek(0)
 
     return _mock_download_fileobj
 
@@ -291,15 +293,21 @@ def test_process_stitching(mock_service, mock_download_fileobj):
     expected_writer.write(expected_stream)
     expected_stream.seek(0)
 
-    mock_service.s3_service.client.download_fileobj.side_effect = (
-        lambda Bucket, Key, Fileobj: mock_download_fileobj(
-            s3_object_data, Bucket, Key, Fileobj
+    mock_service.s3_service.download_file_obj.side_effect = (
+        lambda file_key, file_obj, **_kwargs: mock_download_fileobj(
+            s3_object_data, file_key, file_obj
         )
     )
 
     actual_stream = mock_service.process_stitching(list(s3_object_data.keys()))
 
     assert actual_stream.read() == expected_stream.read()
+    mock_service.s3_service.download_file_obj.assert_called_with(
+        s3_bucket_name=mock_service.target_bucket,
+        file_key=list(s3_object_data.keys())[-1],
+        file_obj=ANY,
+        transfer_profile=S3TransferProfile.STITCHED_PDF,
+    )
 
 
 def test_migrate_multipart_references(mock_service):
@@ -375,17 +383,22 @@ def test_migrate_multipart_references(mock_service):
             call(table_name=MOCK_LG_TABLE_NAME, key={"ID": reference.id})
         )
 
-    assert mock_service.dynamo_service.create_item.call_count == 3
-    mock_service.dynamo_service.create_item.assert_has_calls(expected_create_calls)
-    assert mock_service.dynamo_service.delete_item.call_count == 3
-    mock_service.dynamo_service.delete_item.assert_has_calls(expected_delete_calls)
+    mock_transaction = mock_service.dynamo_service.transaction.return_value
+    assert mock_transaction.put.call_count == 3
+    mock_transaction.put.assert_has_calls(expected_create_calls)
+    assert mock_transaction.delete.call_count == 3
+    mock_transaction.delete.assert_has_calls(expected_delete_calls)
+    mock_transaction.commit.assert_called_once()
+    mock_service.dynamo_service.create_item.assert_not_called()
+    mock_service.dynamo_service.delete_item.assert_not_called()
 
 
-def test_migrate_multipart_references_handles_client_error_on_create(
+def test_migrate_multipart_references_handles_client_error_on_commit(
     mock_service, caplog
 ):
     mock_service.multipart_references = TEST_DOCUMENT_REFERENCES
-    mock_service.dynamo_service.create_item.side_effect = MOCK_CLIENT_ERROR
+    mock_transaction = mock_service.dynamo_service.transaction.return_value
+    mock_transaction.commit.side_effect = MOCK_CLIENT_ERROR
     expected_err_msg = (
         "Failed to migrate multipart references: "
         "An error occurred (500) when calling the TEST operation: Test error message"
@@ -399,14 +412,17 @@ def test_migrate_multipart_references_handles_client_error_on_create(
     assert e.value.error is LambdaError.MultipartError
 
 
-def test_migrate_multipart_references_handles_client_error_on_delete(
+def test_migrate_multipart_references_handles_cancelled_transaction(
     mock_service, caplog
 ):
     mock_service.multipart_references = TEST_DOCUMENT_REFERENCES
-    mock_service.dynamo_service.delete_item.side_effect = MOCK_CLIENT_ERROR
+    mock_transaction = mock_service.dynamo_service.transaction.return_value
+    mock_transaction.commit.side_effect = DynamoTransactionException(
+        "Transaction of 6 actions was cancelled"
+    )
     expected_err_msg = (
-        "Failed to cleanup multipart references: "
-        "An error occurred (500) when calling the TEST operation: Test error message"
+        "Failed to migrate multipart references: "
+        "Transaction of 6 actions was cancelled"
     )
 
     with pytest.raises(PdfStitchingException) as e:
@@ -559,18 +575,26 @@ def test_rollback_stitched_reference_handles_exception(mock_service):
 
 def test_rollback_reference_migration(mock_service):
     mock_service.multipart_references = TEST_DOCUMENT_REFERENCES
-    mock_service.dynamo_service.get_item.side_effect = (
-        {},
-        {"Item": {"ID": "123"}},
-        {},
-        {"Item": {"ID": "234"}},
-        {},
-        {"Item": {"ID": "567"}},
+    mock_service.dynamo_service.batch_get_items.side_effect = (
+        [],
+        [{"ID": reference.id} for reference in TEST_DOCUMENT_REFERENCES],
     )
+    mock_transaction = mock_service.dynamo_service.transaction.return_value
 
     mock_service.rollback_reference_migration()
 
-    mock_service.dynamo_service.create_item.assert_has_calls(
+    mock_service.dynamo_service.batch_get_items.assert_has_calls(
+        [
+            call(
+                table_name=table_name,
+                key_list=[reference.id for reference in TEST_DOCUMENT_REFERENCES],
+                key_name="ID",
+                requested_fields=["ID"],
+            )
+            for table_name in (MOCK_LG_TABLE_NAME, MOCK_UNSTITCHED_LG_TABLE_NAME)
+        ]
+    )
+    mock_transaction.put.assert_has_calls(
         [
             call(
                 table_name=MOCK_LG_TABLE_NAME,
@@ -638,7 +662,7 @@ def test_rollback_reference_migration(mock_service):
         ]
     )
 
-    mock_service.dynamo_service.delete_item.assert_has_calls(
+    mock_transaction.delete.assert_has_calls(
         [
             call(
                 table_name=MOCK_UNSTITCHED_LG_TABLE_NAME,
@@ -656,9 +680,26 @@ def test_rollback_reference_migration(mock_service):
     )
 
 
+def test_rollback_reference_migration_skips_references_already_in_place(
+    mock_service,
+):
+    mock_service.multipart_references = TEST_DOCUMENT_REFERENCES
+    mock_service.dynamo_service.batch_get_items.side_effect = (
+        [{"ID": reference.id} for reference in TEST_DOCUMENT_REFERENCES],
+        [],
+    )
+    mock_transaction = mock_service.dynamo_service.transaction.return_value
+
+    mock_service.rollback_reference_migration()
+
+    mock_transaction.put.assert_not_called()
+    mock_transaction.delete.assert_not_called()
+    mock_transaction.commit.assert_called_once()
+
+
 def test_rollback_reference_migration_handles_exception(mock_service):
     mock_service.multipart_references = TEST_DOCUMENT_REFERENCES
-    mock_service.dynamo_service.get_item.side_effect = MOCK_CLIENT_ERROR
+    mock_service.dynamo_service.batch_get_items.side_effect = MOCK_CLIENT_ERROR
 
     with pytest.raises(PdfStitchingException):
         mock_service.rollback_reference_migration()
@@ -0,0 +1,162 @@
+import pytest
+from botocore.exceptions import ClientError
+from freezegun import freeze_time
+from services.search_result_cache_service import SearchResultCacheService
+from tests.unit.conftest import TEST_NHS_NUMBER
+
+MOCK_CACHE_TABLE = "test_search_result_cache_table"
+
+
+@pytest.fixture
+def mock_service(set_env, monkeypatch, mocker):
+    monkeypatch.setenv("SEARCH_RESULT_CACHE_DYNAMODB_NAME", MOCK_CACHE_TABLE)
+    mocker.patch("services.search_result_cache_service.DynamoDBService")
+    service = SearchResultCacheService()
+    SearchResultCacheService._cached_results.clear()
+    yield service
+    SearchResultCacheService._cached_results.clear()
+
+
+def test_get_etag_returns_none_when_cache_table_not_configured(set_env, mocker):
+    mocker.patch("services.search_result_cache_service.DynamoDBService")
+    service = SearchResultCacheService()
+
+    assert service.get_etag(TEST_NHS_NUMBER) is None
+    service.dynamo_service.get_item.assert_not_called()
+
+
+def test_get_etag_is_stable_for_unchanged_version(mock_service):
+    mock_service.dynamo_service.get_item.return_value = {
+        "Item": {"NhsNumber": TEST_NHS_NUMBER, "Version": "version-1"}
+    }
+
+    etag = mock_service.get_etag(TEST_NHS_NUMBER)
+
+    assert etag == mock_service.get_etag(TEST_NHS_NUMBER)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag != mock_service.get_etag(TEST_NHS_NUMBER, variant="doc-1")
+    mock_service.dynamo_service.create_item.assert_not_called()
+    mock_service.dynamo_service.get_item.assert_called_with(
+        table_name=MOCK_CACHE_TABLE,
+        key={"NhsNumber": TEST_NHS_NUMBER},
+        consistent_read=True,
+    )
+
+
+def test_get_etag_changes_when_version_is_bumped(mock_service):
+    mock_service.dynamo_service.get_item.side_effect = [
+        {"Item": {"NhsNumber": TEST_NHS_NUMBER, "Version": "version-1"}},
+        {"Item": {"NhsNumber": TEST_NHS_NUMBER, "Version": "version-2"}},
+    ]
+
+    assert mock_service.get_etag(TEST_NHS_NUMBER) != mock_service.get_etag(
+        TEST_NHS_NUMBER
+    )
+
+
+@freeze_time("2025-01-01T00:00:00Z")
+def test_get_version_creates_marker_when_missing(mock_service, mocker):
+    mocker.patch("uuid.uuid4", return_value="new-version")
+    mock_service.dynamo_service.get_item.return_value = {}
+
+    version = mock_service.get_version(TEST_NHS_NUMBER)
+
+    assert version == "new-version"
+    mock_service.dynamo_service.create_item.assert_called_once_with(
+        table_name=MOCK_CACHE_TABLE,
+        item={
+            "NhsNumber": TEST_NHS_NUMBER,
+            "Version": "new-version",
+            "ExpireAt": 1738281600,
+        },
+        condition_expression="attribute_not_exists(NhsNumber)",
+    )
+
+
+def test_get_version_uses_marker_created_concurrently(mock_service, mocker):
+    mocker.patch("uuid.uuid4", return_value="losing-version")
+    mock_service.dynamo_service.get_item.side_effect = [
+        {},
+        {"Item": {"NhsNumber": TEST_NHS_NUMBER, "Version": "winning-version"}},
+    ]
+    mock_service.dynamo_service.create_item.side_effect = ClientError(
+        {"Error": {"Code": "ConditionalCheckFailedException"}}, "PutItem"
+    )
+
+    assert mock_service.get_version(TEST_NHS_NUMBER) == "winning-version"
+    assert mock_service.dynamo_service.get_item.call_count == 2
+
+
+def test_get_etag_returns_none_when_cache_table_is_unavailable(mock_service):
+    mock_service.dynamo_service.get_item.side_effect = ClientError(
+        {"Error": {"Code": "ProvisionedThroughputExceededException"}}, "GetItem"
+    )
+
+    assert mock_service.get_etag(TEST_NHS_NUMBER) is None
+
+
+@freeze_time("2025-01-01T00:00:00Z")
+def test_bump_version_replaces_marker(mock_service, mocker):
+    mocker.patch("uuid.uuid4", return_value="bumped-version")
+
+    mock_service.bump_version(TEST_NHS_NUMBER)
+
+    mock_service.dynamo_service.update_item.assert_called_once_with(
+        table_name=MOCK_CACHE_TABLE,
+        key_pair={"NhsNumber": TEST_NHS_NUMBER},
+        updated_fields={"Version": "bumped-version", "ExpireAt": 1738281600},
+    )
+
+
+def test_cache_result_if_unchanged_stores_result_for_current_version(mock_service):
+    mock_service.dynamo_service.get_item.return_value = {
+        "Item": {"NhsNumber": TEST_NHS_NUMBER, "Version": "version-1"}
+    }
+    etag = mock_service.get_etag(TEST_NHS_NUMBER)
+
+    mock_service.cache_result_if_unchanged(TEST_NHS_NUMBER, etag, ["result"])
+
+    assert mock_service.get_cached_result(etag) == ["result"]
+
+
+def test_cache_result_if_unchanged_skips_result_when_version_changed(mock_service):
+    mock_service.dynamo_service.get_item.side_effect = [
+        {"Item": {"NhsNumber": TEST_NHS_NUMBER, "Version": "version-1"}},
+        {"Item": {"NhsNumber": TEST_NHS_NUMBER, "Version": "version-2"}},
+    ]
+    etag = mock_service.get_etag(TEST_NHS_NUMBER)
+
+    mock_service.cache_result_if_unchanged(TEST_NHS_NUMBER, etag, ["result"])
+
+    assert mock_service.get_cached_result(etag) is None
+
+
+def test_cached_results_are_evicted_least_recently_used_first(mock_service, mocker):
+    mocker.patch.object(SearchResultCacheService, "MAX_CACHED_RESULTS", 2)
+
+    mock_service.cache_result('"etag-1"', ["result-1"])
+    mock_service.cache_result('"etag-2"', ["result-2"])
+    assert mock_service.get_cached_result('"etag-1"') == ["result-1"]
+    mock_service.cache_result('"etag-3"', ["result-3"])
+
+    assert mock_service.get_cached_result('"etag-1"') == ["result-1"]
+    assert mock_service.get_cached_result('"etag-2"') is None
+    assert mock_service.get_cached_result('"etag-3"') == ["result-3"]
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"If-None-Match": '"etag-1"'}, True),
+        ({"if-none-match": 'W/"etag-1"'}, True),
+        ({"If-None-Match": '"etag-0", "etag-1"'}, True),
+        ({"If-None-Match": "*"}, True),
+        ({"If-None-Match": '"etag-2"'}, False),
+        ({}, False),
+        (None, False),
+    ],
+)
+def test_is_not_modified(headers, expected):
+    event = {"headers": headers}
+
+    assert SearchResultCacheService.is_not_modified(event, '"etag-1"') == expected
@@ -4,6 +4,7 @@ from unittest.mock import call
 
 import polars as pl
 import pytest
+from enums.s3_transfer_profile import S3TransferProfile
 from freezegun import freeze_time
 from models.report.statistics import ApplicationData
 from polars.testing import assert_frame_equal
@@ -378,4 +379,5 @@ def test_store_report_to_s3(set_env, mock_s3_service, mock_temp_folder):
         s3_bucket_name=MOCK_STATISTICS_REPORT_BUCKET_NAME,
         file_key=f"statistic-reports/{expected_date_folder}/{expected_filename}",
         file_name=f"{mock_temp_folder}/{expected_filename}",
+        transfer_profile=S3TransferProfile.REPORT,
     )
@@ -0,0 +1,40 @@
+import pytest
+from utils.capacity_rate_limiter import CapacityRateLimiter
+
+
+@pytest.fixture
+def mock_clock(mocker):
+    clock = mocker.patch("utils.capacity_rate_limiter.time")
+    clock.monotonic.return_value = 100.0
+    yield clock
+
+
+def test_consume_within_rate_does_not_wait(mock_clock):
+    limiter = CapacityRateLimiter(max_units_per_second=10)
+
+    limiter.consume(10)
+
+    mock_clock.sleep.assert_not_called()
+
+
+def test_consume_above_rate_waits_off_the_excess(mock_clock):
+    limiter = CapacityRateLimiter(max_units_per_second=10)
+
+    limiter.consume(25)
+
+    mock_clock.sleep.assert_called_once_with(1.5)
+
+
+def test_capacity_is_refilled_over_time(mock_clock):
+    limiter = CapacityRateLimiter(max_units_per_second=10)
+    limiter.consume(10)
+
+    mock_clock.monotonic.return_value = 100.5
+    limiter.consume(5)
+
+    mock_clock.sleep.assert_not_called()
+
+
+def test_invalid_rate_raises_value_error():
+    with pytest.raises(ValueError):
+        CapacityRateLimiter(max_units_per_second=0)
@@ -0,0 +1,42 @@
+import threading
+
+import pytest
+from utils.concurrent_iteration import merge_iterators
+
+
+def test_merge_iterators_yields_every_value_from_every_source():
+    sources = [lambda: iter([1, 2, 3]), lambda: iter([]), lambda: iter([4, 5])]
+
+    actual = list(merge_iterators(sources))
+
+    assert sorted(actual) == [1, 2, 3, 4, 5]
+
+
+def test_merge_iterators_returns_nothing_without_sources():
+    assert list(merge_iterators([])) == []
+
+
+def test_merge_iterators_raises_exception_from_a_source():
+    def failing_source():
+        yield 1
+        raise ValueError("listing failed")
+
+    with pytest.raises(ValueError):
+        list(merge_iterators([failing_source, lambda: iter([2])]))
+
+
+def test_merge_iterators_stops_sources_when_caller_stops_early():
+    stopped = threading.Event()
+
+    def endless_source():
+        try:
+            while True:
+                yield "value"
+        finally:
+            stopped.set()
+
+    merged = merge_iterators([endless_source], queue_size=1)
+    assert next(merged) == "value"
+    merged.close()
+
+    assert stopped.wait(timeout=5)
@@ -0,0 +1,36 @@
+import threading
+import time
+
+
+class CapacityRateLimiter:
+    """
+    Thread-safe limiter that keeps the DynamoDB capacity consumed by a group of
+    workers at or below a given number of units per second.
+
+    DynamoDB only reports the capacity a request used once it has completed, so
+    callers record what each response consumed and the limiter makes the caller
+    wait off any debt built up above the allowed rate before its next request.
+    """
+
+    def __init__(self, max_units_per_second: float):
+        if max_units_per_second <= 0:
+            raise ValueError("max_units_per_second must be greater than zero")
+        self.max_units_per_second = max_units_per_second
+        self.available_units = max_units_per_second
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def consume(self, units: float):
+        with self.lock:
+            now = time.monotonic()
+            self.available_units = min(
+                self.max_units_per_second,
+                self.available_units
+                + (now - self.last_refill) * self.max_units_per_second,
+            )
+            self.last_refill = now
+            self.available_units -= units
+            wait_seconds = max(0.0, -self.available_units / self.max_units_per_second)
+
+        if wait_seconds:
+            time.sleep(wait_seconds)
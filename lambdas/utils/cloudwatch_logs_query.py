@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True)
 class CloudwatchLogsQueryParams:
     lambda_name: str
     query_string: str
@@ -10,45 +10,55 @@ class CloudwatchLogsQueryParams:
 LloydGeorgeRecordsViewed = CloudwatchLogsQueryParams(
     lambda_name="LloydGeorgeStitchLambda",
     query_string="""
-        fields @timestamp, Message, Authorisation.selected_organisation.org_ods_code AS ods_code 
+        fields @timestamp, Message, Authorisation.selected_organisation.org_ods_code AS ods_code,
+        datefloor(@timestamp, 1d) AS day
         | filter Message = 'User has viewed Lloyd George records' 
-        | stats count() AS daily_count_viewed BY ods_code
+        | stats count() AS daily_count_viewed BY day, ods_code
+        | limit 10000
     """,
 )
 
 LloydGeorgeRecordsDownloaded = CloudwatchLogsQueryParams(
     lambda_name="DocumentManifestJobLambda",
     query_string="""
-        fields @timestamp, Message, Authorisation.selected_organisation.org_ods_code AS ods_code 
+        fields @timestamp, Message, Authorisation.selected_organisation.org_ods_code AS ods_code,
+        datefloor(@timestamp, 1d) AS day
         | filter Message = 'User has downloaded Lloyd George records' 
-        | stats count() AS daily_count_downloaded BY ods_code
+        | stats count() AS daily_count_downloaded BY day, ods_code
+        | limit 10000
     """,
 )
 
 LloydGeorgeRecordsDeleted = CloudwatchLogsQueryParams(
     lambda_name="DeleteDocRefLambda",
     query_string="""
-        fields @timestamp, Message, Authorisation.selected_organisation.org_ods_code AS ods_code 
+        fields @timestamp, Message, Authorisation.selected_organisation.org_ods_code AS ods_code,
+        datefloor(@timestamp, 1d) AS day
         | filter Message = "Deleted document of type LG"
-        | stats count() AS daily_count_deleted BY ods_code
+        | stats count() AS daily_count_deleted BY day, ods_code
+        | limit 10000
     """,
 )
 
 LloydGeorgeRecordsStored = CloudwatchLogsQueryParams(
     lambda_name="UploadConfirmResultLambda",
     query_string="""
-        fields @timestamp, Message, Authorisation.selected_organisation.org_ods_code AS ods_code
+        fields @timestamp, Message, Authorisation.selected_organisation.org_ods_code AS ods_code,
+        datefloor(@timestamp, 1d) AS day
         | filter Message = 'Finished processing all documents'
-        | stats count() AS daily_count_stored BY ods_code
+        | stats count() AS daily_count_stored BY day, ods_code
+        | limit 10000
     """,
 )
 
 LloydGeorgeRecordsSearched = CloudwatchLogsQueryParams(
     lambda_name="SearchPatientDetailsLambda",
     query_string="""
-        fields @timestamp, Message, Authorisation.selected_organisation.org_ods_code AS ods_code
+        fields @timestamp, Message, Authorisation.selected_organisation.org_ods_code AS ods_code,
+        datefloor(@timestamp, 1d) AS day
         | filter Message = 'Searched for patient details' 
-        | stats count() AS daily_count_searched BY ods_code
+        | stats count() AS daily_count_searched BY day, ods_code
+        | limit 10000
     """,
 )
 
@@ -56,27 +66,33 @@ CountUsersAccessedDeceasedPatient = CloudwatchLogsQueryParams(
     lambda_name="AccessAuditLambda",
     query_string="""
         fields @timestamp, Message, Authorisation.nhs_user_id AS user_id, 
-        Authorisation.selected_organisation.org_ods_code AS ods_code
+        Authorisation.selected_organisation.org_ods_code AS ods_code,
+        datefloor(@timestamp, 1d) AS day
         | filter Message = 'Successful processed access request to view deceased patient' 
-        | stats count_distinct(user_id) AS daily_count_users_accessing_deceased BY ods_code
+        | stats count_distinct(user_id) AS daily_count_users_accessing_deceased BY day, ods_code
+        | limit 10000
     """,
 )
 
 OdsReportsRequested = CloudwatchLogsQueryParams(
     lambda_name="GetReportByODS",
     query_string="""
-        fields @timestamp, Message, Authorisation.selected_organisation.org_ods_code AS ods_code
+        fields @timestamp, Message, Authorisation.selected_organisation.org_ods_code AS ods_code,
+        datefloor(@timestamp, 1d) AS day
         | filter Message like /Received a request to create a report for ODS code/
-        | stats count() AS daily_count_ods_report_requested BY ods_code
+        | stats count() AS daily_count_ods_report_requested BY day, ods_code
+        | limit 10000
     """,
 )
 
 OdsReportsCreated = CloudwatchLogsQueryParams(
     lambda_name="GetReportByODS",
     query_string="""
-        fields @timestamp, Message, Authorisation.selected_organisation.org_ods_code AS ods_code
+        fields @timestamp, Message, Authorisation.selected_organisation.org_ods_code AS ods_code,
+        datefloor(@timestamp, 1d) AS day
         | filter Message = 'A report has been successfully created.'
-        | stats count() AS daily_count_ods_report_created BY ods_code
+        | stats count() AS daily_count_ods_report_created BY day, ods_code
+        | limit 10000
     """,
 )
 
@@ -87,8 +103,10 @@ UniqueActiveUserIds = CloudwatchLogsQueryParams(
         Authorisation.selected_organisation.org_ods_code AS ods_code,
         Authorisation.nhs_user_id AS user_id,
         Authorisation.selected_organisation.role_code AS role_code,
-        Authorisation.repository_role AS user_role
+        Authorisation.repository_role AS user_role,
+        datefloor(@timestamp, 1d) AS day
         | filter ispresent(ods_code) AND ispresent(user_id)
-        | dedup(ods_code, user_id, user_role, role_code)
+        | dedup(day, ods_code, user_id, user_role, role_code)
+        | limit 10000
     """,
 )
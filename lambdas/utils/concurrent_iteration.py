@@ -0,0 +1,63 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+_SOURCE_FINISHED = object()
+
+
+def merge_iterators(
+    sources: list[Callable[[], Iterable]],
+    max_workers: int = None,
+    queue_size: int = None,
+) -> Iterator:
+    """
+    Run each source on its own worker thread and yield what they produce as it
+    arrives, so results come out in no particular order. Workers hand values over
+    through a small bounded queue and pause while the caller is busy, so only a
+    few values are ever held in memory. The first exception raised by a source is
+    re-raised to the caller, and stopping iteration early stops every worker after
+    its current value.
+    """
+    if not sources:
+        return
+
+    values = queue.Queue(maxsize=queue_size or len(sources) * 2)
+    stop_workers = threading.Event()
+
+    def put_unless_stopped(value) -> bool:
+        while not stop_workers.is_set():
+            try:
+                values.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run_source(source: Callable[[], Iterable]):
+        try:
+            for value in source():
+                if not put_unless_stopped(value):
+                    return
+        except Exception as e:
+            put_unless_stopped(e)
+        finally:
+            put_unless_stopped(_SOURCE_FINISHED)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(sources))
+    for source in sources:
+        executor.submit(run_source, source)
+
+    finished_sources = 0
+    try:
+        while finished_sources < len(sources):
+            value = values.get()
+            if value is _SOURCE_FINISHED:
+                finished_sources += 1
+            elif isinstance(value, Exception):
+                raise value
+            else:
+                yield value
+    finally:
+        stop_workers.set()
+        executor.shutdown(wait=False, cancel_futures=True)
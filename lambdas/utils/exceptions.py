@@ -46,6 +46,12 @@ class DynamoServiceException(Exception):
     pass
 
 
+class DynamoTransactionException(DynamoServiceException):
+    def __init__(self, message: str, cancellation_reasons: list[dict] = None):
+        super().__init__(message)
+        self.cancellation_reasons = cancellation_reasons or []
+
+
 class DocumentServiceException(Exception):
     pass
 